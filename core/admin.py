@@ -15,7 +15,6 @@ from core.models.users import User, UserOrganization
 admin.site.register(Instrument)
 admin.site.register(Musician)
 admin.site.register(MusicianInstrument)
-admin.site.register(Notification)
 admin.site.register(MagicLink)
 admin.site.register(Organization)
 admin.site.register(SetupChecklist)
@@ -28,3 +27,15 @@ admin.site.register(ProgramPerformance)
 admin.site.register(ProgramChecklist)
 admin.site.register(User)
 admin.site.register(UserOrganization)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ["subject", "recipient_email", "type", "status", "created"]
+    list_select_related = ["program"]
+    # Bodies are stored compressed in NotificationBody; show them rendered
+    exclude = ["text_body", "html_body", "body_values"]
+    readonly_fields = ["body", "body_html"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("text_body", "html_body")
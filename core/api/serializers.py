@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 from pydantic import ValidationError as PydanticValidationError
 from core.dtos.music import PartDTO
@@ -16,6 +17,14 @@ class PartAssetCreateSerializer(serializers.Serializer):
         return value
 
 
+class PartAssetBatchCreateSerializer(serializers.Serializer):
+    assets = serializers.ListField(
+        child=PartAssetCreateSerializer(),
+        min_length=1,
+        max_length=200,
+    )
+
+
 class PartAssetPatchSerializer(serializers.Serializer):
     status = EnumChoiceField(UploadStatus, required=False)
     part_ids = serializers.ListField(
@@ -68,6 +77,29 @@ class ProgramAssignmentPartPatchSerializer(serializers.Serializer):
     musician_id = serializers.CharField(required=True, allow_null=True)
 
 
+class ProgramAssignmentBatchItemSerializer(ProgramAssignmentPartPatchSerializer):
+    part_id = serializers.CharField(required=True)
+
+
+class ProgramAssignmentBatchPatchSerializer(serializers.Serializer):
+    assignments = serializers.ListField(
+        child=ProgramAssignmentBatchItemSerializer(),
+        min_length=1,
+        max_length=500,
+    )
+
+
+class ProgramAssignmentEventsQuerySerializer(serializers.Serializer):
+    version = serializers.IntegerField(required=True, min_value=0)
+    links_version = serializers.IntegerField(required=True, min_value=0)
+    timeout = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=settings.ASSIGNMENT_EVENTS_MAX_WAIT_SECONDS,
+        default=settings.ASSIGNMENT_EVENTS_MAX_WAIT_SECONDS,
+    )
+
+
 class PartDTOWrapperSerializer(serializers.Serializer):
     def validate(self, attrs):
         # attrs is empty because we’re not declaring explicit fields,
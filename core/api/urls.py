@@ -19,6 +19,7 @@ from core.api.views import (
 )
 
 part_asset_create = PartAssetViewSet.as_view({"post": "create"})
+part_asset_batch_create = PartAssetViewSet.as_view({"post": "batch_create"})
 part_asset_patch = PartAssetViewSet.as_view({"patch": "partial_update"})
 part_assets_list = PartAssetViewSet.as_view({"get": "list"})
 piece_search = PieceSearchViewSet.as_view({"get": "list"})
@@ -40,6 +41,9 @@ program_checklist = ProgramChecklistViewSet.as_view(
 program_assignments = ProgramAssignmentViewSet.as_view({"get": "list"})
 programs_search = ProgramSearchViewSet.as_view({"get": "list"})
 program_assignment_part = ProgramAssignmentViewSet.as_view({"patch": "partial_update"})
+program_assignment_parts = ProgramAssignmentViewSet.as_view({"patch": "bulk_update"})
+program_assignments_auto = ProgramAssignmentViewSet.as_view({"post": "create"})
+program_assignment_events = ProgramAssignmentViewSet.as_view({"get": "events"})
 musicians_search = RosterMusicianViewSet.as_view({"get": "list"})
 domo_search = DomoWorkSearchViewSet.as_view({"get": "list"})
 magic_assignments_data = MagicAssignmentViewSet.as_view({"get": "retrieve"})
@@ -58,6 +62,11 @@ urlpatterns = [
         part_asset_create,
         name="api_part_asset_create",
     ),
+    path(
+        "pieces/<str:piece_id>/assets/batch",
+        part_asset_batch_create,
+        name="api_part_asset_batch_create",
+    ),
     path(
         "pieces/<str:piece_id>/asset/<str:part_asset_id>",
         part_asset_patch,
@@ -123,6 +132,21 @@ urlpatterns = [
         program_assignment_part,
         name="api_program_assignment_part",
     ),
+    path(
+        "programs/<str:program_id>/assignments/parts",
+        program_assignment_parts,
+        name="api_program_assignment_parts",
+    ),
+    path(
+        "programs/<str:program_id>/assignments/auto",
+        program_assignments_auto,
+        name="api_program_assignments_auto",
+    ),
+    path(
+        "programs/<str:program_id>/assignments/events",
+        program_assignment_events,
+        name="api_program_assignment_events",
+    ),
     path(
         "musicians/search",
         musicians_search,
@@ -1,10 +1,19 @@
 from rest_framework import permissions, status, viewsets
 from rest_framework.response import Response
-from core.api.serializers import ProgramAssignmentPartPatchSerializer
+from core.api.serializers import (
+    ProgramAssignmentBatchPatchSerializer,
+    ProgramAssignmentEventsQuerySerializer,
+    ProgramAssignmentPartPatchSerializer,
+)
 from core.api.permissions import IsInOrganization
 from core.models.programs import Program
+from core.services.assignment_events import wait_for_program_assignment_events
 from core.services.assignments import (
+    ProgramAssignmentSnapshot,
     assign_program_part_by_librarian,
+    assign_program_parts_by_librarian,
+    auto_assign_program_parts,
+    get_cached_program_assignments_status,
     get_program_assignments_status,
 )
 
@@ -13,10 +22,24 @@ class ProgramAssignmentViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.IsAuthenticated, IsInOrganization]
 
     def list(self, request, program_id, *args, **kwargs):
-        Program.objects.get(id=program_id, organization_id=request.organization.id)
-        payload = get_program_assignments_status(
+        payload = get_cached_program_assignments_status(
+            organization_id=request.organization.id,
+            program_id=program_id,
+        )
+        return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
+
+    def events(self, request, program_id, *args, **kwargs):
+        # Long-poll rather than a held-open stream. A watching page still holds a
+        # sync worker for up to ASSIGNMENT_EVENTS_MAX_WAIT_SECONDS per request,
+        # so the wait is kept short and the client pauses between empty polls.
+        serializer = ProgramAssignmentEventsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        payload = wait_for_program_assignment_events(
             organization_id=request.organization.id,
             program_id=program_id,
+            version=serializer.validated_data["version"],
+            links_version=serializer.validated_data["links_version"],
+            timeout=serializer.validated_data["timeout"],
         )
         return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
 
@@ -36,3 +59,33 @@ class ProgramAssignmentViewSet(viewsets.GenericViewSet):
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
+
+    def create(self, request, program_id, *args, **kwargs):
+        Program.objects.get(id=program_id, organization_id=request.organization.id)
+        snapshot = ProgramAssignmentSnapshot(program_id, request.organization.id)
+        auto_assign_program_parts(program_id, snapshot=snapshot)
+        payload = get_program_assignments_status(
+            organization_id=request.organization.id,
+            program_id=program_id,
+            snapshot=snapshot,
+        )
+        return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
+
+    def bulk_update(self, request, program_id, *args, **kwargs):
+        Program.objects.get(id=program_id, organization_id=request.organization.id)
+        serializer = ProgramAssignmentBatchPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            payload = assign_program_parts_by_librarian(
+                organization_id=request.organization.id,
+                program_id=program_id,
+                changes=[
+                    (assignment["part_id"], assignment["musician_id"])
+                    for assignment in serializer.validated_data["assignments"]
+                ],
+            )
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
@@ -51,6 +51,7 @@ class MagicAssignmentViewSet(viewsets.GenericViewSet):
         payload = get_assignment_payload(
             program_id=str(magic_link.program_id),
             principal_musician_id=str(magic_link.musician_id),
+            include_suggestions=True,
         )
         return Response(payload.model_dump(mode="json"), status=status.HTTP_200_OK)
 
@@ -3,11 +3,17 @@ from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.response import Response
 
 from core.api.permissions import IsInOrganization
-from core.api.serializers import PartAssetCreateSerializer, PartAssetPatchSerializer
+from core.api.serializers import (
+    PartAssetBatchCreateSerializer,
+    PartAssetCreateSerializer,
+    PartAssetPatchSerializer,
+)
 from core.dtos.music import PartAssetsPayloadDTO, PartOptionDTO
 from core.enum.music import PartAssetType
+from core.services.pagination import InvalidCursorError
 from core.services.music import (
     create_part_asset,
+    create_part_assets,
     delete_part_asset,
     get_part_assets,
     get_parts,
@@ -24,6 +30,8 @@ class PartAssetViewSet(
     def get_serializer_class(self, data):
         if self.action == "create":
             return PartAssetCreateSerializer(data=data)
+        if self.action == "batch_create":
+            return PartAssetBatchCreateSerializer(data=data)
         return PartAssetPatchSerializer(data=data)
 
     def create(self, request, piece_id, *args, **kwargs):
@@ -37,6 +45,23 @@ class PartAssetViewSet(
         response_data = part_asset.model_dump(mode="json")
         return Response(response_data, status=status.HTTP_200_OK)
 
+    def batch_create(self, request, piece_id, *args, **kwargs):
+        serializer = self.get_serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        uploads = [
+            (asset["filename"], asset["asset_type"])
+            for asset in serializer.validated_data["assets"]
+        ]
+        part_assets = create_part_assets(
+            organization_id=request.organization.id,
+            piece_id=piece_id,
+            uploads=uploads,
+        )
+        response_data = [
+            part_asset.model_dump(mode="json") for part_asset in part_assets
+        ]
+        return Response(response_data, status=status.HTTP_200_OK)
+
     def partial_update(self, request, piece_id, part_asset_id, *args, **kwargs):
         serializer = self.get_serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -101,13 +126,20 @@ class PieceSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         title = request.query_params.get("title") or search_text
         composer = request.query_params.get("composer")
         sort = request.query_params.get("sort")
+        cursor = request.query_params.get("cursor")
+        include_total = request.query_params.get("include_total") in ("1", "true")
 
-        results = search_for_piece(
-            title=title,
-            composer=composer,
-            organization_id=request.organization.id,
-            limit=limit,
-            offset=offset,
-            sort=sort,
-        )
+        try:
+            results = search_for_piece(
+                title=title,
+                composer=composer,
+                organization_id=request.organization.id,
+                limit=limit,
+                offset=offset,
+                sort=sort,
+                cursor=cursor,
+                include_total=include_total,
+            )
+        except InvalidCursorError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(results.model_dump(mode="json"), status=status.HTTP_200_OK)
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 
 from core.api.permissions import IsInOrganization
 from core.services.organizations import search_for_musician
+from core.services.pagination import InvalidCursorError
 
 
 class RosterMusicianViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
@@ -24,14 +25,21 @@ class RosterMusicianViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
         name = request.query_params.get("search") or request.query_params.get("name")
         instrument = request.query_params.get("instrument")
         sort = request.query_params.get("sort")
+        cursor = request.query_params.get("cursor")
+        include_total = request.query_params.get("include_total") in ("1", "true")
 
-        results = search_for_musician(
-            organization_id=request.organization.id,
-            name=name,
-            instrument=instrument,
-            limit=limit,
-            offset=offset,
-            sort=sort,
-        )
+        try:
+            results = search_for_musician(
+                organization_id=request.organization.id,
+                name=name,
+                instrument=instrument,
+                limit=limit,
+                offset=offset,
+                sort=sort,
+                cursor=cursor,
+                include_total=include_total,
+            )
+        except InvalidCursorError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(results.model_dump(mode="json"), status=status.HTTP_200_OK)
@@ -10,6 +10,7 @@ from core.api.serializers import (
     ProgramMusicianInstrumentSerializer,
 )
 from core.models.programs import Program
+from core.services.pagination import InvalidCursorError
 from core.services.programs import (
     add_musician_to_program,
     add_musicians_to_program,
@@ -69,13 +70,20 @@ class ProgramSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
         name = request.query_params.get("search") or request.query_params.get("name")
         sort = request.query_params.get("sort")
-        results = search_for_programs(
-            organization_id=request.organization.id,
-            name=name,
-            limit=limit,
-            offset=offset,
-            sort=sort,
-        )
+        cursor = request.query_params.get("cursor")
+        include_total = request.query_params.get("include_total") in ("1", "true")
+        try:
+            results = search_for_programs(
+                organization_id=request.organization.id,
+                name=name,
+                limit=limit,
+                offset=offset,
+                sort=sort,
+                cursor=cursor,
+                include_total=include_total,
+            )
+        except InvalidCursorError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(results.model_dump(mode="json"), status=status.HTTP_200_OK)
 
 
@@ -158,14 +166,21 @@ class ProgramMusicianSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSe
 
         search = request.query_params.get("search")
         sort = request.query_params.get("sort")
-        results = search_for_program_musicians(
-            organization_id=request.organization.id,
-            program_id=program_id,
-            search=search,
-            limit=limit,
-            offset=offset,
-            sort=sort,
-        )
+        cursor = request.query_params.get("cursor")
+        include_total = request.query_params.get("include_total") in ("1", "true")
+        try:
+            results = search_for_program_musicians(
+                organization_id=request.organization.id,
+                program_id=program_id,
+                search=search,
+                limit=limit,
+                offset=offset,
+                sort=sort,
+                cursor=cursor,
+                include_total=include_total,
+            )
+        except InvalidCursorError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(results.model_dump(mode="json"), status=status.HTTP_200_OK)
 
 
@@ -1,31 +1,71 @@
-from typing import List
+from typing import ClassVar, Iterable, Tuple
 from datetime import datetime
 from typing import Optional
+from django.conf import settings
+from django.db import connection
+from django.db.models import prefetch_related_objects
 from pydantic import BaseModel, ConfigDict
 
 
+class LazyQueryError(RuntimeError):
+    """Raised in strict mode when a batch DTO conversion queries the database."""
+
+
 class BaseDTO(BaseModel):
     id: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+    # Relation lookups read by from_model, including nested DTOs. from_models
+    # loads them for the whole batch so conversion never lazy-loads per row.
+    prefetch_plan: ClassVar[Tuple[str, ...]] = ()
+
     model_config = ConfigDict(
         populate_by_name=True,
         arbitrary_types_allowed=True,
         use_enum_values=False,
     )
 
+    @classmethod
+    def construct_trusted(cls, **values):
+        """
+        Build a DTO from values that came straight from the database.
+
+        Rows are already typed by the ORM, so validation is skipped unless
+        DTO_VALIDATE_TRUSTED is set (it defaults to DEBUG).
+        """
+        if getattr(settings, "DTO_VALIDATE_TRUSTED", settings.DEBUG):
+            return cls(**values)
+        return cls.model_construct(**values)
+
     @classmethod
     def from_model(cls, model: BaseModel) -> "BaseDTO":
         pass
 
     @classmethod
-    def from_models(cls, models: List[BaseModel]):
+    def from_models(cls, models: Iterable[BaseModel]):
         if not models:
             return []
-        return [cls.from_model(model) for model in models]
+        models = list(models)
+        if cls.prefetch_plan:
+            # Relations that are already cached or prefetched are skipped
+            prefetch_related_objects(models, *cls.prefetch_plan)
+        if not getattr(settings, "DTO_STRICT_QUERIES", False):
+            return [cls.from_model(model) for model in models]
+        with connection.execute_wrapper(_forbid_lazy_queries(cls)):
+            return [cls.from_model(model) for model in models]
 
     def __eq__(self, value):
         if self.id and value.id:
             return self.id == value.id
         return super().__eq__(value)
+
+
+def _forbid_lazy_queries(dto_class: type):
+    def wrapper(execute, sql, params, many, context):
+        raise LazyQueryError(
+            f"{dto_class.__name__}.from_models ran a query missing from its "
+            f"prefetch plan: {sql}"
+        )
+
+    return wrapper
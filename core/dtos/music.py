@@ -26,7 +26,7 @@ class InstrumentDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: Instrument):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             name=InstrumentEnum(model.name),
         )
@@ -37,7 +37,7 @@ class InstrumentSectionDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: InstrumentSection):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             name=InstrumentSectionEnum(model.name),
         )
@@ -48,9 +48,15 @@ class MusicianInstrumentDTO(BaseDTO):
     instrument: InstrumentDTO
     primary: bool
 
+    prefetch_plan = (
+        "instrument",
+        "musician__organization",
+        "musician__instruments__instrument",
+    )
+
     @classmethod
     def from_model(cls, model: MusicianInstrument):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             musician=MusicianDTO.from_model(model.musician),
             instrument=InstrumentDTO.from_model(model.instrument),
@@ -74,31 +80,18 @@ class PieceDTO(BaseDTO):
         parts_count: Optional[int] = None,
         completed_parts: Optional[int] = None,
     ):
+        # Counters are stored on the piece and kept current by the music services
         if parts_count is None:
-            parts_count = getattr(model, "parts_count", None)
+            parts_count = model.parts_count
 
         if completed_parts is None:
-            completed_parts = getattr(model, "completed_parts", None)
-
-        if parts_count is None:
-            parts_count = model.parts.count()
+            completed_parts = model.completed_parts
 
-        if completed_parts is None:
-            completed_parts = (
-                PartAsset.objects.filter(
-                    piece_id=str(model.id),
-                    asset_type=PartAssetType.CLEAN.value,
-                    status=UploadStatus.UPLOADED.value,
-                )
-                .distinct()
-                .count()
-            )
-
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             title=model.title,
             composer=model.composer,
-            organization_id=str(model.organization.id),
+            organization_id=str(model.organization_id),
             instrumentation=model.instrumentation,
             parts_count=parts_count,
             completed_parts=completed_parts,
@@ -107,8 +100,9 @@ class PieceDTO(BaseDTO):
 
 
 class PieceSearchResultDTO(BaseDTO):
-    total: int
+    total: Optional[int]
     data: List[PieceDTO]
+    next_cursor: Optional[str] = None
 
 
 class PartDTO(BaseDTO):
@@ -161,11 +155,13 @@ class PartDTO(BaseDTO):
     def display_name_json(self) -> str:
         return json.dumps([self.display_name])
 
+    prefetch_plan = ("instruments__instrument",)
+
     @classmethod
     def from_model(cls, model: Part):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            piece_id=str(model.piece.id),
+            piece_id=str(model.piece_id),
             instruments=PartInstrumentDTO.from_models(model.instruments.all()),
             number=model.number,
         )
@@ -176,11 +172,13 @@ class PartInstrumentDTO(BaseDTO):
     primary: bool
     instrument: InstrumentDTO
 
+    prefetch_plan = ("instrument",)
+
     @classmethod
     def from_model(cls, model: PartInstrument):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            part_id=str(model.part.id),
+            part_id=str(model.part_id),
             primary=model.primary,
             instrument=InstrumentDTO.from_model(model.instrument),
         )
@@ -201,11 +199,13 @@ class PartAssetDTO(BaseDTO):
     def display_name_json(self) -> str:
         return json.dumps(self.display_name)
 
+    prefetch_plan = ("parts__instruments__instrument",)
+
     @classmethod
     def from_model(cls, model: PartAsset):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            piece_id=str(model.piece.id),
+            piece_id=str(model.piece_id),
             parts=PartDTO.from_models(model.parts.all()) if model.parts else None,
             asset_type=PartAssetType(model.asset_type),
             status=UploadStatus(model.status),
@@ -17,12 +17,18 @@ class NotificationDTO(BaseDTO):
     status: NotificationStatus
     method: NotificationMethod
 
+    prefetch_plan = (
+        "program",
+        "recipient__organization",
+        "recipient__instruments__instrument",
+    )
+
     @classmethod
     def from_model(cls, model: Notification):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            organization_id=str(model.program.organization.id),
-            program_id=str(model.program.id),
+            organization_id=str(model.program.organization_id),
+            program_id=str(model.program_id),
             recipient=MusicianDTO.from_model(model.recipient)
             if model.recipient
             else None,
@@ -23,7 +23,7 @@ class OrganizationDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: Organization):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             name=model.name,
             enabled=model.enabled,
@@ -44,6 +44,8 @@ class MusicianDTO(BaseDTO):
     phone_number: Optional[str] = None
     address: Optional[str] = None
 
+    prefetch_plan = ("organization", "instruments__instrument")
+
     @classmethod
     def from_model(cls, model: Musician):
         if not model:
@@ -58,7 +60,7 @@ class MusicianDTO(BaseDTO):
         secondary_instruments = [
             instrument for instrument in musician_instruments if not instrument.primary
         ]
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             first_name=model.first_name,
             last_name=model.last_name,
@@ -75,8 +77,9 @@ class MusicianDTO(BaseDTO):
 
 
 class MusicianSearchResultDTO(BaseDTO):
-    total: int
+    total: Optional[int]
     data: List[MusicianDTO]
+    next_cursor: Optional[str] = None
 
 
 class MusicianInstrumentDTO(BaseDTO):
@@ -84,11 +87,13 @@ class MusicianInstrumentDTO(BaseDTO):
     instrument: InstrumentEnum
     primary: bool
 
+    prefetch_plan = ("instrument",)
+
     @classmethod
     def from_model(cls, model: MusicianInstrument):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            musician_id=str(model.musician.id),
+            musician_id=str(model.musician_id),
             instrument=InstrumentEnum(model.instrument.name),
             primary=model.primary,
         )
@@ -104,9 +109,9 @@ class SetupChecklistDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: SetupChecklist):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            organization_id=str(model.organization.id),
+            organization_id=str(model.organization_id),
             roster_uploaded=model.roster_uploaded,
             program_created=model.program_created,
             piece_completed=model.piece_completed,
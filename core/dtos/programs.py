@@ -1,8 +1,12 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Iterable, Optional, List
+
+from django.db.models import prefetch_related_objects
+
 from core.dtos.base import BaseDTO
 from core.dtos.organizations import MusicianDTO, OrganizationDTO
 from core.enum.instruments import InstrumentEnum
+from core.enum.programs import ProgramAssignmentEventType
 from core.models.programs import (
     Program,
     ProgramPerformance,
@@ -12,6 +16,17 @@ from core.models.programs import (
 )
 from core.dtos.users import UserDTO
 
+# Users recorded on a program checklist, loaded with the checklist
+CHECKLIST_USER_FIELDS = (
+    "pieces_completed_by",
+    "roster_completed_by",
+    "overrides_completed_by",
+    "bowings_completed_by",
+    "assignments_sent_by",
+    "assignments_completed_by",
+    "delivery_sent_by",
+)
+
 
 class ProgramDTO(BaseDTO):
     organization_id: str
@@ -20,6 +35,23 @@ class ProgramDTO(BaseDTO):
     checklist: "ProgramChecklistDTO"
     performances: Optional[List["ProgramPerformanceDTO"]] = None
 
+    prefetch_plan = (
+        "performances",
+        "checklist",
+        *(f"checklist__{field}" for field in CHECKLIST_USER_FIELDS),
+    )
+
+    @classmethod
+    def from_models(cls, models: Iterable[Program]):
+        models = list(models or [])
+        # List and search queries annotate piece_count; pieces are only
+        # prefetched for rows that came without it
+        prefetch_related_objects(
+            [model for model in models if getattr(model, "piece_count", None) is None],
+            "pieces",
+        )
+        return super().from_models(models)
+
     @classmethod
     def from_model(
         cls,
@@ -30,11 +62,11 @@ class ProgramDTO(BaseDTO):
             piece_count = getattr(model, "piece_count", None)
 
         if piece_count is None:
-            piece_count = model.pieces.count()
+            piece_count = len(model.pieces.all())
 
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            organization_id=str(model.organization.id),
+            organization_id=str(model.organization_id),
             name=model.name,
             performances=ProgramPerformanceDTO.from_models(model.performances.all()),
             checklist=ProgramChecklistDTO.from_model(model.checklist),
@@ -43,8 +75,9 @@ class ProgramDTO(BaseDTO):
 
 
 class ProgramSearchResultDTO(BaseDTO):
-    total: int
+    total: Optional[int]
     data: List[ProgramDTO]
+    next_cursor: Optional[str] = None
 
 
 class ProgramPerformanceDTO(BaseDTO):
@@ -54,9 +87,9 @@ class ProgramPerformanceDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: ProgramPerformance):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            program_id=str(model.program.id),
+            program_id=str(model.program_id),
             date=model.date,
             timezone=model.timezone,
         )
@@ -75,15 +108,17 @@ class ProgramMusicianDTO(BaseDTO):
     phone_number: Optional[str] = None
     address: Optional[str] = None
 
+    prefetch_plan = ("musician", "instruments__instrument")
+
     @classmethod
     def from_model(cls, model: ProgramMusician):
         if not model:
             return None
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            program_id=str(model.program.id),
-            musician_id=str(model.musician.id),
-            organization_id=str(model.musician.organization.id),
+            program_id=str(model.program_id),
+            musician_id=str(model.musician_id),
+            organization_id=str(model.musician.organization_id),
             first_name=model.musician.first_name,
             last_name=model.musician.last_name,
             email=model.musician.email,
@@ -100,8 +135,9 @@ class ProgramMusicianDTO(BaseDTO):
 
 
 class ProgramMusicianSearchResultDTO(BaseDTO):
-    total: int
+    total: Optional[int]
     data: List[ProgramMusicianDTO]
+    next_cursor: Optional[str] = None
 
 
 class ProgramMusicianInstrumentDTO(BaseDTO):
@@ -109,12 +145,14 @@ class ProgramMusicianInstrumentDTO(BaseDTO):
     musician_id: str
     instrument: InstrumentEnum
 
+    prefetch_plan = ("program_musician", "instrument")
+
     @classmethod
     def from_model(cls, model: ProgramMusicianInstrument):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            program_id=str(model.program_musician.program.id),
-            musician_id=str(model.program_musician.musician.id),
+            program_id=str(model.program_musician.program_id),
+            musician_id=str(model.program_musician.musician_id),
             instrument=InstrumentEnum(model.instrument.name),
         )
 
@@ -137,6 +175,8 @@ class ProgramChecklistDTO(BaseDTO):
     delivery_sent_by: Optional[UserDTO] = None
     delivery_completed_on: Optional[datetime] = None
 
+    prefetch_plan = CHECKLIST_USER_FIELDS
+
     @property
     def pieces_completed(self) -> bool:
         return self.pieces_completed_on is not None
@@ -174,9 +214,9 @@ class ProgramChecklistDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: ProgramChecklist):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            program_id=str(model.program.id),
+            program_id=str(model.program_id),
             pieces_completed_on=model.pieces_completed_on,
             pieces_completed_by=UserDTO.from_model(model.pieces_completed_by)
             if model.pieces_completed_by
@@ -220,6 +260,7 @@ class ProgramAssignmentPartDTO(BaseDTO):
     assigned_musician_id: Optional[str] = None
     status: Optional[str] = None
     assigned_musician: Optional[ProgramAssignmentAssignedMusicianDTO] = None
+    suggested_musician_ids: List[str] = []
 
 
 class ProgramAssignmentPieceDTO(BaseDTO):
@@ -235,6 +276,7 @@ class ProgramAssignmentDTO(BaseDTO):
     eligible_musicians: List[MusicianDTO]
     eligible_musician_ids: List[str]
     all_assigned: bool
+    version: Optional[int] = None
 
 
 class ProgramAssignmentPrincipalPartsDTO(BaseDTO):
@@ -267,6 +309,58 @@ class ProgramAssignmentStatusDTO(BaseDTO):
     principals: List[ProgramAssignmentPrincipalStatusDTO]
     roster_musicians: List[MusicianDTO]
     summary: ProgramAssignmentSummaryDTO
+    version: Optional[int] = None
+    links_version: Optional[int] = None
+
+
+class ProgramAssignmentDeltaDTO(BaseDTO):
+    """A single assignment change, applied on top of `previous_version`.
+
+    Clients holding a different version than `previous_version` have missed a
+    change and should reload the full payload.
+    """
+
+    piece_id: str
+    part: ProgramAssignmentPartDTO
+    piece_all_assigned: bool
+    version: int
+    previous_version: int
+    all_assigned: Optional[bool] = None
+    summary: Optional[ProgramAssignmentSummaryDTO] = None
+    principals: List[ProgramAssignmentPrincipalStatusDTO] = []
+
+
+class ProgramAssignmentEventPartDTO(BaseDTO):
+    piece_id: str
+    part: ProgramAssignmentPartDTO
+    piece_all_assigned: bool
+
+
+class ProgramAssignmentEventDTO(BaseDTO):
+    """A change pushed to pages watching a program's assignments.
+
+    Assignment events carry the changed parts and move `version` on from
+    `previous_version`. Link events carry one principal's access or completion
+    stamp and move `links_version` on.
+    """
+
+    type: ProgramAssignmentEventType
+    program_id: str
+    version: int
+    links_version: int
+    previous_version: Optional[int] = None
+    parts: List[ProgramAssignmentEventPartDTO] = []
+    summary: Optional[ProgramAssignmentSummaryDTO] = None
+    principals: List[ProgramAssignmentPrincipalStatusDTO] = []
+    musician_id: Optional[str] = None
+    occurred_on: Optional[datetime] = None
+
+
+class ProgramAssignmentEventsDTO(BaseDTO):
+    events: List[ProgramAssignmentEventDTO]
+    version: int
+    links_version: int
+    reload: bool = False
 
 
 class ProgramDeliveryFileDTO(BaseDTO):
@@ -10,7 +10,7 @@ class UserDTO(BaseDTO):
 
     @classmethod
     def from_model(cls, model: User):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
             username=model.username,
             first_name=model.first_name,
@@ -25,12 +25,14 @@ class UserOrganizationDTO(BaseDTO):
     name: str
     role: str
 
+    prefetch_plan = ("organization",)
+
     @classmethod
     def from_model(cls, model: UserOrganization):
-        return cls(
+        return cls.construct_trusted(
             id=str(model.id),
-            user_id=str(model.user.id),
-            organization_id=str(model.organization.id),
+            user_id=str(model.user_id),
+            organization_id=str(model.organization_id),
             name=model.organization.name,
             role=model.role,
         )
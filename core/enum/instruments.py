@@ -1,3 +1,6 @@
+from functools import cache
+from typing import Iterable
+
 from core.enum.base import BaseEnum
 
 
@@ -304,3 +307,63 @@ def get_assignment_scope_for_instruments(
     for instrument in instruments:
         scope.update(get_assignment_subsection_instruments(instrument))
     return scope
+
+
+#
+# Bitmask encoding of instrument sets.
+# Each instrument owns one bit (by declaration order), so scope and eligibility
+# checks over sets of instruments become single integer AND operations.
+#
+INSTRUMENT_BITS = {
+    instrument: 1 << index for index, instrument in enumerate(InstrumentEnum)
+}
+
+
+def get_instrument_mask(instruments: Iterable[InstrumentEnum]) -> int:
+    mask = 0
+    for instrument in instruments:
+        mask |= INSTRUMENT_BITS[instrument]
+    return mask
+
+
+def get_mask_instruments(mask: int) -> set[InstrumentEnum]:
+    return {instrument for instrument, bit in INSTRUMENT_BITS.items() if mask & bit}
+
+
+def is_single_instrument_mask(mask: int) -> bool:
+    return mask != 0 and mask & (mask - 1) == 0
+
+
+INSTRUMENT_SECTION_MASKS = {
+    section: get_instrument_mask(instruments)
+    for section, instruments in INSTRUMENT_SECTIONS.items()
+}
+
+INSTRUMENT_CHAIR_PARENT_MASKS = {
+    instrument: INSTRUMENT_BITS[parent]
+    for instrument, parent in INSTRUMENT_CHAIR_PARENTS.items()
+}
+
+INSTRUMENT_ASSIGNMENT_SUBSECTION_MASKS = {
+    lead_instrument: get_instrument_mask(subsection)
+    for lead_instrument, subsection in INSTRUMENT_ASSIGNMENT_SUBSECTIONS.items()
+}
+
+# Per-instrument assignment scope, keyed by bit for mask iteration.
+_ASSIGNMENT_SCOPE_MASKS_BY_BIT = {
+    bit: INSTRUMENT_ASSIGNMENT_SUBSECTION_MASKS.get(
+        get_assignment_lead_instrument(instrument), 0
+    )
+    for instrument, bit in INSTRUMENT_BITS.items()
+}
+
+
+@cache
+def get_assignment_scope_mask(mask: int) -> int:
+    """Mask equivalent of `get_assignment_scope_for_instruments()`."""
+    scope = 0
+    while mask:
+        bit = mask & -mask
+        scope |= _ASSIGNMENT_SCOPE_MASKS_BY_BIT[bit]
+        mask ^= bit
+    return scope
@@ -0,0 +1,7 @@
+from core.enum.base import BaseEnum
+
+
+class ProgramAssignmentEventType(BaseEnum):
+    ASSIGNMENTS = "Assignments"
+    LINK_ACCESSED = "Link Accessed"
+    LINK_COMPLETED = "Link Completed"
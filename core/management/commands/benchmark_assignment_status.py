@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.services.assignments import get_program_assignments_status
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare validated and trusted DTO construction for a program's "
+        "assignment status payload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "organization_id", help="Organization that owns the program."
+        )
+        parser.add_argument("program_id", help="Program to build the payload for.")
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Number of timed payload builds per mode.",
+        )
+
+    def handle(self, *args, **options):
+        organization_id = options["organization_id"]
+        program_id = options["program_id"]
+        iterations = max(options["iterations"], 1)
+
+        payloads = {}
+        timings = {}
+        for label, validate in (("validated", True), ("trusted", False)):
+            with override_settings(DTO_VALIDATE_TRUSTED=validate):
+                # Warm up caches and connections before timing
+                get_program_assignments_status(organization_id, program_id)
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    payload = get_program_assignments_status(
+                        organization_id, program_id
+                    )
+                timings[label] = (time.perf_counter() - start) / iterations
+                payloads[label] = payload.model_dump(mode="json")
+
+        if payloads["validated"] != payloads["trusted"]:
+            raise CommandError("Trusted construction produced a different payload")
+
+        for label, seconds in timings.items():
+            self.stdout.write(f"{label}: {seconds * 1000:.2f} ms per payload")
+        self.stdout.write(
+            f"speedup: {timings['validated'] / timings['trusted']:.2f}x "
+            f"over {iterations} iterations"
+        )
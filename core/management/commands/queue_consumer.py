@@ -1,17 +1,9 @@
-import logging
-import time
+import asyncio
+import signal
 
 from django.core.management.base import BaseCommand
-from pydantic import ValidationError
 
-from core.services.notifications import send_notification_email
-from core.services.queue import (
-    delete_email_message,
-    parse_email_payload,
-    receive_email_messages,
-)
-
-logger = logging.getLogger(__name__)
+from core.services.queue_consumer import AsyncEmailQueueConsumer, EmailQueueConsumer
 
 
 class Command(BaseCommand):
@@ -36,48 +28,70 @@ class Command(BaseCommand):
             default=0.0,
             help="Optional sleep between empty polls.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Number of messages processed concurrently; with the asyncio "
+                "engine, the number of database threads."
+            ),
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=60,
+            help="Seconds a message stays hidden; extended while it is processed.",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["threads", "asyncio"],
+            default="threads",
+            help="Run messages on a thread pool or on an asyncio event loop.",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            default=50,
+            help="asyncio engine: maximum number of emails being sent at once.",
+        )
+        parser.add_argument(
+            "--max-pending",
+            type=int,
+            default=20,
+            help="asyncio engine: received messages to buffer before pausing polls.",
+        )
 
     def handle(self, *args, **options):
-        wait_time = options["wait_time"]
-        max_number = options["max_number"]
-        sleep_seconds = options["sleep"]
-
-        self.stdout.write(self.style.SUCCESS("Starting email queue consumer..."))
+        if options["engine"] == "asyncio":
+            consumer = AsyncEmailQueueConsumer(
+                max_in_flight=options["max_in_flight"],
+                max_pending=options["max_pending"],
+                db_workers=options["workers"],
+                max_number=options["max_number"],
+                wait_time=options["wait_time"],
+                sleep=options["sleep"],
+                visibility_timeout=options["visibility_timeout"],
+            )
+        else:
+            consumer = EmailQueueConsumer(
+                workers=options["workers"],
+                max_number=options["max_number"],
+                wait_time=options["wait_time"],
+                sleep=options["sleep"],
+                visibility_timeout=options["visibility_timeout"],
+            )
 
-        while True:
-            try:
-                messages = receive_email_messages(
-                    max_number=max_number,
-                    wait_time=wait_time,
-                )
-            except Exception:
-                logger.exception("Failed to poll SQS queue")
-                if sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
-                continue
+        def _stop(signum, frame):
+            self.stdout.write("Draining email queue consumer...")
+            consumer.stop()
 
-            if not messages:
-                if sleep_seconds > 0:
-                    time.sleep(sleep_seconds)
-                continue
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
 
-            for message in messages:
-                receipt_handle = message.get("ReceiptHandle")
-                raw_body = message.get("Body", "{}")
-
-                try:
-                    payload = parse_email_payload(raw_body)
-                    send_notification_email(
-                        organization_id=payload.organization_id,
-                        program_id=payload.program_id,
-                        musician_id=payload.musician_id,
-                        notification_type=payload.notification_type,
-                    )
-                    if receipt_handle:
-                        delete_email_message(receipt_handle)
-                except (ValueError, ValidationError):
-                    logger.exception("Invalid email payload: %s", raw_body)
-                    if receipt_handle:
-                        delete_email_message(receipt_handle)
-                except Exception:
-                    logger.exception("Failed to process email message")
+        self.stdout.write(self.style.SUCCESS("Starting email queue consumer..."))
+        if options["engine"] == "asyncio":
+            asyncio.run(consumer.run())
+        else:
+            consumer.run()
+        self.stdout.write(self.style.SUCCESS("Email queue consumer stopped."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.services.assignment_history import rebuild_part_assignment_history
+
+
+class Command(BaseCommand):
+    help = "Recount the part assignment history used for assignment suggestions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--organization",
+            dest="organization_id",
+            help="Only rebuild this organization ID.",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_part_assignment_history(options["organization_id"])
+        self.stdout.write(f"Rebuilt {written} part assignment history rows.")
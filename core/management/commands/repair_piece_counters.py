@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.services.music import refresh_piece_part_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored parts_count and completed_parts for pieces."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--piece",
+            action="append",
+            dest="piece_ids",
+            help="Only repair this piece ID. May be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        updated = refresh_piece_part_counts(options["piece_ids"])
+        self.stdout.write(f"Repaired part counters for {updated} pieces.")
@@ -0,0 +1,53 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+from core.utils import normalize_search_text
+
+# pg_trgm is optional: when the server ships it, index the search document for
+# substring and fuzzy matching; otherwise search falls back to the tsvector index.
+CREATE_TRIGRAM_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS core_piece_search_trgm
+            ON core_piece USING gin (search_document gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS core_piece_search_trgm;"
+
+
+def populate_search_document(apps, schema_editor):
+    Piece = apps.get_model("core", "Piece")
+    pieces = list(Piece.objects.only("id", "title", "composer"))
+    for piece in pieces:
+        piece.search_document = normalize_search_text(f"{piece.title} {piece.composer}")
+    Piece.objects.bulk_update(pieces, ["search_document"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_musicianinstrument_primary_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="piece",
+            name="search_document",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.RunPython(populate_search_document, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="piece",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    "search_document", config="simple"
+                ),
+                name="core_piece_search_vector",
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGRAM_INDEX, DROP_TRIGRAM_INDEX),
+    ]
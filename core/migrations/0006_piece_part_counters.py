@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from core.enum.music import PartAssetType
+from core.enum.status import UploadStatus
+
+
+def populate_part_counters(apps, schema_editor):
+    Piece = apps.get_model("core", "Piece")
+    Part = apps.get_model("core", "Part")
+    parts = Part.objects.filter(piece_id=OuterRef("id")).values("piece_id")
+    completed = parts.filter(
+        assets__status=UploadStatus.UPLOADED.value,
+        assets__asset_type=PartAssetType.CLEAN.value,
+    )
+    Piece.objects.update(
+        parts_count=Coalesce(
+            Subquery(parts.annotate(count=Count("id")).values("count")), 0
+        ),
+        completed_parts=Coalesce(
+            Subquery(
+                completed.annotate(count=Count("id", distinct=True)).values("count")
+            ),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_piece_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="piece",
+            name="completed_parts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="piece",
+            name="parts_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_part_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_piece_part_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="program",
+            name="assignments_version",
+            field=models.IntegerField(default=0),
+        ),
+    ]
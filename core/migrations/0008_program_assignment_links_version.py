@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_program_assignments_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="program",
+            name="assignment_links_version",
+            field=models.IntegerField(default=0),
+        ),
+    ]
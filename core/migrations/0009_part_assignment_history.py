@@ -0,0 +1,124 @@
+import uuid
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_part_assignment_history(apps, schema_editor):
+    Part = apps.get_model("core", "Part")
+    PartInstrument = apps.get_model("core", "PartInstrument")
+    ProgramPartMusician = apps.get_model("core", "ProgramPartMusician")
+    PartAssignmentHistory = apps.get_model("core", "PartAssignmentHistory")
+
+    assignments = ProgramPartMusician.objects.filter(program__isnull=False)
+    part_ids = assignments.values("part_id")
+    instruments = defaultdict(list)
+    for part_id, primary, name in (
+        PartInstrument.objects.filter(part_id__in=part_ids)
+        .order_by("part_id", "-primary", "instrument__name")
+        .values_list("part_id", "primary", "instrument__name")
+    ):
+        instruments[part_id].append(name)
+    chairs = {
+        part_id: (organization_id, piece_id, " / ".join(instruments[part_id]), number)
+        for part_id, organization_id, piece_id, number in Part.objects.filter(
+            id__in=part_ids
+        ).values_list("id", "piece__organization_id", "piece_id", "number")
+    }
+
+    counts = Counter(
+        (*chairs[part_id], musician_id)
+        for part_id, musician_id in assignments.values_list("part_id", "musician_id")
+    )
+    PartAssignmentHistory.objects.bulk_create(
+        [
+            PartAssignmentHistory(
+                organization_id=organization_id,
+                piece_id=piece_id,
+                descriptor=descriptor,
+                number=number,
+                musician_id=musician_id,
+                assignment_count=count,
+            )
+            for (
+                organization_id,
+                piece_id,
+                descriptor,
+                number,
+                musician_id,
+            ), count in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_program_assignment_links_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PartAssignmentHistory",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("descriptor", models.CharField(max_length=255)),
+                ("number", models.IntegerField(blank=True, null=True)),
+                ("assignment_count", models.IntegerField(default=0)),
+                (
+                    "musician",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.musician",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.organization",
+                    ),
+                ),
+                (
+                    "piece",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.piece",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["organization", "descriptor", "number"],
+                        name="core_part_history_chair",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "organization",
+                            "piece",
+                            "descriptor",
+                            "number",
+                            "musician",
+                        ),
+                        name="unique_part_assignment_history",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_part_assignment_history, migrations.RunPython.noop
+        ),
+    ]
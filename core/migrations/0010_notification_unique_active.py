@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+def fail_duplicate_notifications(apps, schema_editor):
+    """Keep one live notification per program, recipient and type.
+
+    Duplicates could only come from concurrent sends racing the old
+    check-then-insert dedupe. The sent (or else oldest) row is kept and the
+    others are marked failed so the constraint can be created.
+    """
+    Notification = apps.get_model("core", "Notification")
+    seen = set()
+    duplicate_ids = []
+    # "Sent" sorts after "Created", so descending status puts sent rows first
+    for notification_id, program_id, recipient_id, notification_type in (
+        Notification.objects.exclude(status="Failed")
+        .filter(program__isnull=False, recipient__isnull=False)
+        .order_by("program_id", "recipient_id", "type", "-status", "created")
+        .values_list("id", "program_id", "recipient_id", "type")
+        .iterator()
+    ):
+        key = (program_id, recipient_id, notification_type)
+        if key in seen:
+            duplicate_ids.append(notification_id)
+        else:
+            seen.add(key)
+    Notification.objects.filter(id__in=duplicate_ids).update(status="Failed")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_part_assignment_history"),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "Failed"), _negated=True),
+                fields=("program", "recipient", "type"),
+                name="unique_active_notification",
+            ),
+        ),
+    ]
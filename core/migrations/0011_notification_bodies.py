@@ -0,0 +1,102 @@
+import hashlib
+import uuid
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_notification_bodies(apps, schema_editor):
+    """Store existing bodies in NotificationBody; identical bodies share a row.
+
+    Old bodies are kept whole: the values they were rendered with are not
+    recorded, so nothing is cut out of them.
+    """
+    Notification = apps.get_model("core", "Notification")
+    NotificationBody = apps.get_model("core", "NotificationBody")
+
+    body_ids = {}
+
+    def get_body_id(text):
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        if digest not in body_ids:
+            body, _ = NotificationBody.objects.get_or_create(
+                digest=digest, defaults={"content": zlib.compress(text.encode())}
+            )
+            body_ids[digest] = body.id
+        return body_ids[digest]
+
+    notifications = Notification.objects.only("id", "body", "body_html").iterator()
+    batch = []
+    for notification in notifications:
+        notification.text_body_id = get_body_id(notification.body)
+        notification.html_body_id = get_body_id(notification.body_html)
+        batch.append(notification)
+        if len(batch) == 1000:
+            Notification.objects.bulk_update(batch, ["text_body", "html_body"])
+            batch = []
+    Notification.objects.bulk_update(batch, ["text_body", "html_body"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_notification_unique_active"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationBody",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("digest", models.CharField(max_length=64, unique=True)),
+                ("content", models.BinaryField()),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="body_values",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="html_body",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.notificationbody",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="text_body",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.notificationbody",
+            ),
+        ),
+        migrations.RunPython(move_notification_bodies, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="notification",
+            name="body",
+        ),
+        migrations.RemoveField(
+            model_name="notification",
+            name="body_html",
+        ),
+    ]
@@ -9,10 +9,13 @@ from django.db.models import (
     CASCADE,
     Q,
 )
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from core.models.base import UUIDPrimaryKeyModel
 from core.models.organizations import Musician, Organization
 from core.enum.music import PartAssetType
 from core.enum.status import UploadStatus
+from core.utils import normalize_search_text
 
 
 class Instrument(UUIDPrimaryKeyModel):
@@ -56,10 +59,30 @@ class Piece(UUIDPrimaryKeyModel):
     instrumentation = TextField()
     duration = IntegerField(null=True)
     organization = ForeignKey(Organization, on_delete=CASCADE)
+    # Accent-folded title and composer, maintained on save for indexed search
+    search_document = TextField(default="", blank=True)
+    # Denormalized part counters, maintained by the music services
+    parts_count = IntegerField(default=0)
+    completed_parts = IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                SearchVector("search_document", config="simple"),
+                name="core_piece_search_vector",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.composer}"
 
+    def save(self, *args, **kwargs):
+        self.search_document = normalize_search_text(f"{self.title} {self.composer}")
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"title", "composer"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
+
 
 class Part(UUIDPrimaryKeyModel):
     piece = ForeignKey(Piece, related_name="parts", on_delete=CASCADE)
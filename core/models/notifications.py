@@ -1,13 +1,21 @@
+import hashlib
+import re
 import secrets
+import zlib
+from functools import lru_cache
 
 from django.utils import timezone
 from django.db.models import (
+    PROTECT,
+    BinaryField,
     BooleanField,
     CharField,
     DateTimeField,
     SET_NULL,
     ForeignKey,
-    TextField,
+    JSONField,
+    Q,
+    UniqueConstraint,
 )
 from core.enum.notifications import (
     MagicLinkType,
@@ -40,6 +48,43 @@ class MagicLink(UUIDPrimaryKeyModel):
     completed_on = DateTimeField(null=True, blank=True)
 
 
+# Marks where a per-recipient value was cut out of a shared body
+NOTIFICATION_BODY_PLACEHOLDER = "\x00{}\x00"
+NOTIFICATION_BODY_PLACEHOLDER_PATTERN = re.compile("\x00(\\d+)\x00")
+
+
+class NotificationBody(UUIDPrimaryKeyModel):
+    """A rendered email body stored once, zlib-compressed, keyed by its hash.
+
+    Per-recipient values such as the greeting name and the magic link are
+    replaced by placeholders, so every recipient of a fan-out shares a row and
+    the values live on the notification.
+    """
+
+    digest = CharField(max_length=64, unique=True)
+    content = BinaryField()
+
+    @staticmethod
+    def get_digest(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return zlib.compress(text.encode())
+
+    def render(self, values: list[str]) -> str:
+        return NOTIFICATION_BODY_PLACEHOLDER_PATTERN.sub(
+            lambda match: values[int(match.group(1))],
+            _decompress_notification_body(self.digest, bytes(self.content)),
+        )
+
+
+@lru_cache(maxsize=256)
+def _decompress_notification_body(digest: str, content: bytes) -> str:
+    # Bodies are immutable per digest, and a fan-out renders the same few
+    return zlib.decompress(content).decode()
+
+
 class Notification(UUIDPrimaryKeyModel):
     created = DateTimeField(null=True, blank=True)
     method = CharField(
@@ -63,5 +108,30 @@ class Notification(UUIDPrimaryKeyModel):
     recipient = ForeignKey(Musician, null=True, blank=True, on_delete=SET_NULL)
     magic_link = ForeignKey(MagicLink, null=True, blank=True, on_delete=SET_NULL)
     subject = CharField(max_length=255)
-    body = TextField()
-    body_html = TextField()
+    text_body = ForeignKey(
+        NotificationBody, null=True, blank=True, on_delete=PROTECT, related_name="+"
+    )
+    html_body = ForeignKey(
+        NotificationBody, null=True, blank=True, on_delete=PROTECT, related_name="+"
+    )
+    # Per-recipient values cut out of the bodies, in placeholder order
+    body_values = JSONField(default=list, blank=True)
+
+    @property
+    def body(self) -> str:
+        return self.text_body.render(self.body_values) if self.text_body else ""
+
+    @property
+    def body_html(self) -> str:
+        return self.html_body.render(self.body_values) if self.html_body else ""
+
+    class Meta:
+        constraints = [
+            # One live notification per program, recipient and type; a failed
+            # one does not block a retry.
+            UniqueConstraint(
+                fields=["program", "recipient", "type"],
+                condition=~Q(status=NotificationStatus.FAILED.value),
+                name="unique_active_notification",
+            )
+        ]
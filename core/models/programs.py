@@ -4,6 +4,7 @@ from django.db.models import (
     OneToOneField,
     DateTimeField,
     ForeignKey,
+    Index,
     IntegerField,
     UniqueConstraint,
     CASCADE,
@@ -18,6 +19,12 @@ from core.models.users import User
 class Program(UUIDPrimaryKeyModel):
     name = CharField(max_length=255)
     organization = ForeignKey(Organization, on_delete=CASCADE)
+    # Bumped on every write to the program's parts, roster or assignments so
+    # clients and caches can detect stale assignment state.
+    assignments_version = IntegerField(default=0)
+    # Bumped when assignment magic links are created or stamped. Kept apart from
+    # assignments_version so link visits do not invalidate open assignment grids.
+    assignment_links_version = IntegerField(default=0)
 
     def __str__(self):
         return f"{self.name}"
@@ -70,6 +77,37 @@ class ProgramPartMusician(UUIDPrimaryKeyModel):
         ]
 
 
+class PartAssignmentHistory(UUIDPrimaryKeyModel):
+    """How many programs seated a musician in one chair of a piece.
+
+    A chair is a part descriptor (its instruments, primary first) and number.
+    Rows are rebuilt per chair by the assignment history service whenever
+    assignments change, so suggestions never scan ProgramPartMusician.
+    """
+
+    organization = ForeignKey(Organization, on_delete=CASCADE)
+    piece = ForeignKey(Piece, on_delete=CASCADE)
+    descriptor = CharField(max_length=255)
+    number = IntegerField(null=True, blank=True)
+    musician = ForeignKey(Musician, on_delete=CASCADE)
+    assignment_count = IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["organization", "piece", "descriptor", "number", "musician"],
+                name="unique_part_assignment_history",
+                nulls_distinct=False,
+            )
+        ]
+        indexes = [
+            Index(
+                fields=["organization", "descriptor", "number"],
+                name="core_part_history_chair",
+            )
+        ]
+
+
 class ProgramPerformance(UUIDPrimaryKeyModel):
     program = ForeignKey(Program, related_name="performances", on_delete=CASCADE)
     date = DateTimeField()
@@ -0,0 +1,281 @@
+import logging
+import select
+import threading
+import time
+from collections import deque
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from core.dtos.programs import (
+    ProgramAssignmentEventDTO,
+    ProgramAssignmentEventsDTO,
+)
+from core.enum.notifications import MagicLinkType
+from core.enum.programs import ProgramAssignmentEventType
+from core.models.notifications import MagicLink
+from core.models.programs import Program
+
+logger = logging.getLogger(__name__)
+
+ASSIGNMENT_EVENT_CHANNEL = "program_assignment_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+_broker = None
+
+
+class InProcessAssignmentEventBroker:
+    """Fan out assignment events to long-poll requests in this process.
+
+    The most recent events of each program are kept, so a request that arrives
+    just after a change still receives it.
+    """
+
+    def __init__(self, buffer_size: int = 50, max_programs: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_programs = max_programs
+        self._condition = threading.Condition()
+        self._events: dict[str, deque[ProgramAssignmentEventDTO]] = {}
+
+    def publish(self, event: ProgramAssignmentEventDTO) -> None:
+        self._append(event)
+
+    def wait(
+        self,
+        program_id: str,
+        version: int,
+        links_version: int,
+        timeout: float,
+    ) -> list[ProgramAssignmentEventDTO]:
+        """Return buffered events newer than the given versions.
+
+        Blocks for up to `timeout` seconds when there are none yet.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events = [
+                    event
+                    for event in self._events.get(str(program_id), ())
+                    if _is_newer(event, version, links_version)
+                ]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._condition.wait(remaining)
+
+    def _append(self, event: ProgramAssignmentEventDTO) -> None:
+        with self._condition:
+            # Re-inserting keeps the dict ordered by last activity, so the
+            # least recently changed program is dropped first.
+            events = self._events.pop(event.program_id, None)
+            if events is None:
+                events = deque(maxlen=self.buffer_size)
+            events.append(event)
+            self._events[event.program_id] = events
+            while len(self._events) > self.max_programs:
+                self._events.pop(next(iter(self._events)))
+            self._condition.notify_all()
+
+
+class PostgresAssignmentEventBroker(InProcessAssignmentEventBroker):
+    """Share assignment events between worker processes with LISTEN/NOTIFY.
+
+    Events are published with NOTIFY, and every process that serves long-poll
+    requests runs one listener thread feeding its local buffer, including the
+    process that published the event.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._listening = threading.Event()
+        self._stopping = threading.Event()
+
+    def publish(self, event: ProgramAssignmentEventDTO) -> None:
+        payload = event.model_dump_json()
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+            # Too large to send; clients reload the full payload instead.
+            payload = event.model_copy(
+                update={"parts": [], "summary": None, "principals": []}
+            ).model_dump_json()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)", [ASSIGNMENT_EVENT_CHANNEL, payload]
+            )
+
+    def wait(
+        self,
+        program_id: str,
+        version: int,
+        links_version: int,
+        timeout: float,
+    ) -> list[ProgramAssignmentEventDTO]:
+        """Return events newer than the given versions, as the base broker does.
+
+        Returns no events when the listener is not subscribed within `timeout`,
+        e.g. while it reconnects; the buffer may be missing events then, and
+        callers reload when the program has moved on.
+        """
+        deadline = time.monotonic() + timeout
+        if not self.start_listener(timeout):
+            return []
+        return super().wait(
+            program_id, version, links_version, max(deadline - time.monotonic(), 0)
+        )
+
+    def start_listener(self, timeout: float | None = None) -> bool:
+        """Start the listener thread if needed.
+
+        Returns:
+            Whether the listener is subscribed within `timeout` seconds.
+        """
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._stopping.clear()
+                self._listener = threading.Thread(
+                    target=self._listen,
+                    name="assignment-event-listener",
+                    daemon=True,
+                )
+                self._listener.start()
+        return self._listening.wait(timeout)
+
+    def stop_listener(self) -> None:
+        with self._listener_lock:
+            self._stopping.set()
+            if self._listener is not None:
+                self._listener.join()
+                self._listener = None
+
+    def _listen(self) -> None:
+        while not self._stopping.is_set():
+            listen_connection = None
+            try:
+                listen_connection = connection.get_new_connection(
+                    connection.get_connection_params()
+                )
+                listen_connection.autocommit = True
+                with listen_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {ASSIGNMENT_EVENT_CHANNEL}")
+                self._listening.set()
+                while not self._stopping.is_set():
+                    if not select.select([listen_connection], [], [], 1)[0]:
+                        continue
+                    listen_connection.poll()
+                    while listen_connection.notifies:
+                        notify = listen_connection.notifies.pop(0)
+                        self._append(
+                            ProgramAssignmentEventDTO.model_validate_json(
+                                notify.payload
+                            )
+                        )
+            except Exception:
+                # Events sent while reconnecting are lost; clients notice the
+                # version gap on their next poll and reload.
+                logger.exception("Assignment event listener failed; reconnecting")
+                time.sleep(1)
+            finally:
+                self._listening.clear()
+                if listen_connection is not None:
+                    listen_connection.close()
+
+
+def get_assignment_event_broker() -> InProcessAssignmentEventBroker:
+    global _broker
+    if _broker is None:
+        if settings.ASSIGNMENT_EVENTS_BACKEND == "postgres":
+            _broker = PostgresAssignmentEventBroker()
+        else:
+            _broker = InProcessAssignmentEventBroker()
+    return _broker
+
+
+def publish_assignment_event(event: ProgramAssignmentEventDTO) -> None:
+    """Publish an event once the surrounding transaction commits."""
+    transaction.on_commit(partial(get_assignment_event_broker().publish, event))
+
+
+def publish_magic_link_event(
+    magic_link: MagicLink, event_type: ProgramAssignmentEventType
+) -> None:
+    """Tell watching program pages that a principal opened or completed a link."""
+    if magic_link.type != MagicLinkType.ASSIGNMENT.value or not magic_link.program_id:
+        return
+
+    version, links_version = Program.objects.values_list(
+        "assignments_version", "assignment_links_version"
+    ).get(id=magic_link.program_id)
+    publish_assignment_event(
+        ProgramAssignmentEventDTO.construct_trusted(
+            type=event_type,
+            program_id=str(magic_link.program_id),
+            version=version,
+            links_version=links_version,
+            musician_id=str(magic_link.musician_id),
+            occurred_on=(
+                magic_link.completed_on
+                if event_type == ProgramAssignmentEventType.LINK_COMPLETED
+                else magic_link.last_accessed_on
+            ),
+        )
+    )
+
+
+def wait_for_program_assignment_events(
+    organization_id: str,
+    program_id: str,
+    version: int,
+    links_version: int,
+    timeout: float,
+) -> ProgramAssignmentEventsDTO:
+    """Long-poll for assignment events newer than the client's versions.
+
+    Returns at once when the program has already moved on, otherwise waits up
+    to `timeout` seconds for the next event. `reload` is set when the buffered
+    events do not cover every change since the client's versions, e.g. after a
+    write that publishes no event or one handled by another process.
+
+    Raises:
+        Program.DoesNotExist: If the program is not in this organization.
+    """
+    current_version, current_links_version = Program.objects.values_list(
+        "assignments_version", "assignment_links_version"
+    ).get(id=program_id, organization_id=organization_id)
+
+    broker = get_assignment_event_broker()
+    if (current_version, current_links_version) == (version, links_version):
+        events = broker.wait(program_id, version, links_version, timeout)
+    else:
+        events = broker.wait(program_id, version, links_version, 0)
+
+    reload = False
+    next_version = version
+    next_links_version = links_version
+    for event in sorted(events, key=lambda event: (event.version, event.links_version)):
+        if event.type == ProgramAssignmentEventType.ASSIGNMENTS:
+            if event.previous_version != next_version or event.summary is None:
+                reload = True
+            next_version = max(next_version, event.version)
+        else:
+            next_links_version = max(next_links_version, event.links_version)
+    if next_version < current_version or next_links_version < current_links_version:
+        reload = True
+
+    return ProgramAssignmentEventsDTO.construct_trusted(
+        events=events,
+        version=next_version,
+        links_version=next_links_version,
+        reload=reload,
+    )
+
+
+def _is_newer(
+    event: ProgramAssignmentEventDTO, version: int, links_version: int
+) -> bool:
+    if event.type == ProgramAssignmentEventType.ASSIGNMENTS:
+        return event.version > version
+    return event.links_version > links_version
@@ -0,0 +1,191 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+from typing import Iterable, Optional
+
+from django.db.models import Q
+
+from core.models.music import Part, Piece
+from core.models.programs import PartAssignmentHistory, ProgramPartMusician
+from core.services.music import get_part_descriptor
+
+Chair = tuple[str, str, str, Optional[int]]
+
+
+def get_part_chair(part: Part) -> Chair:
+    """The history key of a part: organization, piece, descriptor and number."""
+    return (
+        str(part.piece.organization_id),
+        str(part.piece_id),
+        get_part_descriptor(part),
+        part.number,
+    )
+
+
+def refresh_part_assignment_history(part_ids: Iterable[str]) -> int:
+    """
+    Rebuild the assignment history of the chairs these parts belong to.
+
+    History rows are recounted from the chairs' ProgramPartMusician rows rather
+    than adjusted by deltas, so calling this inside the transaction that
+    changed the assignments keeps them exact. The cost depends on the size of
+    the affected pieces, not on the number of programs in the organization.
+
+    Programs share pieces, so the affected Piece rows are locked (in id order)
+    before recounting: a concurrent writer on another program waits for this
+    transaction to commit and then recounts with its rows included. Callers
+    hold their program lock first, so the lock order is program, then pieces.
+
+    Returns:
+        Number of history rows written.
+    """
+    part_ids = {str(part_id) for part_id in part_ids}
+    if not part_ids:
+        return 0
+
+    piece_ids = list(
+        Piece.objects.select_for_update()
+        .filter(id__in=Part.objects.filter(id__in=part_ids).values("piece_id"))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    piece_parts = list(
+        Part.objects.filter(piece_id__in=piece_ids)
+        .select_related("piece")
+        .prefetch_related("instruments__instrument")
+    )
+    chairs_by_part_id = {str(part.id): get_part_chair(part) for part in piece_parts}
+    chairs = {chairs_by_part_id[part_id] for part_id in part_ids}
+    chair_part_ids = [
+        part_id for part_id, chair in chairs_by_part_id.items() if chair in chairs
+    ]
+
+    counts = Counter(
+        (chairs_by_part_id[str(part_id)], str(musician_id))
+        for part_id, musician_id in ProgramPartMusician.objects.filter(
+            part_id__in=chair_part_ids, program__isnull=False
+        ).values_list("part_id", "musician_id")
+    )
+
+    PartAssignmentHistory.objects.filter(
+        reduce(
+            or_,
+            (
+                Q(
+                    organization_id=organization_id,
+                    piece_id=piece_id,
+                    descriptor=descriptor,
+                    number=number,
+                )
+                for organization_id, piece_id, descriptor, number in chairs
+            ),
+        )
+    ).delete()
+    PartAssignmentHistory.objects.bulk_create(
+        [
+            PartAssignmentHistory(
+                organization_id=organization_id,
+                piece_id=piece_id,
+                descriptor=descriptor,
+                number=number,
+                musician_id=musician_id,
+                assignment_count=count,
+            )
+            for (
+                (organization_id, piece_id, descriptor, number),
+                musician_id,
+            ), count in counts.items()
+        ]
+    )
+    return len(counts)
+
+
+def rebuild_part_assignment_history(organization_id: Optional[str] = None) -> int:
+    """Recount the assignment history of every assigned chair, e.g. after a backfill.
+
+    Returns:
+        Number of history rows written.
+    """
+    assignments = ProgramPartMusician.objects.filter(program__isnull=False)
+    history = PartAssignmentHistory.objects.all()
+    if organization_id:
+        assignments = assignments.filter(program__organization_id=organization_id)
+        history = history.filter(organization_id=organization_id)
+    history.delete()
+
+    part_ids = list(assignments.values_list("part_id", flat=True).distinct())
+    written = 0
+    for start in range(0, len(part_ids), 500):
+        written += refresh_part_assignment_history(part_ids[start : start + 500])
+    return written
+
+
+def get_part_assignment_history(
+    parts: list[Part],
+) -> dict[str, dict[str, tuple[int, int]]]:
+    """Who held each part's chair before, from the precomputed history.
+
+    For every part, maps musician IDs to `(piece_count, chair_count)`: how many
+    programs seated them in this chair of this piece, and in the same chair of
+    any other piece. Parts must have their piece and instruments loaded; the
+    lookup is a single query.
+    """
+    chairs_by_part_id = {str(part.id): get_part_chair(part) for part in parts}
+    if not chairs_by_part_id:
+        return {}
+
+    organization_ids = {chair[0] for chair in chairs_by_part_id.values()}
+    descriptors = {chair[2] for chair in chairs_by_part_id.values()}
+    rows_by_chair: defaultdict[tuple, list[tuple[str, str, int]]] = defaultdict(list)
+    for (
+        organization_id,
+        piece_id,
+        descriptor,
+        number,
+        musician_id,
+        count,
+    ) in PartAssignmentHistory.objects.filter(
+        organization_id__in=organization_ids, descriptor__in=descriptors
+    ).values_list(
+        "organization_id",
+        "piece_id",
+        "descriptor",
+        "number",
+        "musician_id",
+        "assignment_count",
+    ):
+        rows_by_chair[(str(organization_id), descriptor, number)].append(
+            (str(piece_id), str(musician_id), count)
+        )
+
+    history: dict[str, dict[str, tuple[int, int]]] = {}
+    for part_id, (
+        organization_id,
+        piece_id,
+        descriptor,
+        number,
+    ) in chairs_by_part_id.items():
+        musician_counts: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+        for row_piece_id, musician_id, count in rows_by_chair.get(
+            (organization_id, descriptor, number), []
+        ):
+            musician_counts[musician_id][0 if row_piece_id == piece_id else 1] += count
+        history[part_id] = {
+            musician_id: (piece_count, chair_count)
+            for musician_id, (piece_count, chair_count) in musician_counts.items()
+        }
+    return history
+
+
+def rank_part_assignment_history(
+    musician_counts: dict[str, tuple[int, int]],
+) -> list[str]:
+    """Order musicians by how often they held this chair on the piece, then anywhere."""
+    return sorted(
+        musician_counts,
+        key=lambda musician_id: (
+            -musician_counts[musician_id][0],
+            -musician_counts[musician_id][1],
+            musician_id,
+        ),
+    )
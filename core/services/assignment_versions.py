@@ -0,0 +1,57 @@
+from typing import Iterable
+
+from django.db.models import F
+
+from core.models.programs import Program
+
+ASSIGNMENT_STATUS_CACHE_PREFIX = "program-assignment-status"
+
+# Each bump accepts IDs or a values() queryset of IDs and runs one UPDATE.
+
+
+def bump_program_assignments_version(program_ids: Iterable[str]) -> None:
+    """Mark the assignment state of these programs as changed."""
+    Program.objects.filter(id__in=program_ids).update(
+        assignments_version=F("assignments_version") + 1
+    )
+
+
+def bump_piece_assignments_version(piece_ids: Iterable[str]) -> None:
+    """Mark every program that performs these pieces as changed."""
+    Program.objects.filter(pieces__piece_id__in=piece_ids).update(
+        assignments_version=F("assignments_version") + 1
+    )
+
+
+def bump_musician_assignments_version(musician_ids: Iterable[str]) -> None:
+    """Mark every program these musicians are rostered on as changed."""
+    Program.objects.filter(musicians__musician_id__in=musician_ids).update(
+        assignments_version=F("assignments_version") + 1
+    )
+
+
+def bump_program_assignment_links_version(program_ids: Iterable[str]) -> None:
+    """Mark the assignment magic-link state of these programs as changed."""
+    Program.objects.filter(id__in=program_ids).update(
+        assignment_links_version=F("assignment_links_version") + 1
+    )
+
+
+def get_program_assignment_status_cache_key(
+    organization_id: str, program_id: str
+) -> str:
+    """Cache key for a program's current assignment status payload.
+
+    The key embeds both program version counters, so any write that bumps them
+    retires cached payloads in every process without explicit deletes.
+
+    Raises:
+        Program.DoesNotExist: If the program is not in this organization.
+    """
+    assignments_version, links_version = Program.objects.values_list(
+        "assignments_version", "assignment_links_version"
+    ).get(id=program_id, organization_id=organization_id)
+    return (
+        f"{ASSIGNMENT_STATUS_CACHE_PREFIX}:{program_id}:"
+        f"{assignments_version}:{links_version}"
+    )
@@ -1,12 +1,18 @@
 from collections import defaultdict
 
+import pgbulk
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 from core.dtos.organizations import MusicianDTO, OrganizationDTO
 from core.dtos.music import PartDTO
 from core.dtos.programs import (
     ProgramAssignmentAssignedMusicianDTO,
+    ProgramAssignmentDeltaDTO,
     ProgramAssignmentDTO,
+    ProgramAssignmentEventDTO,
+    ProgramAssignmentEventPartDTO,
     ProgramAssignmentPartDTO,
     ProgramAssignmentPieceDTO,
     ProgramAssignmentPrincipalPartsDTO,
@@ -15,26 +21,182 @@ from core.dtos.programs import (
     ProgramAssignmentSummaryDTO,
 )
 from core.enum.notifications import MagicLinkType
+from core.enum.programs import ProgramAssignmentEventType
 from core.enum.instruments import (
-    INSTRUMENT_SECTIONS,
-    get_assignment_scope_for_instruments,
+    INSTRUMENT_SECTION_MASKS,
+    get_assignment_scope_mask,
+    get_instrument_mask,
+    InstrumentEnum,
     InstrumentSectionEnum,
+    is_single_instrument_mask,
 )
 from core.models.notifications import MagicLink
 from core.models.music import Part
 from core.models.programs import (
     Program,
-    ProgramChecklist,
     ProgramMusician,
     ProgramPartMusician,
     ProgramPiece,
 )
-from core.services.music import get_part_instruments
-from core.services.programs import get_program_musician_instruments
+from core.services.assignment_events import publish_assignment_event
+from core.services.assignment_history import (
+    get_part_assignment_history,
+    rank_part_assignment_history,
+    refresh_part_assignment_history,
+)
+from core.services.assignment_versions import (
+    bump_program_assignments_version,
+    get_program_assignment_status_cache_key,
+)
+from core.services.matching import solve_assignment
+from core.services.music import get_part_instrument_mask
+from core.services.programs import get_program_musician_instrument_mask
+
+STRING_INSTRUMENTS_MASK = INSTRUMENT_SECTION_MASKS[InstrumentSectionEnum.STRINGS]
+HARP_KEYBOARD_INSTRUMENTS_MASK = (
+    INSTRUMENT_SECTION_MASKS[InstrumentSectionEnum.HARP]
+    | INSTRUMENT_SECTION_MASKS[InstrumentSectionEnum.KEYBOARD]
+)
+# Past holders of a chair offered to principals on each part.
+MAX_PART_SUGGESTIONS = 3
+
+
+class ProgramAssignmentSnapshot:
+    """Everything the assignment services read about a program, loaded once.
+
+    Loading costs a fixed number of queries regardless of the number of
+    principals, parts or musicians, so status pages and notification fan-out
+    can evaluate every principal against the same rows. Writes made through
+    `set_assignment()` keep the snapshot current for later reads.
+
+    Part and roster instruments are held as `InstrumentEnum` bitmasks, so scope
+    and eligibility checks are single AND operations.
+    """
+
+    def __init__(self, program_id: str, organization_id: str | None = None):
+        program_filter = {"id": program_id}
+        if organization_id:
+            program_filter["organization_id"] = organization_id
+        self.program = Program.objects.select_related("organization", "checklist").get(
+            **program_filter
+        )
+        self.organization = OrganizationDTO.from_model(self.program.organization)
+        self.version = self.program.assignments_version
+        self.previous_version = self.version
+
+        self.piece_ids = list(
+            ProgramPiece.objects.filter(program_id=self.program.id).values_list(
+                "piece_id", flat=True
+            )
+        )
+        self.parts: list[Part] = list(
+            Part.objects.filter(piece_id__in=self.piece_ids)
+            .select_related("piece")
+            .prefetch_related("instruments__instrument")
+        )
+        self.part_masks = {
+            str(part.id): get_part_instrument_mask(part) for part in self.parts
+        }
+
+        self.program_musicians: list[ProgramMusician] = list(
+            ProgramMusician.objects.filter(program_id=self.program.id)
+            .select_related("musician", "musician__organization")
+            .prefetch_related(
+                "instruments__instrument", "musician__instruments__instrument"
+            )
+        )
+        self.program_musicians_by_musician_id = {
+            str(program_musician.musician_id): program_musician
+            for program_musician in self.program_musicians
+        }
+        self.musician_primary_masks = {
+            str(program_musician.musician_id): get_instrument_mask(
+                InstrumentEnum(musician_instrument.instrument.name)
+                for musician_instrument in program_musician.musician.instruments.all()
+                if musician_instrument.primary
+            )
+            for program_musician in self.program_musicians
+        }
+        self.musician_masks = {
+            str(program_musician.musician_id): get_program_musician_instrument_mask(
+                program_musician
+            )
+            for program_musician in self.program_musicians
+        }
+
+        part_ids = set(self.part_masks)
+        self.assignments: dict[str, ProgramPartMusician] = {
+            str(assignment.part_id): assignment
+            for assignment in ProgramPartMusician.objects.filter(
+                program_id=self.program.id
+            ).select_related("musician")
+            if str(assignment.part_id) in part_ids
+        }
+
+        self.magic_links: defaultdict[str, list[MagicLink]] = defaultdict(list)
+        for magic_link in MagicLink.objects.filter(
+            program_id=self.program.id,
+            type=MagicLinkType.ASSIGNMENT.value,
+            revoked=False,
+        ):
+            self.magic_links[str(magic_link.musician_id)].append(magic_link)
+
+        self._part_history: dict[str, dict[str, tuple[int, int]]] | None = None
+
+    @property
+    def part_history(self) -> dict[str, dict[str, tuple[int, int]]]:
+        """Past holders of each part's chair, loaded with one query on first use."""
+        if self._part_history is None:
+            self._part_history = get_part_assignment_history(self.parts)
+        return self._part_history
+
+    def get_assigned_musician_id(self, part_id: str) -> str | None:
+        assignment = self.assignments.get(str(part_id))
+        return str(assignment.musician_id) if assignment else None
+
+    def set_assignment(self, part_id: str, musician_id: str | None) -> None:
+        """Persist an assignment and mirror it in the snapshot."""
+        self.set_assignments({part_id: musician_id})
+
+    def set_assignments(
+        self, changes: dict[str, str | None], overwrite: bool = True
+    ) -> dict[str, str | None]:
+        """Persist a batch of assignments and mirror them in the snapshot.
+
+        `changes` maps part IDs to musician IDs, or to `None` to clear a part.
+
+        Returns:
+            The changes that were actually written; with `overwrite=False`,
+            parts assigned concurrently in the database are left out.
+        """
+        if not changes:
+            return {}
+        self.previous_version, self.version, changes = set_program_part_assignments(
+            program_id=str(self.program.id), changes=changes, overwrite=overwrite
+        )
+        if not changes:
+            return changes
+        for part_id, musician_id in changes.items():
+            if not musician_id:
+                self.assignments.pop(str(part_id), None)
+                continue
+            program_musician = self.program_musicians_by_musician_id.get(
+                str(musician_id)
+            )
+            self.assignments[str(part_id)] = ProgramPartMusician(
+                program_id=self.program.id,
+                part_id=part_id,
+                musician_id=musician_id,
+                musician=program_musician.musician if program_musician else None,
+            )
+        publish_assignment_event(get_program_assignment_event(self, list(changes)))
+        return changes
 
 
 def auto_assign_harp_keyboard_principal_parts_if_unambiguous(
-    program_id: str, principal_musician_id: str
+    program_id: str,
+    principal_musician_id: str,
+    snapshot: ProgramAssignmentSnapshot | None = None,
 ) -> bool:
     """Auto-assign harp/keyboard principals when no assignment decision is needed.
 
@@ -48,30 +210,23 @@ def auto_assign_harp_keyboard_principal_parts_if_unambiguous(
     Returns:
         True when auto-assignment was performed and assignment email can be skipped.
     """
-    principal_program_musician = (
-        ProgramMusician.objects.filter(
-            program_id=program_id,
-            musician_id=principal_musician_id,
-        )
-        .prefetch_related("instruments__instrument", "musician")
-        .first()
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id)
+    principal_program_musician = snapshot.program_musicians_by_musician_id.get(
+        str(principal_musician_id)
     )
     if not principal_program_musician or not principal_program_musician.principal:
         return False
 
-    principal_scope = get_assignment_scope_for_instruments(
-        get_program_musician_instruments(principal_program_musician)
-    )
-    auto_assignable_instruments = set(INSTRUMENT_SECTIONS[InstrumentSectionEnum.HARP])
-    auto_assignable_instruments.update(
-        INSTRUMENT_SECTIONS[InstrumentSectionEnum.KEYBOARD]
+    principal_scope = get_assignment_scope_mask(
+        snapshot.musician_masks[str(principal_musician_id)]
     )
-    if not principal_scope or not principal_scope.issubset(auto_assignable_instruments):
+    if not principal_scope or principal_scope & ~HARP_KEYBOARD_INSTRUMENTS_MASK:
         return False
 
     payload = get_assignment_payload(
         program_id=program_id,
         principal_musician_id=principal_musician_id,
+        snapshot=snapshot,
     )
     if not payload.pieces:
         return False
@@ -81,17 +236,15 @@ def auto_assign_harp_keyboard_principal_parts_if_unambiguous(
         return False
 
     musician_id = payload.eligible_musician_ids[0]
-    for piece in payload.pieces:
-        part = piece.parts[0]
-        set_program_part_assignment(
-            program_id=program_id,
-            part_id=part.id,
-            musician_id=musician_id,
-        )
+    snapshot.set_assignments(
+        {piece.parts[0].id: musician_id for piece in payload.pieces}
+    )
     return True
 
 
-def auto_assign_program_parts_if_unambiguous(program_id: str) -> int:
+def auto_assign_program_parts_if_unambiguous(
+    program_id: str, snapshot: ProgramAssignmentSnapshot | None = None
+) -> int:
     """Auto-assign unassigned parts with deterministic no-decision defaults.
 
     This currently targets strings, harp, and keyboard parts so the librarian gets
@@ -99,46 +252,16 @@ def auto_assign_program_parts_if_unambiguous(program_id: str) -> int:
 
     Existing assignments are never overwritten.
     """
-    string_instruments = set(INSTRUMENT_SECTIONS[InstrumentSectionEnum.STRINGS])
-    auto_assignable_instruments = set(string_instruments)
-    auto_assignable_instruments.update(INSTRUMENT_SECTIONS[InstrumentSectionEnum.HARP])
-    auto_assignable_instruments.update(
-        INSTRUMENT_SECTIONS[InstrumentSectionEnum.KEYBOARD]
-    )
-
-    program_piece_ids = list(
-        ProgramPiece.objects.filter(program_id=program_id).values_list(
-            "piece_id", flat=True
-        )
-    )
-    if not program_piece_ids:
-        return 0
-
-    parts = (
-        Part.objects.filter(piece_id__in=program_piece_ids)
-        .select_related("piece")
-        .prefetch_related("instruments__instrument")
-    )
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id)
+    parts = snapshot.parts
     if not parts:
         return 0
 
-    assigned_part_ids = set(
-        ProgramPartMusician.objects.filter(program_id=program_id).values_list(
-            "part_id", flat=True
-        )
-    )
-
-    program_musicians = (
-        ProgramMusician.objects.filter(program_id=program_id)
-        .prefetch_related("instruments__instrument")
-        .select_related("musician")
-    )
-    musician_instruments = {
-        str(program_musician.musician_id): get_program_musician_instruments(
-            program_musician
-        )
-        for program_musician in program_musicians
+    assigned_part_ids = {
+        part.id for part in parts if str(part.id) in snapshot.assignments
     }
+    program_musicians = snapshot.program_musicians
+    musician_masks = snapshot.musician_masks
 
     # Strings: assign by section instrument (chair number does not drive strings).
     # If there are multiple string players and multiple same-section parts, assign
@@ -147,20 +270,19 @@ def auto_assign_program_parts_if_unambiguous(program_id: str) -> int:
     for part in parts:
         if part.id in assigned_part_ids:
             continue
-        part_instruments = get_part_instruments(part)
-        if len(part_instruments) != 1:
+        part_mask = snapshot.part_masks[str(part.id)]
+        if not is_single_instrument_mask(part_mask):
             continue
-        primary_instrument = next(iter(part_instruments))
-        if primary_instrument in string_instruments:
-            string_parts_by_instrument[primary_instrument].append(part)
+        if part_mask & STRING_INSTRUMENTS_MASK:
+            string_parts_by_instrument[part_mask].append(part)
 
-    created = 0
-    for instrument, section_parts in string_parts_by_instrument.items():
+    changes: dict[str, str] = {}
+    for instrument_mask, section_parts in string_parts_by_instrument.items():
         eligible_program_musicians = [
             program_musician
             for program_musician in program_musicians
-            if instrument
-            in musician_instruments.get(str(program_musician.musician_id), set())
+            if instrument_mask
+            & musician_masks.get(str(program_musician.musician_id), 0)
         ]
         if not eligible_program_musicians:
             continue
@@ -181,47 +303,198 @@ def auto_assign_program_parts_if_unambiguous(program_id: str) -> int:
             )
         )
         for part, program_musician in zip(section_parts, eligible_program_musicians):
-            set_program_part_assignment(
-                program_id=program_id,
-                part_id=str(part.id),
-                musician_id=str(program_musician.musician_id),
-            )
-            created += 1
+            changes[str(part.id)] = str(program_musician.musician_id)
             assigned_part_ids.add(part.id)
 
     # Harp/keyboard: only auto-assign when strictly unambiguous.
     for part in parts:
         if part.id in assigned_part_ids:
             continue
-        part_instruments = get_part_instruments(part)
-        if not part_instruments:
+        part_mask = snapshot.part_masks[str(part.id)]
+        if not part_mask & HARP_KEYBOARD_INSTRUMENTS_MASK:
             continue
-        if not part_instruments.intersection(auto_assignable_instruments):
-            continue
-        if part_instruments.intersection(string_instruments):
+        if part_mask & STRING_INSTRUMENTS_MASK:
             continue
 
         eligible_musician_ids = [
             musician_id
-            for musician_id, instruments in musician_instruments.items()
-            if part_instruments.intersection(instruments)
+            for musician_id, musician_mask in musician_masks.items()
+            if part_mask & musician_mask
         ]
         if len(eligible_musician_ids) != 1:
             continue
 
-        set_program_part_assignment(
-            program_id=program_id,
-            part_id=str(part.id),
-            musician_id=eligible_musician_ids[0],
-        )
-        created += 1
+        changes[str(part.id)] = eligible_musician_ids[0]
         assigned_part_ids.add(part.id)
 
-    return created
+    snapshot.set_assignments(changes)
+    return len(changes)
+
+
+# Matching weights for proposed assignments. Eligibility is decided by the part's
+# primary instrument; these only rank the eligible musicians.
+PRIMARY_INSTRUMENT_WEIGHT = 8
+DOUBLING_COVERED_WEIGHT = 4
+PRINCIPAL_CHAIR_WEIGHT = 6
+SECTION_CHAIR_WEIGHT = 2
+# Past programs: held this chair on this piece, or the same chair on another one.
+PIECE_HISTORY_WEIGHT = 3
+CHAIR_HISTORY_WEIGHT = 1
+# Scale applied before the seating-order tie-break so it never outweighs a rule.
+WEIGHT_SCALE = 1000
+
+
+def propose_program_part_assignments(
+    program_id: str, snapshot: ProgramAssignmentSnapshot | None = None
+) -> dict[str, str]:
+    """Propose a musician for every unassigned part on a program.
+
+    Each piece is solved as a bipartite matching between its unassigned parts and
+    the roster members not yet seated on that piece. A musician is eligible for a
+    part when they play its primary instrument on this program; the matching then
+    prefers musicians whose own primary instrument it is, who also cover the
+    part's doublings, whose principal status fits the chair number, and who held
+    the same chair in past programs. Ties fall back to seating order (piece
+    parts by number, musicians by name).
+
+    Existing assignments are kept as they are and never proposed over.
+
+    Returns:
+        Part ID to musician ID for every part that could be filled.
+    """
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id)
+    program_musicians = sorted(
+        snapshot.program_musicians,
+        key=lambda program_musician: (
+            program_musician.musician.last_name.lower(),
+            program_musician.musician.first_name.lower(),
+            str(program_musician.musician_id),
+        ),
+    )
+
+    parts_by_piece: defaultdict[str, list[Part]] = defaultdict(list)
+    for part in snapshot.parts:
+        parts_by_piece[str(part.piece_id)].append(part)
+
+    proposal: dict[str, str] = {}
+    for piece_parts in parts_by_piece.values():
+        seated_musician_ids = {
+            str(snapshot.assignments[str(part.id)].musician_id)
+            for part in piece_parts
+            if str(part.id) in snapshot.assignments
+        }
+        open_parts = sorted(
+            (part for part in piece_parts if str(part.id) not in snapshot.assignments),
+            key=lambda part: (
+                part.number is None,
+                part.number if part.number is not None else 0,
+                str(part.id),
+            ),
+        )
+        open_parts_mask = 0
+        for part in open_parts:
+            open_parts_mask |= snapshot.part_masks[str(part.id)]
+        available_musicians = [
+            program_musician
+            for program_musician in program_musicians
+            if str(program_musician.musician_id) not in seated_musician_ids
+            and snapshot.musician_masks[str(program_musician.musician_id)]
+            & open_parts_mask
+        ]
+        if not open_parts or not available_musicians:
+            continue
+
+        weights = [
+            [
+                _get_part_musician_weight(snapshot, part, program_musician)
+                for program_musician in available_musicians
+            ]
+            for part in open_parts
+        ]
+        # Prefer seating order on ties: the nth open part leans to the nth musician.
+        for part_index, row in enumerate(weights):
+            for musician_index, weight in enumerate(row):
+                if weight is not None:
+                    row[musician_index] = weight * WEIGHT_SCALE - abs(
+                        part_index - musician_index
+                    )
+
+        for part_index, musician_index in solve_assignment(weights):
+            proposal[str(open_parts[part_index].id)] = str(
+                available_musicians[musician_index].musician_id
+            )
+    return proposal
+
+
+def auto_assign_program_parts(
+    program_id: str, snapshot: ProgramAssignmentSnapshot | None = None
+) -> int:
+    """Fill every unassigned part on a program with its proposed musician.
+
+    Parts assigned in the meantime are left untouched.
+
+    Returns:
+        Number of proposed parts that were actually written.
+    """
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id)
+    proposal = propose_program_part_assignments(program_id, snapshot=snapshot)
+    return len(snapshot.set_assignments(proposal, overwrite=False))
+
+
+def _get_part_musician_weight(
+    snapshot: ProgramAssignmentSnapshot,
+    part: Part,
+    program_musician: ProgramMusician,
+) -> int | None:
+    """Score a part/musician pair, or return `None` when the pair is not allowed."""
+    musician_id = str(program_musician.musician_id)
+    musician_mask = snapshot.musician_masks[musician_id]
+    part_mask = snapshot.part_masks[str(part.id)]
+    primary_mask = (
+        get_instrument_mask(
+            InstrumentEnum(part_instrument.instrument.name)
+            for part_instrument in part.instruments.all()
+            if part_instrument.primary
+        )
+        or part_mask
+    )
+    if not primary_mask & musician_mask:
+        return None
+
+    weight = 0
+    if primary_mask & snapshot.musician_primary_masks[musician_id]:
+        weight += PRIMARY_INSTRUMENT_WEIGHT
+
+    doubling_mask = part_mask & ~primary_mask
+    while doubling_mask:
+        instrument_bit = doubling_mask & -doubling_mask
+        if instrument_bit & musician_mask:
+            weight += DOUBLING_COVERED_WEIGHT
+        else:
+            weight -= DOUBLING_COVERED_WEIGHT
+        doubling_mask ^= instrument_bit
+
+    principal_chair = part.number is None or part.number == 1
+    if program_musician.principal:
+        weight += PRINCIPAL_CHAIR_WEIGHT if principal_chair else -PRINCIPAL_CHAIR_WEIGHT
+    elif not principal_chair:
+        weight += SECTION_CHAIR_WEIGHT
+
+    piece_count, chair_count = snapshot.part_history.get(str(part.id), {}).get(
+        musician_id, (0, 0)
+    )
+    if piece_count:
+        weight += PIECE_HISTORY_WEIGHT
+    elif chair_count:
+        weight += CHAIR_HISTORY_WEIGHT
+    return weight
 
 
 def get_assignment_payload(
-    program_id: str, principal_musician_id: str
+    program_id: str,
+    principal_musician_id: str,
+    snapshot: ProgramAssignmentSnapshot | None = None,
+    include_suggestions: bool = False,
 ) -> ProgramAssignmentDTO:
     """Build the assignment workspace payload for a single principal.
 
@@ -229,19 +502,17 @@ def get_assignment_payload(
     which pieces/parts they own, which musicians they can assign to those parts,
     and whether all parts in scope are currently assigned.
 
+    Pass a `snapshot` to evaluate several principals against rows loaded once.
+    With `include_suggestions`, each part lists the eligible musicians who held
+    its chair in past programs, most frequent first.
+
     Raises:
         ProgramMusician.DoesNotExist: If the musician is not on the program roster.
         PermissionError: If the musician is on the roster but is not a principal.
     """
-    program = Program.objects.get(id=program_id)
-    organization = OrganizationDTO.from_model(program.organization)
-    principal_program_musician = (
-        ProgramMusician.objects.filter(
-            program_id=program_id,
-            musician_id=principal_musician_id,
-        )
-        .prefetch_related("instruments__instrument", "musician")
-        .first()
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id)
+    principal_program_musician = snapshot.program_musicians_by_musician_id.get(
+        str(principal_musician_id)
     )
     if not principal_program_musician:
         raise ProgramMusician.DoesNotExist
@@ -249,14 +520,13 @@ def get_assignment_payload(
     if not principal_program_musician.principal:
         raise PermissionError("Only principals can assign parts.")
 
-    principal_instruments = get_assignment_scope_for_instruments(
-        get_program_musician_instruments(principal_program_musician)
+    principal_scope = get_assignment_scope_mask(
+        snapshot.musician_masks[str(principal_musician_id)]
     )
-    string_instruments = set(INSTRUMENT_SECTIONS[InstrumentSectionEnum.STRINGS])
 
     # String principals do not assign parts in this workflow.
-    if principal_instruments and principal_instruments.issubset(string_instruments):
-        return ProgramAssignmentDTO(
+    if principal_scope and not principal_scope & ~STRING_INSTRUMENTS_MASK:
+        return ProgramAssignmentDTO.construct_trusted(
             pieces=[],
             eligible_musicians=[],
             eligible_musician_ids=[],
@@ -264,58 +534,42 @@ def get_assignment_payload(
         )
 
     # Eligible musicians are only those in the same assignment subsection as this principal.
-    program_musicians = (
-        ProgramMusician.objects.filter(program_id=program_id)
-        .select_related("musician", "musician__organization")
-        .prefetch_related(
-            "instruments__instrument", "musician__instruments__instrument"
-        )
-    )
     eligible_musicians = []
     eligible_musician_ids = set()
-    for program_musician in program_musicians:
-        musician_instruments = get_program_musician_instruments(program_musician)
-        if principal_instruments.intersection(musician_instruments):
+    for program_musician in snapshot.program_musicians:
+        if principal_scope & snapshot.musician_masks[str(program_musician.musician_id)]:
             eligible_musician_ids.add(str(program_musician.musician_id))
             eligible_musicians.append(MusicianDTO.from_model(program_musician.musician))
 
-    program_piece_ids = list(
-        ProgramPiece.objects.filter(program_id=program_id).values_list(
-            "piece_id", flat=True
-        )
-    )
-    parts = (
-        Part.objects.filter(piece_id__in=program_piece_ids)
-        .select_related("piece")
-        .prefetch_related("instruments__instrument")
-    )
-
     # Only include parts owned by this principal's assignment scope.
     filtered_parts = []
-    for part in parts:
-        if principal_instruments.intersection(get_part_instruments(part)):
+    for part in snapshot.parts:
+        if principal_scope & snapshot.part_masks[str(part.id)]:
             filtered_parts.append(part)
 
-    part_assignments = {
-        str(assignment.part_id): str(assignment.musician_id)
-        for assignment in ProgramPartMusician.objects.filter(
-            program_id=program_id, part_id__in=[part.id for part in filtered_parts]
-        )
-    }
-
     pieces_map: defaultdict[str, list[ProgramAssignmentPartDTO]] = defaultdict(list)
     for part in filtered_parts:
         part_dto = PartDTO.from_model(part)
+        suggested_musician_ids = []
+        if include_suggestions:
+            suggested_musician_ids = [
+                musician_id
+                for musician_id in rank_part_assignment_history(
+                    snapshot.part_history.get(str(part.id), {})
+                )
+                if musician_id in eligible_musician_ids
+            ][:MAX_PART_SUGGESTIONS]
         pieces_map[str(part.piece_id)].append(
-            ProgramAssignmentPartDTO(
+            ProgramAssignmentPartDTO.construct_trusted(
                 id=str(part.id),
                 display_name=part_dto.display_name,
-                assigned_musician_id=part_assignments.get(str(part.id)),
+                assigned_musician_id=snapshot.get_assigned_musician_id(part.id),
+                suggested_musician_ids=suggested_musician_ids,
             )
         )
 
     pieces: list[ProgramAssignmentPieceDTO] = []
-    for piece_id in program_piece_ids:
+    for piece_id in snapshot.piece_ids:
         piece_parts = pieces_map.get(str(piece_id), [])
         if not piece_parts:
             continue
@@ -325,7 +579,7 @@ def get_assignment_payload(
         if not piece:
             continue
         pieces.append(
-            ProgramAssignmentPieceDTO(
+            ProgramAssignmentPieceDTO.construct_trusted(
                 id=str(piece.piece_id),
                 title=piece.piece.title,
                 composer=piece.piece.composer,
@@ -340,12 +594,13 @@ def get_assignment_payload(
                 all_assigned = False
                 break
 
-    return ProgramAssignmentDTO(
-        organization=organization,
+    return ProgramAssignmentDTO.construct_trusted(
+        organization=snapshot.organization,
         pieces=pieces,
         eligible_musicians=eligible_musicians,
         eligible_musician_ids=list(eligible_musician_ids),
         all_assigned=all_assigned,
+        version=snapshot.version,
     )
 
 
@@ -355,22 +610,88 @@ def set_program_part_assignment(
     program_id: str,
     part_id: str,
     musician_id: str | None,
-) -> None:
+) -> tuple[int, int]:
     """Persist a single part assignment mutation.
 
     This is the shared write path used by both interactive magic-link assignment
     actions and server-side auto-assignment behavior.
     """
-    if not musician_id:
+    previous_version, current_version, _ = set_program_part_assignments(
+        program_id=program_id, changes={part_id: musician_id}
+    )
+    return previous_version, current_version
+
+
+@transaction.atomic
+def set_program_part_assignments(
+    *,
+    program_id: str,
+    changes: dict[str, str | None],
+    overwrite: bool = True,
+) -> tuple[int, int, dict[str, str | None]]:
+    """Persist a batch of part assignment mutations.
+
+    Assigned parts are written with one upsert and cleared parts with one delete,
+    whatever the size of the batch. With `overwrite=False`, parts that already
+    have an assignment in the database are left untouched.
+
+    Returns:
+        The program's `assignments_version` before and after the write, and the
+        changes that were actually applied. When nothing was written the
+        version is not bumped.
+    """
+    # Lock the program row so concurrent writers get consecutive versions
+    previous_version = (
+        Program.objects.select_for_update()
+        .values_list("assignments_version", flat=True)
+        .get(id=program_id)
+    )
+
+    cleared_part_ids = [
+        part_id for part_id, musician_id in changes.items() if not musician_id
+    ]
+    if cleared_part_ids:
         ProgramPartMusician.objects.filter(
-            program_id=program_id, part_id=part_id
+            program_id=program_id, part_id__in=cleared_part_ids
         ).delete()
-    else:
-        ProgramPartMusician.objects.update_or_create(
+
+    applied = {part_id: None for part_id in cleared_part_ids}
+
+    assignments = [
+        ProgramPartMusician(
             program_id=program_id,
             part_id=part_id,
-            defaults={"musician_id": musician_id},
+            musician_id=musician_id,
+        )
+        for part_id, musician_id in changes.items()
+        if musician_id
+    ]
+    if assignments:
+        # Without overwrite, rows a concurrent writer inserted first hit
+        # DO NOTHING and are not returned, so they are not reported as written
+        written = pgbulk.upsert(
+            ProgramPartMusician,
+            assignments,
+            unique_fields=["program_id", "part_id"],
+            update_fields=["musician_id"] if overwrite else [],
+            returning=["part_id", "musician_id"],
         )
+        written_part_ids = {str(row.part_id) for row in written}
+        applied.update(
+            (part_id, musician_id)
+            for part_id, musician_id in changes.items()
+            if musician_id and str(part_id) in written_part_ids
+        )
+
+    if not applied:
+        return previous_version, previous_version, applied
+
+    refresh_part_assignment_history(applied)
+    bump_program_assignments_version([program_id])
+    current_version = Program.objects.values_list("assignments_version", flat=True).get(
+        id=program_id
+    )
+    return previous_version, current_version, applied
 
 
 @transaction.atomic
@@ -379,7 +700,7 @@ def assign_program_part(
     principal_musician_id: str,
     part_id: str,
     musician_id: str | None,
-) -> ProgramAssignmentDTO:
+) -> ProgramAssignmentDeltaDTO:
     """Assign or unassign a single part within a principal's scope.
 
     Authorization is enforced by reusing `get_assignment_payload()`, so a principal
@@ -389,10 +710,16 @@ def assign_program_part(
         musician_id: Target musician ID, or `None` to clear the assignment.
 
     Returns:
-        Fresh `ProgramAssignmentDTO` after the mutation.
+        `ProgramAssignmentDeltaDTO` with the changed part and the principal's
+        completion flags after the mutation.
     """
+    snapshot = ProgramAssignmentSnapshot(program_id)
+    # The delta replaces the part on the principal's page, suggestions included
     payload = get_assignment_payload(
-        program_id=program_id, principal_musician_id=principal_musician_id
+        program_id=program_id,
+        principal_musician_id=principal_musician_id,
+        snapshot=snapshot,
+        include_suggestions=True,
     )
 
     # Guardrail: principals may only assign parts present in their payload.
@@ -403,14 +730,29 @@ def assign_program_part(
     if musician_id and musician_id not in payload.eligible_musician_ids:
         raise ValueError("Selected musician is not eligible for this section.")
 
-    set_program_part_assignment(
-        program_id=program_id,
-        part_id=part_id,
-        musician_id=musician_id,
-    )
+    snapshot.set_assignment(part_id, musician_id)
 
-    return get_assignment_payload(
-        program_id=program_id, principal_musician_id=principal_musician_id
+    changed_part = None
+    piece_all_assigned = True
+    all_assigned = True
+    for piece in payload.pieces:
+        piece_assigned = True
+        for part in piece.parts:
+            if part.id == part_id:
+                part = part.model_copy(update={"assigned_musician_id": musician_id})
+                changed_part = (piece.id, part)
+            piece_assigned = piece_assigned and bool(part.assigned_musician_id)
+        if changed_part and changed_part[0] == piece.id:
+            piece_all_assigned = piece_assigned
+        all_assigned = all_assigned and piece_assigned
+
+    return ProgramAssignmentDeltaDTO.construct_trusted(
+        piece_id=changed_part[0],
+        part=changed_part[1],
+        piece_all_assigned=piece_all_assigned,
+        all_assigned=all_assigned,
+        version=snapshot.version,
+        previous_version=snapshot.previous_version,
     )
 
 
@@ -420,38 +762,72 @@ def assign_program_part_by_librarian(
     program_id: str,
     part_id: str,
     musician_id: str | None,
+) -> ProgramAssignmentDeltaDTO:
+    """Assign or unassign a program part from the librarian workflow.
+
+    Returns:
+        A `ProgramAssignmentDeltaDTO` for the changed part rather than the full
+        status payload.
+    """
+    snapshot = _apply_librarian_assignments(
+        organization_id, program_id, [(part_id, musician_id)]
+    )
+    return get_program_assignment_delta(snapshot, part_id)
+
+
+@transaction.atomic
+def assign_program_parts_by_librarian(
+    organization_id: str,
+    program_id: str,
+    changes: list[tuple[str, str | None]],
 ) -> ProgramAssignmentStatusDTO:
-    """Assign or unassign a program part from the librarian workflow."""
-    part_exists = Part.objects.filter(
-        id=part_id,
-        piece__programpiece__program_id=program_id,
-        piece__programpiece__program__organization_id=organization_id,
-    ).exists()
-    if not part_exists:
-        raise ValueError("Part is not on this program.")
+    """Apply a batch of librarian assignments and return the updated status.
 
-    if musician_id:
-        musician_on_program = ProgramMusician.objects.filter(
-            program_id=program_id,
-            musician_id=musician_id,
-            program__organization_id=organization_id,
-        ).exists()
-        if not musician_on_program:
-            raise ValueError("Selected musician is not on this program roster.")
+    Every change is validated against one snapshot before anything is written,
+    so a batch is applied completely or not at all.
 
-    set_program_part_assignment(
-        program_id=program_id,
-        part_id=part_id,
-        musician_id=musician_id,
-    )
+    Args:
+        changes: `(part_id, musician_id)` pairs; a `None` musician clears the part.
+    """
+    snapshot = _apply_librarian_assignments(organization_id, program_id, changes)
     return get_program_assignments_status(
         organization_id=organization_id,
         program_id=program_id,
+        snapshot=snapshot,
     )
 
 
+def _apply_librarian_assignments(
+    organization_id: str,
+    program_id: str,
+    changes: list[tuple[str, str | None]],
+) -> ProgramAssignmentSnapshot:
+    try:
+        snapshot = ProgramAssignmentSnapshot(program_id, organization_id)
+    except Program.DoesNotExist:
+        raise ValueError("Part is not on this program.")
+
+    assignments: dict[str, str | None] = {}
+    for part_id, musician_id in changes:
+        if str(part_id) not in snapshot.part_masks:
+            raise ValueError("Part is not on this program.")
+        if (
+            musician_id
+            and str(musician_id) not in snapshot.program_musicians_by_musician_id
+        ):
+            raise ValueError("Selected musician is not on this program roster.")
+        if str(part_id) in assignments:
+            raise ValueError("Each part can only be changed once per request.")
+        assignments[str(part_id)] = str(musician_id) if musician_id else None
+
+    snapshot.set_assignments(assignments)
+    return snapshot
+
+
 def get_program_assignments_status(
-    organization_id: str, program_id: str
+    organization_id: str,
+    program_id: str,
+    snapshot: ProgramAssignmentSnapshot | None = None,
 ) -> ProgramAssignmentStatusDTO:
     """Build the read-only assignments status payload for the program page.
 
@@ -459,60 +835,19 @@ def get_program_assignments_status(
     - piece/part assignment progress across the program, and
     - per-principal assignment/link-access status for principals who have
       assignment work in scope.
-    """
-    program_piece_ids = list(
-        ProgramPiece.objects.filter(
-            program_id=program_id,
-            program__organization_id=organization_id,
-        ).values_list("piece_id", flat=True)
-    )
-
-    all_parts = (
-        Part.objects.filter(piece_id__in=program_piece_ids)
-        .select_related("piece")
-        .prefetch_related("instruments__instrument")
-    )
-    string_instruments = set(INSTRUMENT_SECTIONS[InstrumentSectionEnum.STRINGS])
-    parts: list[Part] = []
-    string_parts: list[Part] = []
-    for part in all_parts:
-        part_instruments = get_part_instruments(part)
-        if part_instruments and part_instruments.issubset(string_instruments):
-            string_parts.append(part)
-            continue
-        parts.append(part)
 
-    assignments = ProgramPartMusician.objects.filter(
-        program_id=program_id,
-        part_id__in=[part.id for part in all_parts],
-    ).select_related("musician")
-    assignments_by_part = {
-        str(assignment.part_id): assignment for assignment in assignments
-    }
+    Every principal is evaluated against one `ProgramAssignmentSnapshot`, so the
+    query count does not grow with the roster.
+    """
+    snapshot = snapshot or ProgramAssignmentSnapshot(program_id, organization_id)
+    parts = [part for part in snapshot.parts if not _is_string_part(snapshot, part)]
 
     pieces_map: defaultdict[str, list[ProgramAssignmentPartDTO]] = defaultdict(list)
     for part in parts:
-        assignment = assignments_by_part.get(str(part.id))
-        assigned_musician = assignment.musician if assignment else None
-        part_dto = PartDTO.from_model(part)
-        pieces_map[str(part.piece_id)].append(
-            ProgramAssignmentPartDTO(
-                id=str(part.id),
-                display_name=part_dto.display_name,
-                status="Assigned" if assignment else "Unassigned",
-                assigned_musician=ProgramAssignmentAssignedMusicianDTO(
-                    id=str(assigned_musician.id),
-                    first_name=assigned_musician.first_name,
-                    last_name=assigned_musician.last_name,
-                    profile_url=f"/musicians/{assigned_musician.id}/",
-                )
-                if assigned_musician
-                else None,
-            )
-        )
+        pieces_map[str(part.piece_id)].append(_build_status_part(snapshot, part))
 
     pieces: list[ProgramAssignmentPieceDTO] = []
-    for piece_id in program_piece_ids:
+    for piece_id in snapshot.piece_ids:
         piece_parts = pieces_map.get(str(piece_id), [])
         if not piece_parts:
             continue
@@ -522,7 +857,7 @@ def get_program_assignments_status(
         if not piece:
             continue
         pieces.append(
-            ProgramAssignmentPieceDTO(
+            ProgramAssignmentPieceDTO.construct_trusted(
                 id=str(piece.piece_id),
                 title=piece.piece.title,
                 composer=piece.piece.composer,
@@ -531,143 +866,251 @@ def get_program_assignments_status(
             )
         )
 
-    checklist = ProgramChecklist.objects.get(
-        program_id=program_id,
-        program__organization_id=organization_id,
+    roster_musicians = [
+        MusicianDTO.from_model(pm.musician) for pm in snapshot.program_musicians
+    ]
+
+    principal_statuses = []
+    for principal in snapshot.program_musicians:
+        if not principal.principal:
+            continue
+        principal_status = _build_principal_status(snapshot, principal)
+        # String principals and any principals with no applicable section work are excluded.
+        if principal_status:
+            principal_statuses.append(principal_status)
+
+    return ProgramAssignmentStatusDTO.construct_trusted(
+        pieces=pieces,
+        principals=principal_statuses,
+        roster_musicians=roster_musicians,
+        summary=_build_status_summary(snapshot),
+        version=snapshot.version,
+        links_version=snapshot.program.assignment_links_version,
     )
-    assignments_sent_on = checklist.assignments_sent_on
 
-    program_musicians = (
-        ProgramMusician.objects.filter(
-            program_id=program_id,
-            program__organization_id=organization_id,
-        )
-        .select_related("musician", "musician__organization")
-        .prefetch_related(
-            "musician__instruments__instrument", "instruments__instrument"
+
+def get_cached_program_assignments_status(
+    organization_id: str, program_id: str
+) -> ProgramAssignmentStatusDTO:
+    """Return the status payload, reusing the cached copy until the program changes.
+
+    Raises:
+        Program.DoesNotExist: If the program is not in this organization.
+    """
+    cache_key = get_program_assignment_status_cache_key(organization_id, program_id)
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = get_program_assignments_status(organization_id, program_id)
+        cache.set(
+            cache_key,
+            payload,
+            timeout=settings.PROGRAM_ASSIGNMENT_STATUS_CACHE_TIMEOUT,
         )
+    return payload
+
+
+def get_program_assignment_delta(
+    snapshot: ProgramAssignmentSnapshot, part_id: str
+) -> ProgramAssignmentDeltaDTO:
+    """Describe what a single part change did to the librarian status page.
+
+    Carries the changed part, the program summary counters and the status of the
+    principals whose scope covers the part, instead of the full status payload.
+    """
+    part = next(part for part in snapshot.parts if str(part.id) == str(part_id))
+    return ProgramAssignmentDeltaDTO.construct_trusted(
+        piece_id=str(part.piece_id),
+        part=_build_status_part(snapshot, part),
+        piece_all_assigned=_is_piece_all_assigned(snapshot, part.piece_id),
+        summary=_build_status_summary(snapshot),
+        principals=_build_affected_principal_statuses(
+            snapshot, snapshot.part_masks[str(part.id)]
+        ),
+        version=snapshot.version,
+        previous_version=snapshot.previous_version,
     )
-    roster_musicians = [MusicianDTO.from_model(pm.musician) for pm in program_musicians]
 
-    principals = (
-        ProgramMusician.objects.filter(
-            program_id=program_id,
-            program__organization_id=organization_id,
-            principal=True,
-        )
-        .select_related("musician")
-        .prefetch_related("instruments__instrument")
+
+def get_program_assignment_event(
+    snapshot: ProgramAssignmentSnapshot, part_ids: list[str]
+) -> ProgramAssignmentEventDTO:
+    """Describe a batch of part changes for pages watching the program."""
+    part_ids = {str(part_id) for part_id in part_ids}
+    parts = [part for part in snapshot.parts if str(part.id) in part_ids]
+    parts_mask = 0
+    for part in parts:
+        parts_mask |= snapshot.part_masks[str(part.id)]
+
+    return ProgramAssignmentEventDTO.construct_trusted(
+        type=ProgramAssignmentEventType.ASSIGNMENTS,
+        program_id=str(snapshot.program.id),
+        version=snapshot.version,
+        previous_version=snapshot.previous_version,
+        links_version=snapshot.program.assignment_links_version,
+        parts=[
+            ProgramAssignmentEventPartDTO.construct_trusted(
+                piece_id=str(part.piece_id),
+                part=_build_status_part(snapshot, part),
+                piece_all_assigned=_is_piece_all_assigned(snapshot, part.piece_id),
+            )
+            for part in parts
+            if not _is_string_part(snapshot, part)
+        ],
+        summary=_build_status_summary(snapshot),
+        principals=_build_affected_principal_statuses(snapshot, parts_mask),
     )
 
-    principal_statuses = []
-    for principal in principals:
-        principal_payload = get_assignment_payload(
-            program_id=program_id,
-            principal_musician_id=str(principal.musician_id),
-        )
-        # String principals and any principals with no applicable section work are excluded.
-        if not principal_payload.pieces:
-            continue
 
-        # Look up most recent non-revoked assignment links for access/completion state.
-        magic_links = MagicLink.objects.filter(
-            program_id=program_id,
-            musician_id=principal.musician_id,
-            type=MagicLinkType.ASSIGNMENT.value,
-            revoked=False,
-        )
-        latest_magic_link = magic_links.order_by("-created").first()
-        completed_magic_link = (
-            magic_links.filter(completed_on__isnull=False)
-            .order_by("-completed_on")
-            .first()
-        )
-        accessed_magic_link = (
-            magic_links.filter(last_accessed_on__isnull=False)
-            .order_by("-last_accessed_on")
-            .first()
-        )
+def _is_string_part(snapshot: ProgramAssignmentSnapshot, part: Part) -> bool:
+    part_mask = snapshot.part_masks[str(part.id)]
+    return bool(part_mask) and not part_mask & ~STRING_INSTRUMENTS_MASK
 
-        principal_total_parts = sum(
-            len(piece.parts) for piece in principal_payload.pieces
-        )
-        principal_assigned_parts = sum(
-            1
-            for piece in principal_payload.pieces
-            for part in piece.parts
-            if part.assigned_musician_id
-        )
 
-        principal_all_assigned = (
-            principal_total_parts > 0
-            and principal_assigned_parts == principal_total_parts
+def _is_piece_all_assigned(snapshot: ProgramAssignmentSnapshot, piece_id) -> bool:
+    return all(
+        str(part.id) in snapshot.assignments
+        for part in snapshot.parts
+        if part.piece_id == piece_id and not _is_string_part(snapshot, part)
+    )
+
+
+def _build_affected_principal_statuses(
+    snapshot: ProgramAssignmentSnapshot, parts_mask: int
+) -> list[ProgramAssignmentPrincipalStatusDTO]:
+    """Status rows of the principals whose scope overlaps `parts_mask`."""
+    principals = []
+    for program_musician in snapshot.program_musicians:
+        if not program_musician.principal:
+            continue
+        principal_scope = get_assignment_scope_mask(
+            snapshot.musician_masks[str(program_musician.musician_id)]
         )
-        link_completed = completed_magic_link is not None
-        link_accessed = (
-            principal_all_assigned or accessed_magic_link is not None or link_completed
+        if not principal_scope & parts_mask:
+            continue
+        principal_status = _build_principal_status(snapshot, program_musician)
+        if principal_status:
+            principals.append(principal_status)
+    return principals
+
+
+def _build_status_part(
+    snapshot: ProgramAssignmentSnapshot, part: Part
+) -> ProgramAssignmentPartDTO:
+    assignment = snapshot.assignments.get(str(part.id))
+    assigned_musician = assignment.musician if assignment else None
+    part_dto = PartDTO.from_model(part)
+    return ProgramAssignmentPartDTO.construct_trusted(
+        id=str(part.id),
+        display_name=part_dto.display_name,
+        status="Assigned" if assignment else "Unassigned",
+        assigned_musician=ProgramAssignmentAssignedMusicianDTO.construct_trusted(
+            id=str(assigned_musician.id),
+            first_name=assigned_musician.first_name,
+            last_name=assigned_musician.last_name,
+            profile_url=f"/musicians/{assigned_musician.id}/",
         )
-        if not assignments_sent_on:
-            status = "Not Sent"
-        elif principal_all_assigned or link_completed:
-            status = "Completed"
-        elif link_accessed:
-            status = "Accessed"
+        if assigned_musician
+        else None,
+    )
+
+
+def _build_status_summary(
+    snapshot: ProgramAssignmentSnapshot,
+) -> ProgramAssignmentSummaryDTO:
+    total_parts = assigned_parts = 0
+    string_parts_total = string_parts_assigned = 0
+    for part in snapshot.parts:
+        assigned = str(part.id) in snapshot.assignments
+        if _is_string_part(snapshot, part):
+            string_parts_total += 1
+            string_parts_assigned += assigned
         else:
-            status = "Sent"
-
-        principal_statuses.append(
-            ProgramAssignmentPrincipalStatusDTO(
-                id=str(principal.musician_id),
-                first_name=principal.musician.first_name,
-                last_name=principal.musician.last_name,
-                profile_url=f"/musicians/{principal.musician_id}/",
-                status=status,
-                link_accessed=link_accessed,
-                assigned_parts=ProgramAssignmentPrincipalPartsDTO(
-                    assigned=principal_assigned_parts,
-                    total=principal_total_parts,
-                ),
-                last_accessed_on=(
-                    accessed_magic_link.last_accessed_on
-                    if accessed_magic_link
-                    else latest_magic_link.last_accessed_on
-                    if latest_magic_link
-                    else None
-                ),
-                completed_on=(
-                    completed_magic_link.completed_on
-                    if completed_magic_link
-                    else latest_magic_link.completed_on
-                    if latest_magic_link
-                    else None
-                ),
-            )
-        )
+            total_parts += 1
+            assigned_parts += assigned
+
+    return ProgramAssignmentSummaryDTO.construct_trusted(
+        total_parts=total_parts,
+        assigned_parts=assigned_parts,
+        all_assigned=total_parts > 0 and assigned_parts == total_parts,
+        string_parts_total=string_parts_total,
+        string_parts_assigned=string_parts_assigned,
+        all_string_parts_assigned=(
+            string_parts_total > 0 and string_parts_assigned == string_parts_total
+        ),
+    )
+
 
-    total_parts = sum(len(piece.parts) for piece in pieces)
-    assigned_parts = sum(
+def _build_principal_status(
+    snapshot: ProgramAssignmentSnapshot, principal: ProgramMusician
+) -> ProgramAssignmentPrincipalStatusDTO | None:
+    """Return a principal's status row, or `None` when they have nothing to assign."""
+    principal_payload = get_assignment_payload(
+        program_id=str(snapshot.program.id),
+        principal_musician_id=str(principal.musician_id),
+        snapshot=snapshot,
+    )
+    if not principal_payload.pieces:
+        return None
+
+    # Most recent non-revoked assignment links for access/completion state.
+    magic_links = snapshot.magic_links.get(str(principal.musician_id), [])
+    latest_magic_link = _latest_magic_link(magic_links, "created")
+    completed_magic_link = _latest_magic_link(magic_links, "completed_on")
+    accessed_magic_link = _latest_magic_link(magic_links, "last_accessed_on")
+
+    principal_total_parts = sum(len(piece.parts) for piece in principal_payload.pieces)
+    principal_assigned_parts = sum(
         1
-        for piece in pieces
+        for piece in principal_payload.pieces
         for part in piece.parts
-        if part.assigned_musician is not None
-    )
-    string_parts_total = len(string_parts)
-    string_parts_assigned = sum(
-        1 for part in string_parts if str(part.id) in assignments_by_part
+        if part.assigned_musician_id
     )
 
-    return ProgramAssignmentStatusDTO(
-        pieces=pieces,
-        principals=principal_statuses,
-        roster_musicians=roster_musicians,
-        summary=ProgramAssignmentSummaryDTO(
-            total_parts=total_parts,
-            assigned_parts=assigned_parts,
-            all_assigned=total_parts > 0 and assigned_parts == total_parts,
-            string_parts_total=string_parts_total,
-            string_parts_assigned=string_parts_assigned,
-            all_string_parts_assigned=(
-                string_parts_total > 0 and string_parts_assigned == string_parts_total
-            ),
+    principal_all_assigned = (
+        principal_total_parts > 0 and principal_assigned_parts == principal_total_parts
+    )
+    link_completed = completed_magic_link is not None
+    link_accessed = (
+        principal_all_assigned or accessed_magic_link is not None or link_completed
+    )
+    if not snapshot.program.checklist.assignments_sent_on:
+        status = "Not Sent"
+    elif principal_all_assigned or link_completed:
+        status = "Completed"
+    elif link_accessed:
+        status = "Accessed"
+    else:
+        status = "Sent"
+
+    return ProgramAssignmentPrincipalStatusDTO.construct_trusted(
+        id=str(principal.musician_id),
+        first_name=principal.musician.first_name,
+        last_name=principal.musician.last_name,
+        profile_url=f"/musicians/{principal.musician_id}/",
+        status=status,
+        link_accessed=link_accessed,
+        assigned_parts=ProgramAssignmentPrincipalPartsDTO.construct_trusted(
+            assigned=principal_assigned_parts,
+            total=principal_total_parts,
+        ),
+        last_accessed_on=(
+            accessed_magic_link.last_accessed_on
+            if accessed_magic_link
+            else latest_magic_link.last_accessed_on
+            if latest_magic_link
+            else None
+        ),
+        completed_on=(
+            completed_magic_link.completed_on
+            if completed_magic_link
+            else latest_magic_link.completed_on
+            if latest_magic_link
+            else None
         ),
     )
+
+
+def _latest_magic_link(magic_links: list[MagicLink], field: str) -> MagicLink | None:
+    """Return the link with the most recent non-null `field`, if any."""
+    candidates = [link for link in magic_links if getattr(link, field) is not None]
+    return max(candidates, key=lambda link: getattr(link, field), default=None)
@@ -164,7 +164,7 @@ def get_program_delivery_payload(
         piece_id = row["piece_id"]
         pieces_meta[piece_id] = (row["piece_title"], row["piece_composer"])
         parts_map[piece_id].append(
-            ProgramDeliveryFileDTO(
+            ProgramDeliveryFileDTO.construct_trusted(
                 id=row["id"],
                 piece_id=piece_id,
                 filename=row["filename"],
@@ -175,7 +175,7 @@ def get_program_delivery_payload(
     for piece_id, files in parts_map.items():
         title, composer = pieces_meta[piece_id]
         pieces.append(
-            ProgramDeliveryPieceDTO(
+            ProgramDeliveryPieceDTO.construct_trusted(
                 id=piece_id,
                 title=title,
                 composer=composer,
@@ -183,7 +183,9 @@ def get_program_delivery_payload(
             )
         )
     pieces.sort(key=lambda p: p.title.lower())
-    return ProgramDeliveryDTO(organization=organization, pieces=pieces)
+    return ProgramDeliveryDTO.construct_trusted(
+        organization=organization, pieces=pieces
+    )
 
 
 def get_program_delivery_downloads(
@@ -217,10 +219,10 @@ def get_program_delivery_downloads(
         if not url:
             continue
         files.append(
-            ProgramDeliveryDownloadFileDTO(
+            ProgramDeliveryDownloadFileDTO.construct_trusted(
                 id=row["id"],
                 filename=row["filename"],
                 url=url,
             )
         )
-    return ProgramDeliveryDownloadsDTO(files=files)
+    return ProgramDeliveryDownloadsDTO.construct_trusted(files=files)
@@ -0,0 +1,170 @@
+import logging
+import smtplib
+import threading
+import time
+import weakref
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Reused connections idle for longer than this are checked with NOOP first
+EMAIL_CONNECTION_HEALTH_CHECK_SECONDS = 30
+
+_local = threading.local()
+_pools: "weakref.WeakSet[PooledEmailConnection]" = weakref.WeakSet()
+_pools_lock = threading.Lock()
+
+
+class EmailConnectionStats(NamedTuple):
+    connections_opened: int
+    reconnects: int
+    messages_sent: int
+    send_failures: int
+    total_send_seconds: float
+    max_send_seconds: float
+
+    @property
+    def average_send_seconds(self) -> float:
+        attempts = self.messages_sent + self.send_failures
+        return self.total_send_seconds / attempts if attempts else 0.0
+
+
+class _StatsCollector:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values = dict.fromkeys(EmailConnectionStats._fields, 0)
+
+    def add(self, **increments) -> None:
+        with self._lock:
+            for field, value in increments.items():
+                self._values[field] += value
+
+    def record_send(self, seconds: float, sent: int, failed: int) -> None:
+        with self._lock:
+            self._values["messages_sent"] += sent
+            self._values["send_failures"] += failed
+            self._values["total_send_seconds"] += seconds
+            self._values["max_send_seconds"] = max(
+                self._values["max_send_seconds"], seconds
+            )
+
+    def snapshot(self) -> EmailConnectionStats:
+        with self._lock:
+            return EmailConnectionStats(**self._values)
+
+
+_stats = _StatsCollector()
+
+
+class PooledEmailConnection:
+    """An email backend connection kept open across sends by one worker.
+
+    Stands in for a Django email backend (`message.connection = ...`). The
+    underlying connection is opened on first use, checked with NOOP after it
+    has been idle, reopened after a failure and recycled after `max_messages`
+    messages or `max_age` seconds. Not thread-safe; use one per thread via
+    `get_pooled_email_connection()`.
+    """
+
+    def __init__(self, max_messages: int | None = None, max_age: float | None = None):
+        self.max_messages = max_messages or settings.EMAIL_CONNECTION_MAX_MESSAGES
+        self.max_age = max_age or settings.EMAIL_CONNECTION_MAX_AGE_SECONDS
+        self._backend = None
+        self._opened_at = 0.0
+        self._last_used_at = 0.0
+        self._messages = 0
+        with _pools_lock:
+            _pools.add(self)
+
+    def send_messages(self, email_messages) -> int:
+        email_messages = list(email_messages)
+        reused = self._backend is not None and self._is_healthy()
+        if not reused:
+            self._open()
+
+        for attempt in range(2):
+            start = time.perf_counter()
+            try:
+                sent = self._backend.send_messages(email_messages) or 0
+                break
+            except Exception as exc:
+                self.close()
+                _stats.record_send(time.perf_counter() - start, 0, len(email_messages))
+                stale = reused and isinstance(
+                    exc, (smtplib.SMTPServerDisconnected, ConnectionError)
+                )
+                if attempt or not stale:
+                    raise
+                # The server dropped a connection we reused; retry on a fresh one
+                _stats.add(reconnects=1)
+                self._open()
+
+        elapsed = time.perf_counter() - start
+        _stats.record_send(elapsed, sent, len(email_messages) - sent)
+        logger.debug("Sent %s email(s) in %.3fs", sent, elapsed)
+        self._messages += len(email_messages)
+        self._last_used_at = time.monotonic()
+        return sent
+
+    def close(self) -> None:
+        if self._backend is None:
+            return
+        backend, self._backend = self._backend, None
+        try:
+            backend.close()
+        except Exception:
+            logger.exception("Failed to close email connection")
+
+    def _open(self) -> None:
+        self.close()
+        backend = get_connection(fail_silently=False)
+        backend.open()
+        self._backend = backend
+        self._opened_at = self._last_used_at = time.monotonic()
+        self._messages = 0
+        _stats.add(connections_opened=1)
+
+    def _is_healthy(self) -> bool:
+        now = time.monotonic()
+        if self._messages >= self.max_messages or now - self._opened_at >= self.max_age:
+            return False
+        if now - self._last_used_at < EMAIL_CONNECTION_HEALTH_CHECK_SECONDS:
+            return True
+        smtp = getattr(self._backend, "connection", None)
+        if smtp is None:
+            return True
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+
+def get_pooled_email_connection() -> PooledEmailConnection:
+    """The calling thread's reusable email connection."""
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = _local.connection = PooledEmailConnection()
+    return connection
+
+
+def close_pooled_email_connections() -> None:
+    """Close every pooled connection, e.g. when a consumer shuts down."""
+    with _pools_lock:
+        pools = list(_pools)
+    for pool in pools:
+        pool.close()
+
+
+def get_email_connection_stats() -> EmailConnectionStats:
+    return _stats.snapshot()
+
+
+def reset_email_connection_stats() -> None:
+    _stats.reset()
@@ -87,7 +87,12 @@ def upload_roster(file, organization_id: str):
     if not setup_checklist.completed:
         setup_checklist.roster_uploaded = True
         setup_checklist.save()
-    return MusicianDTO.from_models(musicians)
+
+    # Reload so relation keys have their database types for batch prefetching
+    musicians_by_id = Musician.objects.in_bulk([musician.id for musician in musicians])
+    return MusicianDTO.from_models(
+        [musicians_by_id[musician.id] for musician in musicians]
+    )
 
 
 def determine_instrument_section(
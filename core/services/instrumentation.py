@@ -0,0 +1,335 @@
+import re
+import logging
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+from core.enum.instruments import InstrumentEnum
+from core.utils import is_integer
+
+logger = logging.getLogger()
+
+# Codes used in parsing instrumentation notation
+INSTRUMENT_ABBREVIATIONS = {
+    "pic": [InstrumentEnum.PICCOLO],
+    "picc": [InstrumentEnum.PICCOLO],
+    "eh": [InstrumentEnum.ENGLISH_HORN],
+    "bcl": [InstrumentEnum.BASS_CLARINET],
+    "bkl": [InstrumentEnum.BASS_CLARINET],
+    "hp": [InstrumentEnum.HARP],
+    "cel": [InstrumentEnum.CELESTA],
+    "pf": [InstrumentEnum.PIANO],
+    "tmp": [InstrumentEnum.TIMPANI],
+    "str": [
+        InstrumentEnum.VIOLIN_1,
+        InstrumentEnum.VIOLIN_2,
+        InstrumentEnum.VIOLA,
+        InstrumentEnum.CELLO,
+        InstrumentEnum.DOUBLE_BASS,
+    ],
+    "cbn": [InstrumentEnum.CONTRABASSOON],
+    "electronica": [InstrumentEnum.ELECTRONICA],
+    "bd": [InstrumentEnum.BASS_DRUM],
+    "sd": [InstrumentEnum.SNARE_DRUM],
+    "tam-tam": [InstrumentEnum.TAM_TAM],
+    "cym": [InstrumentEnum.CYMBAL],
+    "tri": [InstrumentEnum.TRIANGLE],
+}
+
+WOODWIND_ORDER = [
+    InstrumentEnum.FLUTE,
+    InstrumentEnum.OBOE,
+    InstrumentEnum.CLARINET,
+    InstrumentEnum.BASSOON,
+]
+
+BRASS_ORDER = [
+    InstrumentEnum.FRENCH_HORN,
+    InstrumentEnum.TRUMPET,
+    InstrumentEnum.TROMBONE,
+    InstrumentEnum.TUBA,
+]
+
+# Number of distinct formulas kept in the compiled plan cache
+INSTRUMENTATION_CACHE_SIZE = 2048
+
+DASH_PATTERN = re.compile(r"\s*[—-]\s*")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+SEPARATOR_PATTERN = re.compile(r"[-_]+")
+OPT_PATTERN = re.compile(r"\bopt\b")
+OPT_IGNORECASE_PATTERN = re.compile(r"\bopt\b", flags=re.IGNORECASE)
+BRACKET_DETAIL_PATTERN = re.compile(r"\s*([./])\s*")
+BRACKET_OPEN_PATTERN = re.compile(r"\[\s+")
+BRACKET_CLOSE_PATTERN = re.compile(r"\s+\]")
+SECTION_COUNT_PATTERN = re.compile(r"(?P<instrument_count>\d+)(?P<section_details>.*)")
+TIMPANI_PATTERN = re.compile(r"^(?P<code>timp|tmp)(?:\+(?P<percussion_count>\d+))?$")
+PERCUSSION_PATTERN = re.compile(r"^(?P<count>\d+)?perc$")
+PERCUSSION_SEGMENT_PATTERN = re.compile(r"^(timp|tmp)(?:\+\d+)?$")
+PERCUSSION_COUNT_SEGMENT_PATTERN = re.compile(r"^\d*perc$")
+
+
+class PartPlan(NamedTuple):
+    """A single part compiled from instrumentation notation."""
+
+    primary: InstrumentEnum
+    instruments: Tuple[InstrumentEnum, ...]
+    number: Optional[int] = None
+
+
+def compile_instrumentation(notation: str) -> Tuple[PartPlan, ...]:
+    """
+    Compile instrumentation notation into an immutable part plan.
+
+    Example:
+        "2[1.2/pic] 2[1.2/eh] 2 2 — 4 2 3 1 — tmp+3 — hp — str"
+
+    Compilation has no side effects, so plans are memoized by the normalized
+    notation and repeated formulas skip parsing entirely.
+    """
+    return _compile_normalized_instrumentation(
+        normalize_instrumentation_notation(notation)
+    )
+
+
+def normalize_instrumentation_notation(notation: str) -> str:
+    """Normalize notation into the key used by the compiled plan cache."""
+    return WHITESPACE_PATTERN.sub(" ", notation or "").strip().lower()
+
+
+@lru_cache(maxsize=INSTRUMENTATION_CACHE_SIZE)
+def _compile_normalized_instrumentation(notation: str) -> Tuple[PartPlan, ...]:
+    # Split on em dash / hyphen
+    segments = [seg.strip() for seg in DASH_PATTERN.split(notation) if seg.strip()]
+    result: List[PartPlan] = []
+    # 1) Woodwinds: by position
+    if segments:
+        winds = _parse_bracketable_section(segments[0], "woodwinds")
+        result.extend(winds)
+
+    # 2) Brass: by position
+    if len(segments) >= 2:
+        brass = _parse_bracketable_section(segments[1], "brass")
+        result.extend(brass)
+
+    # 3) Everything after that can be auxiliary, electronic, perc, strings (hp, cel, pf, str, etc.)
+    for seg in segments[2:]:
+        code = _normalize_filename_token(seg)
+        if not code or _is_no_strings(code):
+            continue
+
+        # Is this a percussion segment?
+        if _is_percussion_segment(seg):
+            percussion = _parse_percussion(seg)
+            result.extend(percussion)
+            continue
+
+        # Is there a doubling of some kind? (pf/cel)
+        if "/" in code:
+            instruments = []
+            primary_code, doubling_code = code.split("/", 1)
+
+            # Figure out the primary instrument
+            primary_code = _normalize_filename_token(primary_code)
+            primary_instrument = INSTRUMENT_ABBREVIATIONS.get(primary_code)
+            if not primary_instrument:
+                logger.warning(f"Unknown instrument code {code}")
+                continue
+            primary_instrument = primary_instrument[0]
+            instruments.append(primary_instrument)
+
+            # Figure out the doubling
+            doubling_code = _normalize_filename_token(doubling_code)
+            doubling_sections = INSTRUMENT_ABBREVIATIONS.get(doubling_code)
+            if doubling_sections:
+                for doubling in doubling_sections:
+                    instruments.append(doubling)
+
+            result.append(PartPlan(primary_instrument, tuple(instruments), None))
+            continue
+
+        instruments = INSTRUMENT_ABBREVIATIONS.get(code)
+        if not instruments:
+            logger.warning(f"Unknown instrument code {code}")
+            continue
+
+        for section in instruments:
+            result.append(PartPlan(section, (section,), None))
+
+    return tuple(result)
+
+
+def _parse_bracketable_section(segment: str, section: str) -> List[PartPlan]:
+    """
+    Parse a bracketable section (woodwinds or brass) into part plans.
+
+    The segment uses positional counts with optional bracket details:
+        "2[1.2/pic] 2[1.2/eh] 2[1.2] 2[1.2]" → Fl, Ob, Cl, Bn
+
+    Bracket details can specify doublings (e.g. "/pic") or direct instrument codes.
+    """
+    out: List[PartPlan] = []
+    tokens = _normalize_instrumentation_token(segment).split()
+
+    # Use the right instrument order based on the section
+    if section == "brass":
+        order = BRASS_ORDER
+    elif section == "woodwinds":
+        order = WOODWIND_ORDER
+
+    for index, token in enumerate(tokens):
+        if index >= len(order):
+            break
+
+        # Extract leading count and optional bracket
+        match = SECTION_COUNT_PATTERN.match(token)
+        if not match:
+            continue
+
+        # Determine the number of instruments
+        instrument_count = int(match.group("instrument_count"))
+
+        # Are there instrument details in bracket notation? e.g. [1.2/pic] or [1.2/Eh]
+        # If so grab them and strip brackets
+        section_details = match.group("section_details")
+        if section_details:
+            section_details = section_details.strip("[]()")
+
+        # Add base instruments
+        for instrument_number in range(instrument_count):
+            instruments = []
+
+            # Determine the details for this instrument number in section details
+            if section_details:
+                instrument_details = section_details.split(".")[instrument_number]
+
+                # Is there a doubling?
+                if "/" in instrument_details:
+                    # Add the base instrument section
+                    primary_instrument = order[index]
+                    instruments.append(primary_instrument)
+
+                    # Figure out and add the doubling
+                    _, doubling_code = instrument_details.split("/", 1)
+                    doubling_code = doubling_code.strip().lower()
+                    doubling_instruments = INSTRUMENT_ABBREVIATIONS.get(doubling_code)
+                    if not doubling_instruments:
+                        raise Exception(
+                            f"Unable to find instrument for abbreviation '{instrument_details}'"
+                        )
+                    if doubling_instruments:
+                        for doubling in doubling_instruments:
+                            instruments.append(doubling)
+                # Is it just a numeric part that uses only the base instrument?
+                elif is_integer(instrument_details):
+                    primary_instrument = order[index]
+                    instruments.append(primary_instrument)
+                # Is it a dedicated part that uses a different instrument?
+                else:
+                    instruments = INSTRUMENT_ABBREVIATIONS.get(instrument_details)
+                    if not instruments:
+                        raise Exception(
+                            f"Unable to find instrument for abbreviation '{instrument_details}'"
+                        )
+                    primary_instrument = instruments[0]
+                    instruments = [primary_instrument]
+            else:
+                primary_instrument = order[index]
+                instruments = [primary_instrument]
+
+            out.append(
+                PartPlan(primary_instrument, tuple(instruments), instrument_number + 1)
+            )
+
+    return out
+
+
+def _parse_percussion(segment: str) -> List[PartPlan]:
+    """
+    Parse percussion segments into timpani/percussion part plans.
+
+    Examples:
+        "tmp+1"  -> 1 Timpani, 1 Percussion
+        "timp+5" -> 1 Timpani, 5 Percussion
+        "5perc"  -> 5 Percussion
+    """
+    out: List[PartPlan] = []
+    segment = _normalize_filename_token(segment)
+    if not segment:
+        return out
+
+    match = TIMPANI_PATTERN.match(segment)
+    if match:
+        percussion_count = int(match.group("percussion_count") or 0)
+        out.append(PartPlan(InstrumentEnum.TIMPANI, (InstrumentEnum.TIMPANI,), 1))
+        for percussion_number in range(percussion_count):
+            out.append(
+                PartPlan(
+                    InstrumentEnum.PERCUSSION,
+                    (InstrumentEnum.PERCUSSION,),
+                    percussion_number + 1,
+                )
+            )
+        return out
+
+    match = PERCUSSION_PATTERN.match(segment)
+    if match:
+        percussion_count = int(match.group("count") or 1)
+        for percussion_number in range(percussion_count):
+            out.append(
+                PartPlan(
+                    InstrumentEnum.PERCUSSION,
+                    (InstrumentEnum.PERCUSSION,),
+                    percussion_number + 1,
+                )
+            )
+        return out
+
+    return out
+
+
+def _normalize_instrumentation_token(seg: str) -> str:
+    """
+    Normalize instrumentation notation tokens.
+
+    - Removes "opt"
+    - Normalizes dash/underscore to spaces
+    - Collapses whitespace
+    - Lowercases
+    Example: "Violin-1" -> "violin 1"
+    """
+    # Remove optional markers while preserving neighboring instrument details.
+    seg = OPT_IGNORECASE_PATTERN.sub("", seg)
+    seg = SEPARATOR_PATTERN.sub(" ", seg)  # violin-1, violin_1 -> violin 1
+    # Normalize bracket details without collapsing token boundaries like "] 2[".
+    seg = BRACKET_DETAIL_PATTERN.sub(r"\1", seg)
+    seg = BRACKET_OPEN_PATTERN.sub("[", seg)
+    seg = BRACKET_CLOSE_PATTERN.sub("]", seg)
+    seg = WHITESPACE_PATTERN.sub(" ", seg).lower()
+    return seg
+
+
+def _normalize_filename_token(seg: str) -> str:
+    """
+    Normalize filename tokens for instrument matching.
+
+    - Removes "opt"
+    - Strips separators between letters/digits (e.g., "violin-1" -> "violin1")
+    - Lowercases
+    """
+    # Remove tokens like "opt"
+    seg = OPT_PATTERN.sub("", seg)
+    seg = SEPARATOR_PATTERN.sub("", seg)  # violin-1, violin_1 -> violin1
+    seg = WHITESPACE_PATTERN.sub(" ", seg).strip().lower()
+    return seg
+
+
+def _is_no_strings(code: str) -> bool:
+    """Return True if the token indicates strings are explicitly omitted."""
+    return code in {"[no str]", "no str", "[nostr]", "nostr"}
+
+
+def _is_percussion_segment(seg: str) -> bool:
+    """Return True if a segment represents percussion/timpani notation."""
+    seg = seg.strip().lower()
+    return bool(
+        PERCUSSION_SEGMENT_PATTERN.match(seg)
+        or PERCUSSION_COUNT_SEGMENT_PATTERN.match(seg)
+    )
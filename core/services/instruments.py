@@ -0,0 +1,74 @@
+import logging
+import uuid
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+from core.dtos.music import InstrumentDTO
+from core.enum.instruments import InstrumentEnum
+from core.models.music import Instrument
+
+logger = logging.getLogger()
+
+# Process-wide InstrumentEnum -> Instrument ID map. Instruments are seeded
+# reference data, so this is loaded once and only rebuilt when the table changes.
+_instrument_registry: Optional[Mapping[InstrumentEnum, uuid.UUID]] = None
+
+
+def get_instrument_registry() -> Mapping[InstrumentEnum, uuid.UUID]:
+    """Return the immutable InstrumentEnum -> Instrument ID registry."""
+    registry = _instrument_registry
+    if registry is None:
+        registry = refresh_instrument_registry()
+    return registry
+
+
+def refresh_instrument_registry() -> Mapping[InstrumentEnum, uuid.UUID]:
+    """Reload the registry from the Instrument table."""
+    global _instrument_registry
+    registry = {}
+    for instrument_id, name in Instrument.objects.values_list("id", "name"):
+        try:
+            instrument = InstrumentEnum(name)
+        except ValueError:
+            logger.warning(f"Ignoring unknown instrument {name}")
+            continue
+        # Keep the first row if an instrument name was seeded more than once
+        registry.setdefault(instrument, instrument_id)
+    _instrument_registry = MappingProxyType(registry)
+    return _instrument_registry
+
+
+def clear_instrument_registry() -> None:
+    """Drop the registry so the next lookup reloads it."""
+    global _instrument_registry
+    _instrument_registry = None
+
+
+def get_instrument_id(instrument: InstrumentEnum) -> Optional[uuid.UUID]:
+    instrument_id = get_instrument_registry().get(instrument)
+    if instrument_id is None:
+        # The table may have changed in another process since we loaded it
+        instrument_id = refresh_instrument_registry().get(instrument)
+    return instrument_id
+
+
+def get_instrument_ids(
+    instruments: List[InstrumentEnum],
+) -> Dict[InstrumentEnum, uuid.UUID]:
+    """Resolve several instruments at once, skipping any that are not seeded."""
+    registry = get_instrument_registry()
+    if any(instrument not in registry for instrument in instruments):
+        registry = refresh_instrument_registry()
+    return {
+        instrument: registry[instrument]
+        for instrument in instruments
+        if instrument in registry
+    }
+
+
+def get_registered_instrument(
+    instrument: InstrumentEnum,
+) -> Optional[InstrumentDTO]:
+    instrument_id = get_instrument_id(instrument)
+    if instrument_id is None:
+        return None
+    return InstrumentDTO.construct_trusted(id=str(instrument_id), name=instrument)
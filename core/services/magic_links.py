@@ -3,8 +3,10 @@ from datetime import timedelta
 from django.utils import timezone
 
 from core.enum.notifications import MagicLinkType
+from core.enum.programs import ProgramAssignmentEventType
 from core.models.notifications import MagicLink
 from core.models.programs import Program, ProgramPerformance
+from core.services.assignment_events import publish_magic_link_event
 from parthero.settings import (
     DEBUG,
     MAGIC_LINK_DEFAULT_EXPIRATION_DAYS,
@@ -64,6 +66,7 @@ def mark_magic_link_accessed(magic_link: MagicLink) -> MagicLink:
     """Stamp last access time for analytics/status visibility."""
     magic_link.last_accessed_on = timezone.now()
     magic_link.save(update_fields=["last_accessed_on"])
+    publish_magic_link_event(magic_link, ProgramAssignmentEventType.LINK_ACCESSED)
     return magic_link
 
 
@@ -71,6 +74,7 @@ def mark_magic_link_completed(magic_link: MagicLink) -> MagicLink:
     """Stamp completion time for flows that include an explicit confirm action."""
     magic_link.completed_on = timezone.now()
     magic_link.save(update_fields=["completed_on"])
+    publish_magic_link_event(magic_link, ProgramAssignmentEventType.LINK_COMPLETED)
     return magic_link
 
 
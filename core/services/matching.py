@@ -0,0 +1,91 @@
+from typing import Optional, Sequence
+
+
+def solve_assignment(
+    weights: Sequence[Sequence[Optional[int]]],
+) -> list[tuple[int, int]]:
+    """Maximum-weight bipartite matching between rows and columns.
+
+    `weights[row][column]` is the value of pairing a row with a column, or
+    `None` when the pair is not allowed. The matching first maximizes the number
+    of allowed pairs, then their total weight. Solved with the Hungarian
+    algorithm in O(n^2 * m) time.
+
+    Returns:
+        `(row, column)` pairs, sorted by row.
+    """
+    rows = len(weights)
+    columns = len(weights[0]) if rows else 0
+    if not rows or not columns:
+        return []
+
+    transposed = rows > columns
+    if transposed:
+        weights = [
+            [weights[row][column] for row in range(rows)] for column in range(columns)
+        ]
+        rows, columns = columns, rows
+
+    allowed = [weight for row in weights for weight in row if weight is not None]
+    if not allowed:
+        return []
+    highest = max(allowed)
+    lowest = min(allowed)
+    # Any disallowed pair costs more than every allowed pairing combined, so
+    # cardinality always wins over weight.
+    disallowed_cost = (highest - lowest + 1) * (rows + 1)
+    costs = [
+        [highest - weight if weight is not None else disallowed_cost for weight in row]
+        for row in weights
+    ]
+
+    # Potentials and matching are 1-indexed; column 0 is the virtual start.
+    infinity = float("inf")
+    row_potential = [0] * (rows + 1)
+    column_potential = [0] * (columns + 1)
+    column_match = [0] * (columns + 1)
+    previous_column = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        column_match[0] = row
+        current_column = 0
+        min_slack = [infinity] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[current_column] = True
+            current_row = column_match[current_column]
+            delta = infinity
+            next_column = 0
+            for column in range(1, columns + 1):
+                if used[column]:
+                    continue
+                slack = (
+                    costs[current_row - 1][column - 1]
+                    - row_potential[current_row]
+                    - column_potential[column]
+                )
+                if slack < min_slack[column]:
+                    min_slack[column] = slack
+                    previous_column[column] = current_column
+                if min_slack[column] < delta:
+                    delta = min_slack[column]
+                    next_column = column
+            for column in range(columns + 1):
+                if used[column]:
+                    row_potential[column_match[column]] += delta
+                    column_potential[column] -= delta
+                else:
+                    min_slack[column] -= delta
+            current_column = next_column
+            if column_match[current_column] == 0:
+                break
+        while current_column:
+            column_match[current_column] = column_match[previous_column[current_column]]
+            current_column = previous_column[current_column]
+
+    pairs = []
+    for column in range(1, columns + 1):
+        row = column_match[column]
+        if not row or weights[row - 1][column - 1] is None:
+            continue
+        pairs.append((column - 1, row - 1) if transposed else (row - 1, column - 1))
+    return sorted(pairs)
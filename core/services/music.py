@@ -1,20 +1,31 @@
 import re
 import uuid
 import logging
-from typing import List, Optional
-from django.db import transaction
+from collections import defaultdict
+from functools import cache
+from typing import List, Optional, Sequence, Tuple
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorExact,
+    TrigramWordSimilarity,
+)
+from django.db import connection, transaction
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Count, DecimalField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
 from core.dtos.music import (
     PieceDTO,
     PieceSearchResultDTO,
     PartDTO,
     PartAssetDTO,
     PartAssetUploadDTO,
+    PartInstrumentDTO,
     InstrumentDTO,
 )
 from core.enum.music import PartAssetType
-from core.enum.instruments import InstrumentEnum
+from core.enum.instruments import InstrumentEnum, get_instrument_mask
 from core.enum.status import UploadStatus
 from core.models.organizations import Musician, SetupChecklist
 from core.models.music import (
@@ -22,40 +33,27 @@ from core.models.music import (
     Part,
     PartAsset,
     PartInstrument,
-    Instrument,
     MusicianInstrument,
 )
+from core.services.assignment_versions import (
+    bump_musician_assignments_version,
+    bump_piece_assignments_version,
+)
+from core.services.instrumentation import PartPlan, compile_instrumentation
+from core.services.instruments import (
+    get_instrument_ids,
+    get_registered_instrument,
+)
+from core.services.pagination import paginate_by_cursor
 from core.services.s3 import create_upload_url
-from core.utils import get_file_extension, is_integer
+from core.utils import get_file_extension, normalize_search_text
 
 logger = logging.getLogger()
 
-# Codes used in parsing instrumentation notation
-INSTRUMENT_ABBREVIATIONS = {
-    "pic": [InstrumentEnum.PICCOLO],
-    "picc": [InstrumentEnum.PICCOLO],
-    "eh": [InstrumentEnum.ENGLISH_HORN],
-    "bcl": [InstrumentEnum.BASS_CLARINET],
-    "bkl": [InstrumentEnum.BASS_CLARINET],
-    "hp": [InstrumentEnum.HARP],
-    "cel": [InstrumentEnum.CELESTA],
-    "pf": [InstrumentEnum.PIANO],
-    "tmp": [InstrumentEnum.TIMPANI],
-    "str": [
-        InstrumentEnum.VIOLIN_1,
-        InstrumentEnum.VIOLIN_2,
-        InstrumentEnum.VIOLA,
-        InstrumentEnum.CELLO,
-        InstrumentEnum.DOUBLE_BASS,
-    ],
-    "cbn": [InstrumentEnum.CONTRABASSOON],
-    "electronica": [InstrumentEnum.ELECTRONICA],
-    "bd": [InstrumentEnum.BASS_DRUM],
-    "sd": [InstrumentEnum.SNARE_DRUM],
-    "tam-tam": [InstrumentEnum.TAM_TAM],
-    "cym": [InstrumentEnum.CYMBAL],
-    "tri": [InstrumentEnum.TRIANGLE],
-}
+# Text search configuration for the piece search vector; "simple" avoids
+# stemming composer names and titles in other languages
+PIECE_SEARCH_CONFIG = "simple"
+PIECE_SEARCH_VECTOR = SearchVector("search_document", config=PIECE_SEARCH_CONFIG)
 
 # Aliases used in parsing part filenames
 ALIAS_MAP = {
@@ -65,21 +63,11 @@ ALIAS_MAP = {
     InstrumentEnum.PERCUSSION: ["perc"],
 }
 
-WOODWIND_ORDER = [
-    InstrumentEnum.FLUTE,
-    InstrumentEnum.OBOE,
-    InstrumentEnum.CLARINET,
-    InstrumentEnum.BASSOON,
-]
-
-BRASS_ORDER = [
-    InstrumentEnum.FRENCH_HORN,
-    InstrumentEnum.TRUMPET,
-    InstrumentEnum.TROMBONE,
-    InstrumentEnum.TUBA,
-]
-
-DASH_PATTERN = re.compile(r"\s*[—-]\s*")
+NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-zA-Z0-9]")
+LOWER_NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-z0-9]")
+FILENAME_SEPARATOR_PATTERN = re.compile(r"[-_]+")
+FILENAME_TOKEN_SPLIT_PATTERN = re.compile(r"[\s._-]+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
 
 
 @transaction.atomic
@@ -104,6 +92,7 @@ def create_piece(
     piece.save()
 
     create_parts_from_instrumentation(piece.id, piece.instrumentation)
+    piece.refresh_from_db(fields=["parts_count", "completed_parts"])
 
     setup_checklist = SetupChecklist.objects.get(organization_id=organization_id)
     if not setup_checklist.completed:
@@ -117,14 +106,7 @@ def create_piece(
 
 def get_piece(organization_id: str, piece_id: str) -> PieceDTO:
     piece = Piece.objects.get(id=piece_id, organization__id=organization_id)
-    completed_parts = (
-        Part.objects.filter(
-            piece_id=piece_id, assets__status=UploadStatus.UPLOADED.value
-        )
-        .distinct()
-        .count()
-    )
-    return PieceDTO.from_model(piece, completed_parts=completed_parts)
+    return PieceDTO.from_model(piece)
 
 
 def search_for_piece(
@@ -134,117 +116,154 @@ def search_for_piece(
     limit: int = 25,
     offset: int = 0,
     sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> PieceSearchResultDTO:
-    search_query = Q()
-    search_text = title or composer
-    if search_text:
-        search_query &= Q(title__icontains=search_text) | Q(
-            composer__icontains=search_text
-        )
-    if title and composer:
-        search_query &= Q(composer__icontains=composer)
+    """
+    Search an organization's pieces with offset or cursor pagination.
 
-    pieces = Piece.objects.filter(search_query)
+    Passing a cursor (an empty string for the first page) switches to keyset
+    pagination; the total is then only counted when include_total is set.
+    """
+    pieces = Piece.objects.all()
     if organization_id:
         pieces = pieces.filter(organization__id=organization_id)
-    pieces = pieces.annotate(
-        parts_count=Count("parts", distinct=True),
-        completed_parts=Count(
-            "parts",
-            filter=Q(
-                parts__assets__status=UploadStatus.UPLOADED.value,
-                parts__assets__asset_type=PartAssetType.CLEAN.value,
-            ),
-            distinct=True,
-        ),
-    )
 
+    search_text = title or composer
+    search_rank = None
+    if search_text:
+        pieces = pieces.filter(_piece_search_filter(search_text))
+        search_rank = _piece_search_rank(search_text)
+    if title and composer:
+        pieces = pieces.filter(_piece_search_filter(composer))
     sort_field = "title"
     sort_direction = "asc"
-    if sort and ":" in sort:
+    if search_rank is not None and not sort:
+        # Without an explicit sort, show the most relevant matches first. The
+        # float4 rank is fixed to a numeric scale so a cursor round-trips it
+        # exactly and the keyset comparison matches the stored value.
+        pieces = pieces.annotate(
+            search_rank=Cast(search_rank, DecimalField(max_digits=12, decimal_places=6))
+        )
+        sort_field = "search_rank"
+        sort_direction = "dsc"
+    elif sort and ":" in sort:
         field, direction = sort.split(":", 1)
         sort_field = (field or "").strip()
         sort_direction = (direction or "").strip().lower()
     allowed_sort_fields = {"title", "composer", "parts_count", "completed_parts"}
+    if search_rank is not None:
+        allowed_sort_fields.add("search_rank")
     if sort_field not in allowed_sort_fields:
         sort_field = "title"
     sort_prefix = "-" if sort_direction == "dsc" else ""
     pieces = pieces.order_by(f"{sort_prefix}{sort_field}", "composer", "title")
 
     limit = min(max(limit, 1), 100)
+    if cursor is not None:
+        ordering = [
+            (sort_field, sort_direction == "dsc"),
+            ("composer", False),
+            ("title", False),
+        ]
+        page = paginate_by_cursor(pieces, ordering, cursor, limit)
+        return PieceSearchResultDTO(
+            total=pieces.count() if include_total else None,
+            data=PieceDTO.from_models(page.rows),
+            next_cursor=page.next_cursor,
+        )
     offset = max(offset, 0)
     total = pieces.count()
     page = pieces[offset : offset + limit]
     return PieceSearchResultDTO(total=total, data=PieceDTO.from_models(page))
 
 
+def _piece_search_filter(text: str) -> Q:
+    """
+    Match pieces whose title or composer contains the text, ignoring accents.
+
+    Words are also matched as prefixes through the search vector index, and
+    with pg_trgm installed near misses are matched by trigram similarity.
+    """
+    document = normalize_search_text(text)
+    if not document:
+        # Text with no searchable characters matches nothing, as a plain
+        # substring match on the raw text would
+        return Q(pk__in=[])
+    search_filter = Q(search_document__contains=document)
+    search_filter |= Q(
+        SearchVectorExact(PIECE_SEARCH_VECTOR, _piece_search_query(document))
+    )
+    if _has_trigram_support():
+        search_filter |= Q(search_document__trigram_word_similar=document)
+    return search_filter
+
+
+def _piece_search_rank(text: str):
+    document = normalize_search_text(text)
+    if not document:
+        return None
+    rank = SearchRank(PIECE_SEARCH_VECTOR, _piece_search_query(document))
+    if _has_trigram_support():
+        rank += TrigramWordSimilarity(Value(document), "search_document")
+    return rank
+
+
+def _piece_search_query(document: str) -> SearchQuery:
+    # Terms are alphanumeric after normalization, so they are safe in a raw query
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in document.split()),
+        config=PIECE_SEARCH_CONFIG,
+        search_type="raw",
+    )
+
+
+@cache
+def _has_trigram_support() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+        )
+        return cursor.fetchone()[0]
+
+
 def create_part(
     piece_id: str,
     primary: InstrumentEnum,
     instruments: List[InstrumentEnum],
     number: Optional[int] = None,
 ) -> PartDTO:
-    part = Part(id=uuid.uuid4(), piece_id=str(piece_id), number=number)
-    part.save()
-    for instrument in instruments:
-        instrument_model = get_instrument(instrument)
-        part_instrument = PartInstrument(
-            part_id=part.id,
-            instrument_id=instrument_model.id,
-            primary=True if instrument == primary else False,
-        )
-        part_instrument.save()
-
-    return PartDTO.from_model(part)
+    return _bulk_create_parts(
+        piece_id, [PartPlan(primary, tuple(instruments), number)]
+    )[0]
 
 
 @transaction.atomic
 def create_part_asset(
     piece_id: str, filename: str, asset_type: PartAssetType
 ) -> PartAssetUploadDTO:
-    piece = Piece.objects.get(id=piece_id)
-    parts = Part.objects.filter(piece_id=piece_id)
-    part_asset = PartAsset(id=uuid.uuid4(), piece_id=piece_id)
-    part_asset.save()
-    normalized_filename = _normalize_filename(filename)
+    _lock_pieces([piece_id])
+    piece = Piece.objects.select_related("organization").get(id=piece_id)
+    return _create_part_assets(piece, [(filename, asset_type)])[0]
 
-    # Determine the corresponding part for the filename
-    instruments = get_instruments_in_string(filename)
-    numbered_instruments = _extract_numbered_instruments(filename, instruments)
-    for part in parts:
-        for part_instrument in part.instruments.all():
-            instrument_enum = InstrumentEnum(part_instrument.instrument.name)
-            if instrument_enum in instruments:
-                numbers = numbered_instruments.get(instrument_enum)
-                is_combined_part = not numbers
-                if part.assets.exists() and not is_combined_part:
-                    continue
-                if numbers and part.number not in numbers:
-                    continue
-                part_asset.parts.add(part)
-                break
 
-    # Generate a pre-signed URL for upload (expires in 10 minutes)
-    file_key = (
-        str(piece_id)
-        + "/"
-        + str(part_asset.id)
-        + get_file_extension(normalized_filename)
-    )
-    presigned_url = create_upload_url(
-        organization_id=str(piece.organization.id),
-        file_key=file_key,
-        expiration=600,
-    )
-
-    part_asset.file_key = file_key
-    part_asset.upload_url = presigned_url
-    part_asset.upload_filename = filename
-    part_asset.asset_type = asset_type.value
-    part_asset.status = UploadStatus.PENDING.value
-    part_asset.save()
+@transaction.atomic
+def create_part_assets(
+    organization_id: str,
+    piece_id: str,
+    uploads: List[Tuple[str, PartAssetType]],
+) -> List[PartAssetUploadDTO]:
+    """
+    Create part assets for a batch of uploaded filenames in one transaction.
 
-    return PartAssetUploadDTO.from_model(part_asset)
+    Every filename is matched against a single snapshot of the piece's parts, and
+    the assets and their part links are written with bulk inserts.
+    """
+    _lock_pieces([piece_id])
+    piece = Piece.objects.select_related("organization").get(
+        id=piece_id, organization_id=organization_id
+    )
+    return _create_part_assets(piece, uploads)
 
 
 @transaction.atomic
@@ -257,6 +276,7 @@ def update_part_asset(
     part_asset = PartAsset.objects.get(
         id=part_asset_id, piece__organization_id=organization_id
     )
+    _lock_pieces([part_asset.piece_id])
     if status:
         part_asset.status = status.value
         part_asset.save()
@@ -267,14 +287,65 @@ def update_part_asset(
         part_asset.parts.set(parts)
     else:
         part_asset.parts.set([])
+    refresh_piece_part_counts([part_asset.piece_id])
 
     return PartAssetDTO.from_model(part_asset)
 
 
+@transaction.atomic
 def delete_part_asset(organization_id: str, part_asset_id: str) -> None:
-    PartAsset.objects.get(
+    part_asset = PartAsset.objects.get(
         id=part_asset_id, piece__organization_id=organization_id
-    ).delete()
+    )
+    _lock_pieces([part_asset.piece_id])
+    part_asset.delete()
+    refresh_piece_part_counts([part_asset.piece_id])
+
+
+def refresh_piece_part_counts(piece_ids: Optional[List[str]] = None) -> int:
+    """
+    Recompute the stored part counters for the given pieces, or all pieces.
+
+    Counters are rebuilt from the part and asset tables in a single UPDATE
+    rather than adjusted by deltas, so calling this inside the transaction
+    that changed the parts keeps them exact.
+
+    Under READ COMMITTED the UPDATE counts from a snapshot taken when it
+    starts, so callers must lock the pieces with `_lock_pieces()` before
+    changing their parts or assets. Concurrent writers then recount one after
+    another instead of overwriting each other with stale counts. Pieces are
+    locked in id order, after any program row lock, matching
+    `refresh_part_assignment_history()`.
+    """
+    pieces = Piece.objects.all()
+    if piece_ids is not None:
+        pieces = pieces.filter(id__in=piece_ids)
+    parts = Part.objects.filter(piece_id=OuterRef("id")).values("piece_id")
+    completed = parts.filter(
+        assets__status=UploadStatus.UPLOADED.value,
+        assets__asset_type=PartAssetType.CLEAN.value,
+    )
+    return pieces.update(
+        parts_count=Coalesce(
+            Subquery(parts.annotate(count=Count("id")).values("count")), 0
+        ),
+        completed_parts=Coalesce(
+            Subquery(
+                completed.annotate(count=Count("id", distinct=True)).values("count")
+            ),
+            0,
+        ),
+    )
+
+
+def _lock_pieces(piece_ids: List[str]) -> None:
+    """Lock the given pieces in id order for the rest of the transaction."""
+    list(
+        Piece.objects.select_for_update()
+        .filter(id__in=piece_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
 
 
 def get_part_asset(organization_id: str, part_asset_id: str) -> PartAssetDTO:
@@ -310,60 +381,56 @@ def get_part_instruments(part: Part) -> set[InstrumentEnum]:
     return instruments
 
 
+def get_part_instrument_mask(part: Part) -> int:
+    return get_instrument_mask(get_part_instruments(part))
+
+
+def get_part_descriptor(part: Part) -> str:
+    """Name a part's chair by its instruments, primary first, e.g. "Flute / Piccolo".
+
+    Parts with the same descriptor and number are the same chair, whichever
+    piece they belong to.
+    """
+    part_instruments = sorted(
+        part.instruments.all(),
+        key=lambda part_instrument: (
+            not part_instrument.primary,
+            part_instrument.instrument.name,
+        ),
+    )
+    return " / ".join(
+        part_instrument.instrument.name for part_instrument in part_instruments
+    )
+
+
 def get_instrument(
     instrument: InstrumentEnum,
 ) -> InstrumentDTO | None:
-    instrument_model = Instrument.objects.filter(name=instrument.value).first()
-    if instrument_model:
-        return InstrumentDTO.from_model(instrument_model)
-    else:
-        return None
+    return get_registered_instrument(instrument)
 
 
 def get_instruments_in_string(filename: str) -> List[InstrumentEnum]:
-    instruments = []
     tokens = _split_filename_tokens(filename)
-    normalized_tokens = [re.sub(r"[^a-z0-9]", "", t.lower()) for t in tokens]
-    for instrument in InstrumentEnum:
-        needle = _normalize_instrument_name(instrument.value)
-
-        # Look for the instrument name inside filename tokens
-        matches_phrase = any(
-            _instrument_token_match(needle, token) for token in normalized_tokens
-        )
+    normalized_tokens = [
+        LOWER_NON_ALPHANUMERIC_PATTERN.sub("", t.lower()) for t in tokens
+    ]
+
+    # Look for instrument names and aliases inside filename tokens
+    matches: set[InstrumentEnum] = set()
+    for token in normalized_tokens:
+        matches.update(_match_instrument_names(token))
+
+    # Handle Violin 1 and 2 edge cases since the number is part of the instrument/section name
+    for index, token in enumerate(normalized_tokens[:-1]):
+        if token != "violin":
+            continue
+        next_token = normalized_tokens[index + 1]
+        if next_token == "1":
+            matches.add(InstrumentEnum.VIOLIN_1)
+        elif next_token == "2":
+            matches.add(InstrumentEnum.VIOLIN_2)
 
-        # Handle Violin 1 and 2 edge cases since the number is part of the instrument/section name
-        if not matches_phrase and instrument in {
-            InstrumentEnum.VIOLIN_1,
-            InstrumentEnum.VIOLIN_2,
-        }:
-            for index, token in enumerate(normalized_tokens):
-                if token != "violin":
-                    continue
-                next_token = (
-                    normalized_tokens[index + 1]
-                    if index + 1 < len(normalized_tokens)
-                    else ""
-                )
-                if next_token == "1" and instrument == InstrumentEnum.VIOLIN_1:
-                    matches_phrase = True
-                    break
-                if next_token == "2" and instrument == InstrumentEnum.VIOLIN_2:
-                    matches_phrase = True
-                    break
-
-        # Look for any instrument aliases inside the filename (if there are any)
-        aliases = [
-            _normalize_instrument_name(alias) for alias in ALIAS_MAP.get(instrument, [])
-        ]
-        matches_alias = any(
-            _instrument_token_match(alias, token)
-            for alias in aliases
-            for token in normalized_tokens
-        )
-        if matches_phrase or matches_alias:
-            instruments.append(instrument)
-    return instruments
+    return sorted(matches, key=INSTRUMENT_ORDER.__getitem__)
 
 
 @transaction.atomic
@@ -381,254 +448,216 @@ def update_musician_instruments(
         if instrument != primary_instrument:
             all_instruments.append(instrument)
 
-    instrument_strings = [instrument.value for instrument in all_instruments]
-    instrument_models = list(Instrument.objects.filter(name__in=instrument_strings))
-    instrument_models_by_name = {
-        instrument.name: instrument for instrument in instrument_models
-    }
+    instrument_ids = get_instrument_ids(all_instruments)
 
     # 1) Clear existing links
     MusicianInstrument.objects.filter(musician=musician).delete()
 
     # 2) Recreate
     rows = []
-    if primary_instrument and primary_instrument.value in instrument_models_by_name:
+    if primary_instrument and primary_instrument in instrument_ids:
         rows.append(
             MusicianInstrument(
                 musician=musician,
-                instrument=instrument_models_by_name[primary_instrument.value],
+                instrument_id=instrument_ids[primary_instrument],
                 primary=True,
             )
         )
     for instrument in secondary_instruments:
         if instrument == primary_instrument:
             continue
-        instrument_model = instrument_models_by_name.get(instrument.value)
-        if instrument_model:
+        instrument_id = instrument_ids.get(instrument)
+        if instrument_id:
             rows.append(
                 MusicianInstrument(
                     musician=musician,
-                    instrument=instrument_model,
+                    instrument_id=instrument_id,
                     primary=False,
                 )
             )
     if rows:
         MusicianInstrument.objects.bulk_create(rows)
+    bump_musician_assignments_version([musician.id])
 
 
 @transaction.atomic
 def create_parts_from_instrumentation(piece_id: str, notation: str) -> List[PartDTO]:
-    # Split on em dash / hyphen
-    segments = [seg.strip() for seg in DASH_PATTERN.split(notation) if seg.strip()]
-    result: List[PartDTO] = []
-    # 1) Woodwinds: by position
-    if segments:
-        winds = _parse_bracketable_section(piece_id, segments[0], "woodwinds")
-        result.extend(winds)
-
-    # 2) Brass: by position
-    if len(segments) >= 2:
-        brass = _parse_bracketable_section(piece_id, segments[1], "brass")
-        result.extend(brass)
-
-    # 3) Everything after that can be auxiliary, electronic, perc, strings (hp, cel, pf, str, etc.)
-    for seg in segments[2:]:
-        code = _normalize_filename_token(seg)
-        if not code or _is_no_strings(code):
-            continue
+    # Write the whole part graph at once instead of one round trip per chair
+    return _bulk_create_parts(piece_id, compile_instrumentation(notation))
 
-        # Is this a percussion segment?
-        if _is_percussion_segment(seg):
-            percussion = _parse_percussion(piece_id, seg)
-            result.extend(percussion)
-            continue
-
-        # Is there a doubling of some kind? (pf/cel)
-        if "/" in code:
-            instruments = []
-            primary_code, doubling_code = code.split("/", 1)
-
-            # Figure out the primary instrument
-            primary_code = _normalize_filename_token(primary_code)
-            primary_instrument = INSTRUMENT_ABBREVIATIONS.get(primary_code)
-            if not primary_instrument:
-                logger.warning(f"Unknown instrument code {code}")
-                continue
-            primary_instrument = primary_instrument[0]
-            instruments.append(primary_instrument)
-
-            # Figure out the doubling
-            doubling_code = _normalize_filename_token(doubling_code)
-            doubling_sections = INSTRUMENT_ABBREVIATIONS.get(doubling_code)
-            if doubling_sections:
-                for doubling in doubling_sections:
-                    instruments.append(doubling)
-
-            part = create_part(
-                piece_id=piece_id,
-                primary=primary_instrument,
-                instruments=instruments,
-                number=None,
-            )
-            result.append(part)
-            continue
 
-        instruments = INSTRUMENT_ABBREVIATIONS.get(code)
-        if not instruments:
-            logger.warning(f"Unknown instrument code {code}")
-            continue
+def _create_part_assets(
+    piece: Piece, uploads: List[Tuple[str, PartAssetType]]
+) -> List[PartAssetUploadDTO]:
+    parts = list(
+        Part.objects.filter(piece_id=piece.id).prefetch_related(
+            "instruments__instrument"
+        )
+    )
+    parts_with_assets = set(
+        PartAsset.parts.through.objects.filter(part__piece_id=piece.id).values_list(
+            "part_id", flat=True
+        )
+    )
 
-        for section in instruments:
-            part = create_part(
-                piece_id=piece_id,
-                primary=section,
-                instruments=[section],
-                number=None,
+    part_assets: List[PartAsset] = []
+    part_links = []
+    part_ids_by_asset: dict[uuid.UUID, List[uuid.UUID]] = {}
+    for filename, asset_type in uploads:
+        part_asset = PartAsset(id=uuid.uuid4(), piece_id=piece.id)
+        normalized_filename = _normalize_filename(filename)
+
+        # Determine the corresponding parts for the filename. Parts matched earlier
+        # in the batch count as having assets, just like sequential uploads.
+        part_ids = _match_parts_for_filename(filename, parts, parts_with_assets)
+        parts_with_assets.update(part_ids)
+        part_ids_by_asset[part_asset.id] = part_ids
+        for part_id in part_ids:
+            part_links.append(
+                PartAsset.parts.through(partasset_id=part_asset.id, part_id=part_id)
             )
-            result.append(part)
-
-    return result
 
+        # Generate a pre-signed URL for upload (expires in 10 minutes)
+        file_key = (
+            str(piece.id)
+            + "/"
+            + str(part_asset.id)
+            + get_file_extension(normalized_filename)
+        )
+        presigned_url = create_upload_url(
+            organization_id=str(piece.organization.id),
+            file_key=file_key,
+            expiration=600,
+        )
 
-def _parse_bracketable_section(
-    piece_id: str, segment: str, section: str
-) -> List[PartDTO]:
-    """
-    Parse a bracketable section (woodwinds or brass) and create parts.
+        part_asset.file_key = file_key
+        part_asset.upload_url = presigned_url
+        part_asset.upload_filename = filename
+        part_asset.asset_type = asset_type.value
+        part_asset.status = UploadStatus.PENDING.value
+        part_assets.append(part_asset)
+
+    # New assets are pending, so they cannot change the piece's part counters
+    PartAsset.objects.bulk_create(part_assets)
+    PartAsset.parts.through.objects.bulk_create(part_links)
+
+    part_dtos = {
+        part.id: PartDTO.construct_trusted(
+            id=str(part.id),
+            piece_id=str(piece.id),
+            instruments=PartInstrumentDTO.from_models(part.instruments.all()),
+            number=part.number,
+        )
+        for part in parts
+    }
+    return [
+        PartAssetUploadDTO.construct_trusted(
+            id=str(part_asset.id),
+            piece_id=str(piece.id),
+            parts=[part_dtos[part_id] for part_id in part_ids_by_asset[part_asset.id]],
+            asset_type=PartAssetType(part_asset.asset_type),
+            status=UploadStatus(part_asset.status),
+            upload_url=part_asset.upload_url,
+            upload_filename=part_asset.upload_filename,
+            file_key=part_asset.file_key,
+        )
+        for part_asset in part_assets
+    ]
 
-    The segment uses positional counts with optional bracket details:
-        "2[1.2/pic] 2[1.2/eh] 2[1.2] 2[1.2]" → Fl, Ob, Cl, Bn
 
-    Bracket details can specify doublings (e.g. "/pic") or direct instrument codes.
+def _match_parts_for_filename(
+    filename: str, parts: List[Part], parts_with_assets: set[uuid.UUID]
+) -> List[uuid.UUID]:
     """
-    out: List[InstrumentEnum] = []
-    tokens = _normalize_instrumentation_token(segment).split()
-
-    # Use the right instrument order based on the section
-    if section == "brass":
-        order = BRASS_ORDER
-    elif section == "woodwinds":
-        order = WOODWIND_ORDER
-
-    for index, token in enumerate(tokens):
-        if index >= len(order):
-            break
-
-        # Extract leading count and optional bracket
-        match = re.match(r"(?P<instrument_count>\d+)(?P<section_details>.*)", token)
-        if not match:
-            continue
-
-        # Determine the number of instruments
-        instrument_count = int(match.group("instrument_count"))
-
-        # Are there instrument details in bracket notation? e.g. [1.2/pic] or [1.2/Eh]
-        # If so grab them and strip brackets
-        section_details = match.group("section_details")
-        if section_details:
-            section_details = section_details.strip("[]()")
-
-        # Add base instruments
-        for instrument_number in range(instrument_count):
-            instruments = []
-
-            # Determine the details for this instrument number in section details
-            if section_details:
-                instrument_details = section_details.split(".")[instrument_number]
-
-                # Is there a doubling?
-                if "/" in instrument_details:
-                    # Add the base instrument section
-                    primary_instrument = order[index]
-                    instruments.append(primary_instrument)
-
-                    # Figure out and add the doubling
-                    _, doubling_code = instrument_details.split("/", 1)
-                    doubling_code = doubling_code.strip().lower()
-                    doubling_instruments = INSTRUMENT_ABBREVIATIONS.get(doubling_code)
-                    if not doubling_instruments:
-                        raise Exception(
-                            f"Unable to find instrument for abbreviation '{instrument_details}'"
-                        )
-                    if doubling_instruments:
-                        for doubling in doubling_instruments:
-                            instruments.append(doubling)
-                # Is it just a numeric part that uses only the base instrument?
-                elif is_integer(instrument_details):
-                    primary_instrument = order[index]
-                    instruments.append(primary_instrument)
-                # Is it a dedicated part that uses a different instrument?
-                else:
-                    instruments = INSTRUMENT_ABBREVIATIONS.get(instrument_details)
-                    if not instruments:
-                        raise Exception(
-                            f"Unable to find instrument for abbreviation '{instrument_details}'"
-                        )
-                    primary_instrument = instruments[0]
-                    instruments = [primary_instrument]
-            else:
-                primary_instrument = order[index]
-                instruments = [primary_instrument]
-
-            # Create the part
-            part = create_part(
-                piece_id, primary_instrument, instruments, instrument_number + 1
-            )
-            out.append(part)
+    Return the IDs of the parts an uploaded filename belongs to.
 
-    return out
+    Numbered filenames (e.g. "Horn 1 2") only match those chairs and skip parts
+    that already have an asset; un-numbered filenames are treated as combined
+    parts and match every chair for the instrument.
+    """
+    instruments = get_instruments_in_string(filename)
+    numbered_instruments = _extract_numbered_instruments(filename, instruments)
+    part_ids = []
+    for part in parts:
+        for part_instrument in part.instruments.all():
+            instrument_enum = InstrumentEnum(part_instrument.instrument.name)
+            if instrument_enum in instruments:
+                numbers = numbered_instruments.get(instrument_enum)
+                is_combined_part = not numbers
+                if part.id in parts_with_assets and not is_combined_part:
+                    continue
+                if numbers and part.number not in numbers:
+                    continue
+                part_ids.append(part.id)
+                break
+    return part_ids
 
 
-def _parse_percussion(piece_id: str, segment: str) -> List[PartDTO]:
+def _bulk_create_parts(piece_id: str, part_plans: Sequence[PartPlan]) -> List[PartDTO]:
     """
-    Parse percussion segments and create timpani/percussion parts.
+    Persist compiled part plans with one insert for parts and one for instruments.
 
-    Examples:
-        "tmp+1"  -> 1 Timpani, 1 Percussion
-        "timp+5" -> 1 Timpani, 5 Percussion
-        "5perc"  -> 5 Percussion
+    Instruments are resolved from the instrument registry and the returned DTOs
+    are built from the in-memory rows, so the cost does not grow with the number
+    of chairs.
     """
-    out: List[InstrumentEnum] = []
-    segment = _normalize_filename_token(segment)
-    if not segment:
-        return
-
-    match = re.match(r"^(?P<code>timp|tmp)(?:\+(?P<percussion_count>\d+))?$", segment)
-    if match:
-        percussion_count = int(match.group("percussion_count") or 0)
-        # Create the part
-        part = create_part(
-            piece_id=piece_id,
-            primary=InstrumentEnum.TIMPANI,
-            instruments=[InstrumentEnum.TIMPANI],
-            number=1,
+    instrument_ids = get_instrument_ids(
+        list(
+            {
+                instrument
+                for _, instruments, _ in part_plans
+                for instrument in instruments
+            }
         )
-        out.append(part)
-        if percussion_count > 0:
-            for percussion_number in range(percussion_count):
-                part = create_part(
-                    piece_id=piece_id,
-                    primary=InstrumentEnum.PERCUSSION,
-                    instruments=[InstrumentEnum.PERCUSSION],
-                    number=percussion_number + 1,
+    )
+
+    # Bumping the programs locks their rows, which must come before the piece
+    # lock to keep the program-then-pieces order used by assignment writes
+    bump_piece_assignments_version([piece_id])
+    _lock_pieces([piece_id])
+    parts: List[Part] = []
+    part_instruments: List[PartInstrument] = []
+    for primary, instruments, number in part_plans:
+        part = Part(id=uuid.uuid4(), piece_id=str(piece_id), number=number)
+        parts.append(part)
+        for instrument in instruments:
+            part_instruments.append(
+                PartInstrument(
+                    part=part,
+                    instrument_id=instrument_ids[instrument],
+                    primary=True if instrument == primary else False,
                 )
-                out.append(part)
-        return out
-
-    match = re.match(r"^(?P<count>\d+)?perc$", segment)
-    if match:
-        percussion_count = int(match.group("count") or 1)
-        for percussion_number in range(percussion_count):
-            part = create_part(
-                piece_id=piece_id,
-                primary=InstrumentEnum.PERCUSSION,
-                instruments=[InstrumentEnum.PERCUSSION],
-                number=percussion_number + 1,
             )
-            out.append(part)
-        return out
+    Part.objects.bulk_create(parts)
+    PartInstrument.objects.bulk_create(part_instruments)
+    refresh_piece_part_counts([piece_id])
 
-    return out
+    instrument_names = {
+        instrument_id: instrument
+        for instrument, instrument_id in instrument_ids.items()
+    }
+    part_instruments_by_part = defaultdict(list)
+    for part_instrument in part_instruments:
+        part_instruments_by_part[part_instrument.part_id].append(
+            PartInstrumentDTO.construct_trusted(
+                id=str(part_instrument.id),
+                part_id=str(part_instrument.part_id),
+                primary=part_instrument.primary,
+                instrument=InstrumentDTO.construct_trusted(
+                    id=str(part_instrument.instrument_id),
+                    name=instrument_names[part_instrument.instrument_id],
+                ),
+            )
+        )
+    return [
+        PartDTO.construct_trusted(
+            id=str(part.id),
+            piece_id=str(piece_id),
+            instruments=part_instruments_by_part[part.id],
+            number=part.number,
+        )
+        for part in parts
+    ]
 
 
 def _extract_numbered_instruments(
@@ -643,18 +672,17 @@ def _extract_numbered_instruments(
     for instrument in instruments:
         if instrument in {InstrumentEnum.VIOLIN_1, InstrumentEnum.VIOLIN_2}:
             continue
-        needles = [_normalize_instrument_name(instrument.value)] + [
-            _normalize_instrument_name(alias) for alias in ALIAS_MAP.get(instrument, [])
-        ]
-        for needle in needles:
-            numbers = _extract_numbers_after_instrument(normalized_filename, needle)
+        for pattern in NUMBERED_INSTRUMENT_PATTERNS[instrument]:
+            numbers = _extract_numbers_after_instrument(normalized_filename, pattern)
             if numbers:
                 out[instrument] = numbers
                 break
     return out
 
 
-def _extract_numbers_after_instrument(token: str, needle: str) -> Optional[set[int]]:
+def _extract_numbers_after_instrument(
+    token: str, pattern: re.Pattern
+) -> Optional[set[int]]:
     """
     Extracts part numbers that immediately follow an instrument token.
 
@@ -666,7 +694,7 @@ def _extract_numbers_after_instrument(token: str, needle: str) -> Optional[set[i
         - Treats concatenated digits as separate part numbers (e.g., "12" -> {1, 2}).
         - Ignores zeros.
     """
-    match = re.search(rf"{re.escape(needle)}(?P<num>[\d\-]+)", token)
+    match = pattern.search(token)
     if not match:
         return None
     number_string = match.group("num")
@@ -677,60 +705,60 @@ def _extract_numbers_after_instrument(token: str, needle: str) -> Optional[set[i
     return numbers or None
 
 
-def _instrument_token_match(needle: str, token: str) -> bool:
+def _match_instrument_names(token: str) -> set[InstrumentEnum]:
     """
-    Return True if the normalized instrument name appears in a filename token.
+    Return every instrument whose normalized name or alias appears in a token.
 
-    Ensures the match starts at a token boundary or before digits.
+    A match must start at the beginning of the token or right after a digit, and
+    end at the end of the token or right before a digit (e.g. "horn" matches
+    "horn12" but not "englishhorn"). Each valid start position is walked down the
+    prebuilt name trie once, so the cost is independent of the number of
+    instruments.
     """
-    return re.search(rf"(?<![a-z]){re.escape(needle)}(?:(?=\d)|\b)", token) is not None
+    matches: set[InstrumentEnum] = set()
+    token_length = len(token)
+    for start in range(token_length):
+        if start > 0 and not token[start - 1].isdigit():
+            continue
+        node = INSTRUMENT_NAME_TRIE
+        for end in range(start, token_length):
+            node = node.get(token[end])
+            if node is None:
+                break
+            terminal = node.get(TRIE_MATCHES_KEY)
+            if terminal and (end + 1 == token_length or token[end + 1].isdigit()):
+                matches.update(terminal)
+    return matches
 
 
-def _normalize_instrumentation_token(seg: str) -> str:
-    """
-    Normalize instrumentation notation tokens.
-
-    - Removes "opt"
-    - Normalizes dash/underscore to spaces
-    - Collapses whitespace
-    - Lowercases
-    Example: "Violin-1" -> "violin 1"
-    """
-    # Remove optional markers while preserving neighboring instrument details.
-    seg = re.sub(r"\bopt\b", "", seg, flags=re.IGNORECASE)
-    seg = re.sub(r"[-_]+", " ", seg)  # violin-1, violin_1 -> violin 1
-    # Normalize bracket details without collapsing token boundaries like "] 2[".
-    seg = re.sub(r"\s*([./])\s*", r"\1", seg)
-    seg = re.sub(r"\[\s+", "[", seg)
-    seg = re.sub(r"\s+\]", "]", seg)
-    seg = re.sub(r"\s+", " ", seg).lower()
-    return seg
-
-
-def _normalize_filename_token(seg: str) -> str:
+def _build_instrument_name_trie() -> dict:
     """
-    Normalize filename tokens for instrument matching.
+    Build a character trie over normalized instrument names and filename aliases.
 
-    - Removes "opt"
-    - Strips separators between letters/digits (e.g., "violin-1" -> "violin1")
-    - Lowercases
+    Terminal nodes store the instruments that end there under ``TRIE_MATCHES_KEY``.
     """
-    # Remove tokens like "opt"
-    seg = re.sub(r"\bopt\b", "", seg)
-    seg = re.sub(r"[-_]+", "", seg)  # violin-1, violin_1 -> violin1
-    seg = re.sub(r"\s+", " ", seg).strip().lower()
-    return seg
-
-
-def _is_no_strings(code: str) -> bool:
-    """Return True if the token indicates strings are explicitly omitted."""
-    return code in {"[no str]", "no str", "[nostr]", "nostr"}
-
-
-def _is_percussion_segment(seg: str) -> bool:
-    """Return True if a segment represents percussion/timpani notation."""
-    seg = seg.strip().lower()
-    return bool(re.match(r"^(timp|tmp)(?:\+\d+)?$", seg) or re.match(r"^\d*perc$", seg))
+    trie: dict = {}
+    for instrument in InstrumentEnum:
+        needles = [instrument.value] + ALIAS_MAP.get(instrument, [])
+        for needle in needles:
+            node = trie
+            for char in _normalize_instrument_name(needle):
+                node = node.setdefault(char, {})
+            node.setdefault(TRIE_MATCHES_KEY, set()).add(instrument)
+    return trie
+
+
+def _build_numbered_instrument_patterns() -> dict[InstrumentEnum, list[re.Pattern]]:
+    """Compile the "<name><numbers>" pattern for each instrument name and alias."""
+    return {
+        instrument: [
+            re.compile(
+                rf"{re.escape(_normalize_instrument_name(needle))}(?P<num>[\d\-]+)"
+            )
+            for needle in [instrument.value] + ALIAS_MAP.get(instrument, [])
+        ]
+        for instrument in InstrumentEnum
+    }
 
 
 def _normalize_filename(name: str) -> str:
@@ -742,8 +770,8 @@ def _normalize_filename(name: str) -> str:
     - Collapses whitespace
     """
     name = name.lower()
-    name = re.sub(r"[-_]+", " ", name)  # violin-1, violin_1 -> violin 1
-    name = re.sub(r"\s+", " ", name).strip()
+    name = FILENAME_SEPARATOR_PATTERN.sub(" ", name)  # violin-1 -> violin 1
+    name = WHITESPACE_PATTERN.sub(" ", name).strip()
     return name
 
 
@@ -751,11 +779,20 @@ def _split_filename_tokens(name: str) -> List[str]:
     """
     Split a filename into tokens on separators, keeping digits attached to words.
     """
-    return [token for token in re.split(r"[\s._-]+", name) if token]
+    return [token for token in FILENAME_TOKEN_SPLIT_PATTERN.split(name) if token]
 
 
 def _normalize_instrument_name(name: str) -> str:
     """
     Normalize an instrument name by removing all non-alphanumeric characters.
     """
-    return re.sub(r"[^a-zA-Z0-9]", "", name).lower()
+    return NON_ALPHANUMERIC_PATTERN.sub("", name).lower()
+
+
+# Filename matching indexes, built once at import
+TRIE_MATCHES_KEY = "$"
+INSTRUMENT_ORDER = {
+    instrument: index for index, instrument in enumerate(InstrumentEnum)
+}
+INSTRUMENT_NAME_TRIE = _build_instrument_name_trie()
+NUMBERED_INSTRUMENT_PATTERNS = _build_numbered_instrument_patterns()
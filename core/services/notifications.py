@@ -1,11 +1,21 @@
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+from django.conf import settings
+
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db import connection as db_connection
+from django.template.loader import get_template
 from django.utils import timezone
+from django.utils.html import escape
 
 from core.dtos.queue import EmailQueuePayloadDTO
+from core.dtos.music import PieceDTO
 from core.enum.instruments import (
-    INSTRUMENT_SECTIONS,
-    InstrumentEnum,
+    INSTRUMENT_SECTION_MASKS,
     InstrumentSectionEnum,
 )
 from core.enum.notifications import (
@@ -14,16 +24,104 @@ from core.enum.notifications import (
     NotificationStatus,
     NotificationType,
 )
-from core.models.notifications import Notification
-from core.models.organizations import Musician
+from core.models.notifications import (
+    NOTIFICATION_BODY_PLACEHOLDER,
+    NOTIFICATION_BODY_PLACEHOLDER_PATTERN,
+    Notification,
+    NotificationBody,
+)
+from core.models.organizations import Musician, Organization
 from core.models.programs import Program, ProgramMusician, ProgramPartMusician
 from core.services.assignments import (
     auto_assign_harp_keyboard_principal_parts_if_unambiguous,
     get_assignment_payload,
+    ProgramAssignmentSnapshot,
 )
 from core.services.magic_links import create_magic_link, get_magic_link_url
-from core.services.programs import get_pieces_for_program
-from core.services.queue import enqueue_email_payload
+from core.services.programs import (
+    get_pieces_for_program,
+    get_program_musician_instrument_mask,
+)
+from core.services.queue import enqueue_email_payloads
+
+
+class PreparedNotificationEmail(NamedTuple):
+    """A rendered email whose Notification row is saved but not yet sent."""
+
+    notification: Notification
+    message: EmailMultiAlternatives
+
+
+class ProgramEmailContext(NamedTuple):
+    """The parts of a notification email shared by every recipient of a program."""
+
+    program: Program
+    organization: Organization
+    pieces: List[PieceDTO]
+
+
+# (organization_id, program_id) -> (expires_at, context)
+_program_email_contexts: dict[tuple[str, str], tuple[float, ProgramEmailContext]] = {}
+_program_email_contexts_lock = threading.Lock()
+
+
+def get_program_email_context(
+    organization_id: str, program_id: str
+) -> Optional[ProgramEmailContext]:
+    """Load the program, organization and pieces for notification emails.
+
+    A queue fan-out sends one message per musician of the same program, so the
+    result is kept in process for NOTIFICATION_CONTEXT_CACHE_SECONDS and the
+    program queries run once per burst. Program changes made in the meantime
+    may show up late in emails, not in links or assignments.
+
+    Returns None when the program does not exist in the organization.
+    """
+    key = (str(organization_id), str(program_id))
+    now = time.monotonic()
+    with _program_email_contexts_lock:
+        cached = _program_email_contexts.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    program = (
+        Program.objects.filter(id=program_id, organization_id=organization_id)
+        .select_related("organization")
+        .first()
+    )
+    if not program:
+        return None
+    context = ProgramEmailContext(
+        program=program,
+        organization=program.organization,
+        pieces=get_pieces_for_program(
+            organization_id=organization_id,
+            program_id=program_id,
+        ),
+    )
+
+    timeout = settings.NOTIFICATION_CONTEXT_CACHE_SECONDS
+    if timeout > 0:
+        with _program_email_contexts_lock:
+            for expired_key in [
+                cached_key
+                for cached_key, (expires_at, _) in _program_email_contexts.items()
+                if expires_at <= now
+            ]:
+                del _program_email_contexts[expired_key]
+            _program_email_contexts[key] = (now + timeout, context)
+    return context
+
+
+def clear_program_email_context_cache() -> None:
+    with _program_email_contexts_lock:
+        _program_email_contexts.clear()
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name: str):
+    """Compile an email template once per process instead of once per message."""
+    return get_template(template_name)
 
 
 def _is_string_principal(program_musician: ProgramMusician) -> bool:
@@ -32,14 +130,9 @@ def _is_string_principal(program_musician: ProgramMusician) -> bool:
     String principals are excluded from principal assignment emails in the
     current workflow.
     """
-    string_instruments = set(INSTRUMENT_SECTIONS[InstrumentSectionEnum.STRINGS])
-    musician_instruments = {
-        InstrumentEnum(instrument.instrument.name)
-        for instrument in program_musician.instruments.all()
-    }
-    return bool(musician_instruments) and musician_instruments.issubset(
-        string_instruments
-    )
+    string_instruments_mask = INSTRUMENT_SECTION_MASKS[InstrumentSectionEnum.STRINGS]
+    musician_mask = get_program_musician_instrument_mask(program_musician)
+    return bool(musician_mask) and not musician_mask & ~string_instruments_mask
 
 
 def send_part_assignment_emails(organization_id: str, program_id: str):
@@ -50,37 +143,43 @@ def send_part_assignment_emails(organization_id: str, program_id: str):
     - principals auto-assigned by unambiguous harp/keyboard rules
     - principals with no assignable parts in scope
     """
-    principals = (
-        ProgramMusician.objects.filter(
-            program_id=program_id,
-            musician__organization_id=organization_id,
-            principal=True,
-        )
-        .select_related("musician")
-        .prefetch_related("instruments__instrument")
-    )
-
+    try:
+        snapshot = ProgramAssignmentSnapshot(program_id)
+    except Program.DoesNotExist:
+        return
+    principals = [
+        program_musician
+        for program_musician in snapshot.program_musicians
+        if program_musician.principal
+        and str(program_musician.musician.organization_id) == str(organization_id)
+    ]
+
+    payloads = []
     for principal in principals:
         if _is_string_principal(principal):
             continue
         if auto_assign_harp_keyboard_principal_parts_if_unambiguous(
             program_id=program_id,
             principal_musician_id=str(principal.musician.id),
+            snapshot=snapshot,
         ):
             continue
         assignment_payload = get_assignment_payload(
             program_id=program_id,
             principal_musician_id=str(principal.musician.id),
+            snapshot=snapshot,
         )
         if not assignment_payload.pieces:
             continue
-        payload = EmailQueuePayloadDTO(
-            organization_id=organization_id,
-            program_id=program_id,
-            musician_id=str(principal.musician.id),
-            notification_type=NotificationType.ASSIGNMENT,
+        payloads.append(
+            EmailQueuePayloadDTO(
+                organization_id=organization_id,
+                program_id=program_id,
+                musician_id=str(principal.musician.id),
+                notification_type=NotificationType.ASSIGNMENT,
+            )
         )
-        enqueue_email_payload(payload)
+    enqueue_email_payloads(payloads)
 
 
 def send_part_delivery_emails(organization_id: str, program_id: str):
@@ -90,31 +189,51 @@ def send_part_delivery_emails(organization_id: str, program_id: str):
         musician__organization_id=organization_id,
     ).select_related("musician")
 
-    for program_musician in roster_musicians:
-        payload = EmailQueuePayloadDTO(
-            organization_id=organization_id,
-            program_id=program_id,
-            musician_id=str(program_musician.musician_id),
-            notification_type=NotificationType.PART_DELIVERY,
-        )
-        enqueue_email_payload(payload)
+    enqueue_email_payloads(
+        [
+            EmailQueuePayloadDTO(
+                organization_id=organization_id,
+                program_id=program_id,
+                musician_id=str(program_musician.musician_id),
+                notification_type=NotificationType.PART_DELIVERY,
+            )
+            for program_musician in roster_musicians
+        ]
+    )
 
 
 def send_assignment_email(
-    organization_id: str, program_id: str, musician_id: str
+    organization_id: str,
+    program_id: str,
+    musician_id: str,
+    connection=None,
 ) -> None:
     """Render and send one principal assignment email with magic link.
 
     A Notification row is persisted before send; status transitions to SENT/FAILED.
     Duplicate ASSIGNMENT notifications for the same program+musician are ignored.
     """
-    program = (
-        Program.objects.filter(id=program_id, organization_id=organization_id)
-        .prefetch_related("organization")
-        .first()
+    _send_prepared_email(
+        prepare_assignment_email(
+            organization_id=organization_id,
+            program_id=program_id,
+            musician_id=musician_id,
+        ),
+        connection=connection,
     )
-    if not program:
+
+
+def prepare_assignment_email(
+    organization_id: str, program_id: str, musician_id: str
+) -> Optional[PreparedNotificationEmail]:
+    """Render one principal assignment email and persist its CREATED Notification.
+
+    Returns None when the principal should not be emailed.
+    """
+    program_context = get_program_email_context(organization_id, program_id)
+    if not program_context:
         return None
+    program = program_context.program
 
     musician = Musician.objects.get(id=musician_id, organization_id=organization_id)
     program_musician = (
@@ -143,92 +262,55 @@ def send_assignment_email(
     if not assignment_payload.pieces:
         return None
 
-    # Dedupe on (program, recipient, type) so queue retries are safe
-    notification = Notification.objects.filter(
-        program_id=program_id,
-        recipient_id=musician_id,
-        type=NotificationType.ASSIGNMENT.value,
-    ).first()
-    if notification:
+    # Claim (program, recipient, type) before rendering so queue retries and
+    # concurrent consumers send the email once
+    notification = _claim_notification(program, musician, NotificationType.ASSIGNMENT)
+    if notification is None:
         return None
 
-    # Create the magic link
-    magic_link = create_magic_link(
-        program_id=program_id,
-        musician_id=musician_id,
+    return _render_claimed_email(
+        notification,
+        program_context,
         link_type=MagicLinkType.ASSIGNMENT,
+        subject=f"Assign Parts for {program.name}",
+        template_name="emails/assignment",
     )
 
-    # Create the email context and send the email
-    pieces = get_pieces_for_program(
-        organization_id=organization_id,
-        program_id=program_id,
-    )
-
-    context = {
-        "organization": program.organization,
-        "musician": musician,
-        "program": program,
-        "pieces": pieces,
-        "url": get_magic_link_url(magic_link.token, link_type=MagicLinkType.ASSIGNMENT),
-    }
-    subject = f"Assign Parts for {program.name}"
-    text_body = render_to_string("emails/assignment.txt", context)
-    html_body = render_to_string("emails/assignment.html", context)
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        to=[musician.email],
-    )
-    msg.attach_alternative(html_body, "text/html")
-
-    notification = Notification(
-        created=timezone.now(),
-        method=NotificationMethod.EMAIL.value,
-        type=NotificationType.ASSIGNMENT.value,
-        program=program,
-        status=NotificationStatus.CREATED.value,
-        recipient_email=musician.email,
-        recipient_first_name=musician.first_name,
-        recipient_last_name=musician.last_name,
-        recipient=musician,
-        magic_link=magic_link,
-        subject=subject,
-        body=text_body,
-        body_html=html_body,
-    )
-    notification.save()
-
-    try:
-        success = msg.send()
-    except Exception:
-        success = False
-
-    if success:
-        notification.status = NotificationStatus.SENT.value
-        notification.save(update_fields=["status"])
-    else:
-        notification.status = NotificationStatus.FAILED.value
-        notification.save(update_fields=["status"])
-
 
 def send_part_delivery_email(
     organization_id: str,
     program_id: str,
     musician_id: str,
+    connection=None,
 ) -> None:
     """Render and send one part-delivery email with delivery magic link.
 
     Only roster musicians are eligible. Duplicate PART_DELIVERY notifications
     for the same program+musician are ignored.
     """
-    program = (
-        Program.objects.filter(id=program_id, organization_id=organization_id)
-        .prefetch_related("organization")
-        .first()
+    _send_prepared_email(
+        prepare_part_delivery_email(
+            organization_id=organization_id,
+            program_id=program_id,
+            musician_id=musician_id,
+        ),
+        connection=connection,
     )
-    if not program:
+
+
+def prepare_part_delivery_email(
+    organization_id: str,
+    program_id: str,
+    musician_id: str,
+) -> Optional[PreparedNotificationEmail]:
+    """Render one part-delivery email and persist its CREATED Notification.
+
+    Returns None when the musician should not be emailed.
+    """
+    program_context = get_program_email_context(organization_id, program_id)
+    if not program_context:
         return None
+    program = program_context.program
 
     # Ensure the musician is on the roster and has parts assigned
     musician = Musician.objects.get(id=musician_id, organization_id=organization_id)
@@ -245,73 +327,232 @@ def send_part_delivery_email(
     if not has_parts_on_program:
         return None
 
-    # Dedupe on (program, recipient, type) so queue retries are safe
-    notification = Notification.objects.filter(
-        program_id=program_id,
-        recipient_id=musician_id,
-        type=NotificationType.PART_DELIVERY.value,
-    ).first()
-
-    if notification:
+    # Claim (program, recipient, type) before rendering so queue retries and
+    # concurrent consumers send the email once
+    notification = _claim_notification(
+        program, musician, NotificationType.PART_DELIVERY
+    )
+    if notification is None:
         return None
 
-    # Create the magic link
-    magic_link = create_magic_link(
-        program_id=program_id,
-        musician_id=musician_id,
+    return _render_claimed_email(
+        notification,
+        program_context,
         link_type=MagicLinkType.DELIVERY,
+        subject=f"Parts Ready for {program.name}",
+        template_name="emails/delivery",
     )
 
-    # Create the template context and send the email
-    pieces = get_pieces_for_program(
-        organization_id=organization_id,
-        program_id=program_id,
-    )
-    context = {
-        "organization": program.organization,
-        "musician": musician,
-        "program": program,
-        "pieces": pieces,
-        "url": get_magic_link_url(magic_link.token, link_type=MagicLinkType.DELIVERY),
-    }
-    subject = f"Parts Ready for {program.name}"
-    text_body = render_to_string("emails/delivery.txt", context)
-    html_body = render_to_string("emails/delivery.html", context)
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        to=[musician.email],
-    )
-    msg.attach_alternative(html_body, "text/html")
 
+def _claim_notification(
+    program: Program, musician: Musician, notification_type: NotificationType
+) -> Optional[Notification]:
+    """Insert a CREATED notification unless a live one already exists.
+
+    A single INSERT ... ON CONFLICT DO NOTHING against the partial unique
+    constraint on (program, recipient, type), so of several concurrent senders
+    exactly one gets the row back.
+
+    Returns:
+        The saved notification, or None when another sender holds the claim.
+    """
     notification = Notification(
         created=timezone.now(),
         method=NotificationMethod.EMAIL.value,
-        type=NotificationType.PART_DELIVERY.value,
+        type=notification_type.value,
         program=program,
         status=NotificationStatus.CREATED.value,
         recipient_email=musician.email,
         recipient_first_name=musician.first_name,
         recipient_last_name=musician.last_name,
         recipient=musician,
-        magic_link=magic_link,
+        subject="",
+    )
+    meta = Notification._meta
+    fields = meta.concrete_fields
+    quote_name = db_connection.ops.quote_name
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote_name(meta.db_table)} "
+            f"({', '.join(quote_name(field.column) for field in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT DO NOTHING RETURNING {quote_name(meta.pk.column)}",
+            [
+                field.get_db_prep_save(
+                    field.pre_save(notification, add=True), db_connection
+                )
+                for field in fields
+            ],
+        )
+        if cursor.fetchone() is None:
+            return None
+    notification._state.adding = False
+    notification._state.db = db_connection.alias
+    return notification
+
+
+def _render_claimed_email(
+    notification: Notification,
+    program_context: ProgramEmailContext,
+    link_type: MagicLinkType,
+    subject: str,
+    template_name: str,
+) -> PreparedNotificationEmail:
+    """Create the magic link and render the email for a claimed notification."""
+    musician = notification.recipient
+    try:
+        magic_link = create_magic_link(
+            program_id=str(program_context.program.id),
+            musician_id=str(musician.id),
+            link_type=link_type,
+        )
+        context = {
+            "organization": program_context.organization,
+            "musician": musician,
+            "program": program_context.program,
+            "pieces": program_context.pieces,
+            "url": get_magic_link_url(magic_link.token, link_type=link_type),
+        }
+        text_body = get_email_template(f"{template_name}.txt").render(context)
+        html_body = get_email_template(f"{template_name}.html").render(context)
+    except Exception:
+        # Release the claim so a retry can send the email
+        notification.status = NotificationStatus.FAILED.value
+        notification.save(update_fields=["status"])
+        raise
+
+    url = context["url"]
+    first_name = musician.first_name or ""
+    body_values = [url, first_name, escape(url), escape(first_name)]
+    notification.text_body, notification.html_body = _store_notification_bodies(
+        [text_body, html_body], body_values
+    )
+    notification.body_values = body_values
+    notification.magic_link = magic_link
+    notification.subject = subject
+    notification.save(
+        update_fields=[
+            "magic_link",
+            "subject",
+            "text_body",
+            "html_body",
+            "body_values",
+        ]
+    )
+
+    msg = EmailMultiAlternatives(
         subject=subject,
         body=text_body,
-        body_html=html_body,
+        to=[musician.email],
+    )
+    msg.attach_alternative(html_body, "text/html")
+    return PreparedNotificationEmail(notification=notification, message=msg)
+
+
+def _store_notification_bodies(
+    texts: list[str], values: list[str]
+) -> list[NotificationBody]:
+    """Store rendered bodies content-addressed, with `values` cut out.
+
+    Recipients of one program get the same bodies apart from these values,
+    so a fan-out stores each body once. Concurrent consumers storing the same
+    body resolve on the unique digest.
+    """
+    skeletons = [_cut_body_values(text, values) for text in texts]
+    skeletons_by_digest = {
+        NotificationBody.get_digest(skeleton): skeleton for skeleton in skeletons
+    }
+    NotificationBody.objects.bulk_create(
+        [
+            NotificationBody(digest=digest, content=NotificationBody.compress(skeleton))
+            for digest, skeleton in skeletons_by_digest.items()
+        ],
+        ignore_conflicts=True,
+    )
+    bodies = NotificationBody.objects.in_bulk(
+        list(skeletons_by_digest), field_name="digest"
+    )
+    return [bodies[NotificationBody.get_digest(skeleton)] for skeleton in skeletons]
+
+
+def _cut_body_values(text: str, values: list[str]) -> str:
+    indexes = {}
+    for index, value in enumerate(values):
+        if value:
+            indexes.setdefault(value, index)
+    if not indexes:
+        return text
+    # One pass, longest first, so a value inside another one is not cut out of it
+    pattern = re.compile(
+        "|".join(re.escape(value) for value in sorted(indexes, key=len, reverse=True))
     )
-    notification.save()
+    skeleton = pattern.sub(
+        lambda match: NOTIFICATION_BODY_PLACEHOLDER.format(indexes[match.group()]),
+        text,
+    )
+    restored = NOTIFICATION_BODY_PLACEHOLDER_PATTERN.sub(
+        lambda match: values[int(match.group(1))], skeleton
+    )
+    # Text that already looks like a placeholder cannot be cut safely
+    return skeleton if restored == text else text
+
 
+def send_prepared_email(prepared: PreparedNotificationEmail, connection=None) -> bool:
+    """Send a rendered email over SMTP without touching the database.
+
+    Pass a connection, e.g. a pooled one, to reuse it instead of opening a new
+    SMTP session for this message.
+    """
+    if connection is not None:
+        prepared.message.connection = connection
     try:
-        success = msg.send()
+        return bool(prepared.message.send())
     except Exception:
-        success = False
+        return False
 
-    if success:
-        notification.status = NotificationStatus.SENT.value
-        notification.save(update_fields=["status"])
-    else:
-        notification.status = NotificationStatus.FAILED.value
-        notification.save(update_fields=["status"])
+
+def record_notification_email_status(
+    prepared: PreparedNotificationEmail, success: bool
+) -> None:
+    notification = prepared.notification
+    notification.status = (
+        NotificationStatus.SENT.value if success else NotificationStatus.FAILED.value
+    )
+    notification.save(update_fields=["status"])
+
+
+def _send_prepared_email(
+    prepared: Optional[PreparedNotificationEmail], connection=None
+) -> None:
+    if prepared is not None:
+        record_notification_email_status(
+            prepared, send_prepared_email(prepared, connection=connection)
+        )
+
+
+def prepare_notification_email(
+    *,
+    organization_id: str,
+    program_id: str,
+    musician_id: str,
+    notification_type: NotificationType,
+) -> Optional[PreparedNotificationEmail]:
+    """Dispatch a queued notification payload to the type-specific renderer."""
+    if notification_type == NotificationType.ASSIGNMENT:
+        return prepare_assignment_email(
+            organization_id=organization_id,
+            program_id=program_id,
+            musician_id=musician_id,
+        )
+
+    if notification_type == NotificationType.PART_DELIVERY:
+        return prepare_part_delivery_email(
+            organization_id=organization_id,
+            program_id=program_id,
+            musician_id=musician_id,
+        )
+
+    raise ValueError(f"Unsupported notification type: {notification_type}")
 
 
 def send_notification_email(
@@ -320,6 +561,7 @@ def send_notification_email(
     program_id: str,
     musician_id: str,
     notification_type: NotificationType,
+    connection=None,
 ) -> None:
     """Dispatch a queued notification payload to the type-specific sender."""
     if notification_type == NotificationType.ASSIGNMENT:
@@ -327,6 +569,7 @@ def send_notification_email(
             organization_id=organization_id,
             program_id=program_id,
             musician_id=musician_id,
+            connection=connection,
         )
         return None
 
@@ -335,6 +578,7 @@ def send_notification_email(
             organization_id=organization_id,
             program_id=program_id,
             musician_id=musician_id,
+            connection=connection,
         )
         return None
 
@@ -3,6 +3,7 @@ from django.db.models import Q
 from core.enum.instruments import InstrumentEnum
 from core.models.organizations import Organization, Musician, SetupChecklist
 from core.services.music import update_musician_instruments
+from core.services.pagination import paginate_by_cursor
 from core.dtos.organizations import (
     OrganizationDTO,
     MusicianDTO,
@@ -124,6 +125,8 @@ def search_for_musician(
     limit: int = 25,
     offset: int = 0,
     sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> MusicianSearchResultDTO:
     search_query = Q(organization_id=organization_id)
     if name:
@@ -157,6 +160,18 @@ def search_for_musician(
     musicians = musicians.order_by(f"{sort_prefix}{sort_field}", "first_name", "email")
 
     limit = min(max(limit, 1), 100)
+    if cursor is not None:
+        ordering = [
+            (sort_field, sort_direction == "dsc"),
+            ("first_name", False),
+            ("email", False),
+        ]
+        page = paginate_by_cursor(musicians, ordering, cursor, limit)
+        return MusicianSearchResultDTO(
+            total=musicians.count() if include_total else None,
+            data=MusicianDTO.from_models(page.rows),
+            next_cursor=page.next_cursor,
+        )
     offset = max(offset, 0)
     total = musicians.count()
     page = musicians[offset : offset + limit]
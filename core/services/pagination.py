@@ -0,0 +1,146 @@
+import json
+import base64
+import binascii
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Field, Model, Q, QuerySet
+
+# (field, descending) pairs describing a search ordering
+CursorOrdering = Sequence[Tuple[str, bool]]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class CursorPage(NamedTuple):
+    rows: List[Model]
+    next_cursor: Optional[str]
+
+
+def paginate_by_cursor(
+    queryset: QuerySet,
+    ordering: CursorOrdering,
+    cursor: Optional[str],
+    limit: int,
+) -> CursorPage:
+    """
+    Return the page of rows that follows the cursor using keyset pagination.
+
+    The ordering is made unique by appending the primary key, and nulls always
+    sort last so every row has a well defined successor. Instead of skipping
+    OFFSET rows, each page filters on the sort key of the last row it returned,
+    so deep pages cost the same as the first one.
+    """
+    keys = _unique_ordering(ordering)
+    queryset = queryset.order_by(
+        *(
+            F(field).desc(nulls_last=True)
+            if descending
+            else F(field).asc(nulls_last=True)
+            for field, descending in keys
+        )
+    )
+    if cursor:
+        values = _to_python(queryset, keys, decode_cursor(cursor, keys))
+        queryset = queryset.filter(_after_cursor(keys, values))
+
+    rows = list(queryset[: limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(
+            keys, [_get_value(rows[-1], field) for field, _ in keys]
+        )
+    return CursorPage(rows=rows, next_cursor=next_cursor)
+
+
+def encode_cursor(keys: CursorOrdering, values: List[Any]) -> str:
+    payload = json.dumps(
+        {"o": _ordering_signature(keys), "v": values},
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: CursorOrdering) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        signature, values = payload["o"], payload["v"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+    # A cursor is only meaningful for the ordering that produced it
+    if signature != _ordering_signature(keys) or len(values) != len(keys):
+        raise InvalidCursorError("Cursor does not match the requested sort")
+    return values
+
+
+def _to_python(
+    queryset: QuerySet, keys: CursorOrdering, values: List[Any]
+) -> List[Any]:
+    # Cursors come back from the client, so check each value against its field
+    # here rather than let the database reject it
+    try:
+        return [
+            None if value is None else _get_field(queryset, field).to_python(value)
+            for (field, _), value in zip(keys, values)
+        ]
+    except (ValidationError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+def _get_field(queryset: QuerySet, field: str) -> Field:
+    annotation = queryset.query.annotations.get(field)
+    if annotation is not None:
+        return annotation.output_field
+    model = queryset.model
+    *relations, name = field.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _unique_ordering(ordering: CursorOrdering) -> List[Tuple[str, bool]]:
+    keys = []
+    seen = set()
+    for field, descending in ordering:
+        if field in seen:
+            continue
+        seen.add(field)
+        keys.append((field, descending))
+    if "id" not in seen:
+        keys.append(("id", False))
+    return keys
+
+
+def _ordering_signature(keys: CursorOrdering) -> List[str]:
+    return [f"-{field}" if descending else field for field, descending in keys]
+
+
+def _after_cursor(keys: CursorOrdering, values: List[Any]) -> Q:
+    # (a, b, c) > (x, y, z)  <=>  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+    after = Q(pk__in=[])
+    equal = Q()
+    for (field, descending), value in zip(keys, values):
+        if value is not None:
+            # Nulls sort last, so they come after any non-null value
+            lookup = "lt" if descending else "gt"
+            after |= equal & (
+                Q(**{f"{field}__{lookup}": value}) | Q(**{f"{field}__isnull": True})
+            )
+            equal &= Q(**{field: value})
+        else:
+            equal &= Q(**{f"{field}__isnull": True})
+    return after
+
+
+def _get_value(row: Model, field: str) -> Any:
+    value = row
+    for attribute in field.split("__"):
+        if value is None:
+            return None
+        value = getattr(value, attribute)
+    return value
@@ -13,9 +13,7 @@ from core.dtos.programs import (
     ProgramChecklistDTO,
     ProgramSearchResultDTO,
 )
-from core.enum.music import PartAssetType
-from core.enum.status import UploadStatus
-from core.models.music import Piece, MusicianInstrument, Instrument
+from core.models.music import Piece, MusicianInstrument
 from core.models.organizations import Organization, Musician, SetupChecklist
 from core.models.users import User
 from core.models.programs import (
@@ -26,7 +24,10 @@ from core.models.programs import (
     ProgramMusicianInstrument,
     ProgramChecklist,
 )
-from core.enum.instruments import InstrumentEnum
+from core.enum.instruments import InstrumentEnum, get_instrument_mask
+from core.services.assignment_versions import bump_program_assignments_version
+from core.services.instruments import get_instrument_id
+from core.services.pagination import paginate_by_cursor
 
 
 @transaction.atomic
@@ -82,7 +83,10 @@ def get_program_checklist(organization_id: str, program_id: str) -> ProgramCheck
 def get_programs(organization_id: str) -> List[ProgramDTO]:
     programs = (
         Program.objects.filter(organization_id=organization_id)
-        .annotate(first_performance=Min("performances__date"))
+        .annotate(
+            first_performance=Min("performances__date"),
+            piece_count=Count("pieces", distinct=True),
+        )
         .order_by(F("first_performance").asc(nulls_last=True))
     )
     return ProgramDTO.from_models(programs)
@@ -94,6 +98,8 @@ def search_for_programs(
     limit: int = 25,
     offset: int = 0,
     sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> ProgramSearchResultDTO:
     programs = (
         Program.objects.filter(organization_id=organization_id)
@@ -128,6 +134,14 @@ def search_for_programs(
         programs = programs.order_by(f"{sort_prefix}{sort_field}", "name")
 
     limit = min(max(limit, 1), 100)
+    if cursor is not None:
+        ordering = [(sort_field, sort_direction == "dsc"), ("name", False)]
+        page = paginate_by_cursor(programs, ordering, cursor, limit)
+        return ProgramSearchResultDTO(
+            total=programs.count() if include_total else None,
+            data=ProgramDTO.from_models(page.rows),
+            next_cursor=page.next_cursor,
+        )
     offset = max(offset, 0)
     total = programs.count()
     page = programs[offset : offset + limit]
@@ -141,17 +155,7 @@ def get_pieces_for_program(organization_id: str, program_id: str) -> List[PieceD
     piece_ids = []
     for program_piece in program_pieces:
         piece_ids.append(program_piece.piece_id)
-    piece_models = Piece.objects.filter(id__in=piece_ids).annotate(
-        parts_count=Count("parts", distinct=True),
-        completed_parts=Count(
-            "parts",
-            filter=Q(
-                parts__assets__status=UploadStatus.UPLOADED.value,
-                parts__assets__asset_type=PartAssetType.CLEAN.value,
-            ),
-            distinct=True,
-        ),
-    )
+    piece_models = Piece.objects.filter(id__in=piece_ids).select_related("organization")
     return PieceDTO.from_models(piece_models)
 
 
@@ -202,6 +206,8 @@ def search_for_program_musicians(
     limit: int = 25,
     offset: int = 0,
     sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ) -> ProgramMusicianSearchResultDTO:
     musicians = ProgramMusician.objects.filter(
         program_id=program_id,
@@ -234,6 +240,17 @@ def search_for_program_musicians(
     musicians = musicians.order_by(sort_prefix + sort_field, "musician__first_name")
 
     limit = min(max(limit, 1), 100)
+    if cursor is not None:
+        ordering = [
+            (sort_field, sort_direction == "dsc"),
+            ("musician__first_name", False),
+        ]
+        page = paginate_by_cursor(musicians, ordering, cursor, limit)
+        return ProgramMusicianSearchResultDTO(
+            total=musicians.count() if include_total else None,
+            data=ProgramMusicianDTO.from_models(page.rows),
+            next_cursor=page.next_cursor,
+        )
     offset = max(offset, 0)
     total = musicians.count()
     page = musicians[offset : offset + limit]
@@ -268,6 +285,10 @@ def get_program_musician_instruments(
     return instruments
 
 
+def get_program_musician_instrument_mask(program_musician: ProgramMusician) -> int:
+    return get_instrument_mask(get_program_musician_instruments(program_musician))
+
+
 def add_musician_to_program(
     organization_id: str,
     program_id: str,
@@ -342,11 +363,11 @@ def add_program_musician_instrument(
         return get_musicians_for_program(
             organization_id=organization_id, program_id=program.id
         )
-    instrument_model = Instrument.objects.filter(name=instrument.value).first()
-    if instrument_model:
+    instrument_id = get_instrument_id(instrument)
+    if instrument_id:
         ProgramMusicianInstrument.objects.get_or_create(
             program_musician=program_musician,
-            instrument=instrument_model,
+            instrument_id=instrument_id,
         )
     return get_musicians_for_program(
         organization_id=organization_id, program_id=program.id
@@ -367,11 +388,11 @@ def remove_program_musician_instrument(
         return get_musicians_for_program(
             organization_id=organization_id, program_id=program.id
         )
-    instrument_model = Instrument.objects.filter(name=instrument.value).first()
-    if instrument_model:
+    instrument_id = get_instrument_id(instrument)
+    if instrument_id:
         ProgramMusicianInstrument.objects.filter(
             program_musician=program_musician,
-            instrument=instrument_model,
+            instrument_id=instrument_id,
         ).delete()
     return get_musicians_for_program(
         organization_id=organization_id, program_id=program.id
@@ -638,5 +659,6 @@ def add_musicians_to_program(
         program_musician_instruments,
         unique_fields=["program_musician_id", "instrument_id"],
     )
+    bump_program_assignments_version([program_id])
 
     return ProgramMusicianDTO.from_models(saved_program_musicians)
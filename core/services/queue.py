@@ -1,4 +1,6 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 from botocore.config import Config
@@ -16,6 +18,16 @@ logger = logging.getLogger(__name__)
 _sqs_client = None
 _queue_url = None
 
+# SQS accepts at most 10 entries per batch call
+SQS_MAX_BATCH_SIZE = 10
+EMAIL_QUEUE_SEND_WORKERS = 4
+EMAIL_QUEUE_SEND_ATTEMPTS = 3
+EMAIL_QUEUE_RETRY_DELAY_SECONDS = 0.2
+
+
+class EmailQueueError(RuntimeError):
+    """Raised when queue entries are still failing after every retry."""
+
 
 def get_sqs_client():
     global _sqs_client
@@ -53,34 +65,168 @@ def get_email_queue_url() -> str:
         return _queue_url
 
 
-def enqueue_email_payload(
-    payload: EmailQueuePayloadDTO,
-) -> str:
-    body = payload.model_dump_json()
-    queue_url = get_email_queue_url()
-    response = get_sqs_client().send_message(QueueUrl=queue_url, MessageBody=body)
-    message_id = response.get("MessageId")
-    logger.info("Enqueued email payload message_id=%s", message_id)
-    return message_id
+def enqueue_email_payloads(payloads: list[EmailQueuePayloadDTO]) -> list[str]:
+    """Enqueue many payloads with SendMessageBatch, 10 entries per call.
+
+    Batches are sent in parallel over a small thread pool. Entries that a batch
+    response reports as failed are retried on their own; sender faults are not
+    retried since resending cannot fix them.
+
+    Returns:
+        Message IDs in the order of `payloads`.
 
+    Raises:
+        EmailQueueError: If any entry could not be enqueued.
+    """
+    if not payloads:
+        return []
 
-def receive_email_messages(max_number: int = 10, wait_time: int = 20):
+    # Resolve the shared client and URL before fanning out to threads
+    client = get_sqs_client()
+    queue_url = get_email_queue_url()
+    batches = [
+        {
+            str(index): payload.model_dump_json()
+            for index, payload in enumerate(
+                payloads[start : start + SQS_MAX_BATCH_SIZE], start=start
+            )
+        }
+        for start in range(0, len(payloads), SQS_MAX_BATCH_SIZE)
+    ]
+    if len(batches) == 1:
+        results = [_send_email_batch(client, queue_url, batches[0])]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(EMAIL_QUEUE_SEND_WORKERS, len(batches))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda batch: _send_email_batch(client, queue_url, batch),
+                    batches,
+                )
+            )
+
+    message_ids = {}
+    failures = {}
+    for sent, failed in results:
+        message_ids.update(sent)
+        failures.update(failed)
+    if failures:
+        raise EmailQueueError(
+            f"Failed to enqueue {len(failures)} of {len(payloads)} email payloads: "
+            + ", ".join(sorted(set(failures.values())))
+        )
+    logger.info("Enqueued %s email payloads in %s batches", len(payloads), len(batches))
+    return [message_ids[str(index)] for index in range(len(payloads))]
+
+
+def _send_email_batch(
+    client, queue_url: str, bodies: dict[str, str]
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Send one batch, retrying only the entries the response reports as failed.
+
+    Returns:
+        Message IDs and failure codes, both keyed by entry ID.
+    """
+    message_ids = {}
+    failures = {}
+    pending = dict(bodies)
+    for attempt in range(EMAIL_QUEUE_SEND_ATTEMPTS):
+        if attempt:
+            time.sleep(EMAIL_QUEUE_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+        response = client.send_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": entry_id, "MessageBody": body}
+                for entry_id, body in pending.items()
+            ],
+        )
+        for entry in response.get("Successful", []):
+            message_ids[entry["Id"]] = entry["MessageId"]
+            pending.pop(entry["Id"], None)
+            # A retried entry that now went through is no longer a failure
+            failures.pop(entry["Id"], None)
+
+        for entry in response.get("Failed", []):
+            failures[entry["Id"]] = entry.get("Code", "Unknown")
+            if entry.get("SenderFault"):
+                pending.pop(entry["Id"], None)
+        if not pending:
+            break
+        logger.warning(
+            "Retrying %s failed email queue entries (attempt %s)",
+            len(pending),
+            attempt + 1,
+        )
+    return message_ids, failures
+
+
+def receive_email_messages(
+    max_number: int = 10,
+    wait_time: int = 20,
+    visibility_timeout: int | None = None,
+):
     queue_url = get_email_queue_url()
+    params = {}
+    if visibility_timeout is not None:
+        params["VisibilityTimeout"] = visibility_timeout
     response = get_sqs_client().receive_message(
         QueueUrl=queue_url,
         MaxNumberOfMessages=max_number,
         WaitTimeSeconds=wait_time,
+        **params,
     )
     return response.get("Messages", [])
 
 
-def delete_email_message(receipt_handle: str):
-    queue_url = get_email_queue_url()
-    get_sqs_client().delete_message(
-        QueueUrl=queue_url,
-        ReceiptHandle=receipt_handle,
+def delete_email_messages(receipt_handles: list[str]) -> list[str]:
+    """Delete messages with DeleteMessageBatch, 10 per call.
+
+    Returns:
+        Receipt handles that could not be deleted.
+    """
+    return _receipt_handle_batches("delete_message_batch", receipt_handles)
+
+
+def change_email_messages_visibility(
+    receipt_handles: list[str], visibility_timeout: int
+) -> list[str]:
+    """Reset the visibility timeout of in-flight messages, 10 per call.
+
+    A timeout of 0 makes the messages visible to other consumers at once.
+
+    Returns:
+        Receipt handles whose visibility could not be changed.
+    """
+    return _receipt_handle_batches(
+        "change_message_visibility_batch",
+        receipt_handles,
+        VisibilityTimeout=visibility_timeout,
     )
 
 
+def _receipt_handle_batches(
+    operation: str, receipt_handles: list[str], **entry_params
+) -> list[str]:
+    client = get_sqs_client()
+    queue_url = get_email_queue_url()
+    failed = []
+    for start in range(0, len(receipt_handles), SQS_MAX_BATCH_SIZE):
+        batch = receipt_handles[start : start + SQS_MAX_BATCH_SIZE]
+        response = getattr(client, operation)(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(index), "ReceiptHandle": receipt_handle, **entry_params}
+                for index, receipt_handle in enumerate(batch)
+            ],
+        )
+        for entry in response.get("Failed", []):
+            logger.warning(
+                "SQS %s failed for an entry: %s", operation, entry.get("Code")
+            )
+            failed.append(batch[int(entry["Id"])])
+    return failed
+
+
 def parse_email_payload(raw_body: str) -> EmailQueuePayloadDTO:
     return EmailQueuePayloadDTO.model_validate_json(raw_body)
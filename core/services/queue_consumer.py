@@ -0,0 +1,531 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+
+from django.db import close_old_connections
+from pydantic import ValidationError
+
+from core.services.email_connections import (
+    close_pooled_email_connections,
+    get_email_connection_stats,
+    get_pooled_email_connection,
+)
+from core.services.notifications import (
+    prepare_notification_email,
+    record_notification_email_status,
+    send_notification_email,
+    send_prepared_email,
+)
+from core.services.queue import (
+    change_email_messages_visibility,
+    delete_email_messages,
+    parse_email_payload,
+    receive_email_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+EMAIL_STATS_LOG_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class _InFlightMessage:
+    receipt_handle: str | None
+    visible_at: float
+
+
+class EmailQueueConsumer:
+    """Poll the email queue and send notifications on a bounded thread pool.
+
+    The next batch is fetched while workers are still busy, so at most one
+    batch waits behind the running ones. Messages still being processed have
+    their visibility extended before it runs out, and finished messages are
+    deleted in batches. `stop()` stops polling and lets the running messages
+    finish; messages received but not started are released to other consumers.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_number: int = 10,
+        wait_time: int = 20,
+        sleep: float = 0.0,
+        visibility_timeout: int = 60,
+    ):
+        self.workers = workers
+        self.max_number = max_number
+        self.wait_time = wait_time
+        self.sleep = sleep
+        self.visibility_timeout = visibility_timeout
+        # Extend well before the timeout so a slow SQS call cannot let it lapse
+        self.heartbeat_interval = visibility_timeout / 2
+        self._stopping = threading.Event()
+        self._in_flight: dict[Future, _InFlightMessage] = {}
+        self._processed: list[str] = []
+        self._stats_logged_at = time.monotonic()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="email-worker"
+        )
+        poller = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-poll")
+        poll_future = None
+        try:
+            while True:
+                if (
+                    poll_future is None
+                    and not self._stopping.is_set()
+                    and len(self._in_flight) <= self.workers
+                ):
+                    poll_future = poller.submit(self._receive)
+                if poll_future is None and not self._in_flight:
+                    break
+
+                waiting = set(self._in_flight)
+                if poll_future is not None:
+                    waiting.add(poll_future)
+                done, _ = wait(
+                    waiting,
+                    timeout=min(self.heartbeat_interval, 1),
+                    return_when=FIRST_COMPLETED,
+                )
+
+                if poll_future in done:
+                    messages = poll_future.result()
+                    poll_future = None
+                    if self._stopping.is_set():
+                        self._release(messages)
+                    else:
+                        self._submit(executor, messages)
+                for future in done & self._in_flight.keys():
+                    message = self._in_flight.pop(future)
+                    if future.result() and message.receipt_handle:
+                        self._processed.append(message.receipt_handle)
+                if self._stopping.is_set():
+                    self._cancel_queued()
+
+                self._delete_processed()
+                self._extend_visibility()
+                self._stats_logged_at = _log_email_connection_stats(
+                    self._stats_logged_at
+                )
+        finally:
+            poller.shutdown(wait=False)
+            executor.shutdown(wait=True)
+            self._delete_processed()
+            close_pooled_email_connections()
+            _log_email_connection_stats()
+
+    def _receive(self) -> list[dict]:
+        try:
+            messages = receive_email_messages(
+                max_number=self.max_number,
+                wait_time=self.wait_time,
+                visibility_timeout=self.visibility_timeout,
+            )
+        except Exception:
+            logger.exception("Failed to poll SQS queue")
+            messages = []
+        if not messages and self.sleep > 0:
+            self._stopping.wait(self.sleep)
+        return messages
+
+    def _submit(self, executor: ThreadPoolExecutor, messages: list[dict]) -> None:
+        received_at = time.monotonic()
+        for message in messages:
+            raw_body = message.get("Body", "{}")
+            future = executor.submit(process_email_message, raw_body)
+            self._in_flight[future] = _InFlightMessage(
+                receipt_handle=message.get("ReceiptHandle"),
+                visible_at=received_at + self.visibility_timeout,
+            )
+
+    def _cancel_queued(self) -> None:
+        cancelled = [future for future in self._in_flight if future.cancel()]
+        self._release(
+            [
+                {"ReceiptHandle": self._in_flight.pop(future).receipt_handle}
+                for future in cancelled
+            ]
+        )
+
+    def _release(self, messages: list[dict]) -> None:
+        receipt_handles = [
+            message["ReceiptHandle"]
+            for message in messages
+            if message.get("ReceiptHandle")
+        ]
+        if receipt_handles:
+            try:
+                change_email_messages_visibility(receipt_handles, 0)
+            except Exception:
+                logger.exception("Failed to release unprocessed email messages")
+
+    def _delete_processed(self) -> None:
+        if not self._processed:
+            return
+        receipt_handles, self._processed = self._processed, []
+        try:
+            delete_email_messages(receipt_handles)
+        except Exception:
+            # The messages become visible again and are sent a second time,
+            # which the notification dedupe ignores.
+            logger.exception("Failed to delete processed email messages")
+
+    def _extend_visibility(self) -> None:
+        now = time.monotonic()
+        expiring = [
+            message
+            for message in self._in_flight.values()
+            if message.receipt_handle
+            and message.visible_at - now <= self.heartbeat_interval
+        ]
+        if not expiring:
+            return
+        try:
+            failed = set(
+                change_email_messages_visibility(
+                    [message.receipt_handle for message in expiring],
+                    self.visibility_timeout,
+                )
+            )
+        except Exception:
+            logger.exception("Failed to extend email message visibility")
+            return
+        for message in expiring:
+            if message.receipt_handle not in failed:
+                message.visible_at = now + self.visibility_timeout
+
+
+def process_email_message(raw_body: str) -> bool:
+    """Send the notification for one queue message.
+
+    Returns:
+        Whether the message should be deleted: it was sent, or it can never be.
+    """
+    try:
+        payload = parse_email_payload(raw_body)
+        send_notification_email(
+            organization_id=payload.organization_id,
+            program_id=payload.program_id,
+            musician_id=payload.musician_id,
+            notification_type=payload.notification_type,
+            connection=get_pooled_email_connection(),
+        )
+        return True
+    except (ValueError, ValidationError):
+        logger.exception("Invalid email payload: %s", raw_body)
+        return True
+    except Exception:
+        logger.exception("Failed to process email message")
+        return False
+    finally:
+        # Worker threads keep their own database connections
+        close_old_connections()
+
+
+class AsyncEmailQueueConsumer:
+    """Poll the email queue and send notifications from one event loop.
+
+    Polling, sending and bookkeeping are coroutines. Database work (loading
+    recipients, rendering, saving the Notification) runs on a bounded thread
+    executor and SMTP delivery on a separate one, so slow mail servers do not
+    hold database connections. Backpressure comes from two caps: at most
+    `max_in_flight` messages are being sent, and polling pauses while
+    `max_pending` received messages wait for a send slot.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 50,
+        max_pending: int = 20,
+        db_workers: int = 4,
+        max_number: int = 10,
+        wait_time: int = 20,
+        sleep: float = 0.0,
+        visibility_timeout: int = 60,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.db_workers = db_workers
+        self.max_number = max_number
+        self.wait_time = wait_time
+        self.sleep = sleep
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = visibility_timeout / 2
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_requested = False
+        self._changed: asyncio.Condition | None = None
+        # Visibility deadlines of every received message not yet finished
+        self._received: dict[str, float] = {}
+        self._started: set[str] = set()
+        self._processed: list[str] = []
+        self._stats_logged_at = time.monotonic()
+
+    def stop(self) -> None:
+        """Stop polling and drain; safe to call from signal handlers and threads."""
+        self._stop_requested = True
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(
+                lambda: self._loop.create_task(self._notify())
+            )
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Condition()
+        pending: asyncio.Queue[dict] = asyncio.Queue(maxsize=self.max_pending)
+        sends = asyncio.Semaphore(self.max_in_flight)
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=self.db_workers, thread_name_prefix="email-db"
+        )
+        self._smtp_executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="email-smtp"
+        )
+        # One thread for the long poll, one for deletes and heartbeats
+        self._sqs_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="email-sqs"
+        )
+        tasks: set[asyncio.Task] = set()
+
+        receiver = asyncio.create_task(self._receive_loop(pending))
+        dispatcher = asyncio.create_task(self._dispatch_loop(pending, sends, tasks))
+        housekeeping = asyncio.create_task(self._housekeeping_loop())
+        try:
+            await receiver
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+            await self._release(
+                [
+                    receipt_handle
+                    for receipt_handle in self._received
+                    if receipt_handle not in self._started
+                ]
+            )
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            housekeeping.cancel()
+            await asyncio.gather(housekeeping, return_exceptions=True)
+            await self._delete_processed()
+            for executor in (
+                self._db_executor,
+                self._smtp_executor,
+                self._sqs_executor,
+            ):
+                executor.shutdown(wait=True)
+            close_pooled_email_connections()
+            _log_email_connection_stats()
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _receive_loop(self, pending: asyncio.Queue) -> None:
+        while not self._stop_requested:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: self._stop_requested or not pending.full()
+                )
+            if self._stop_requested:
+                return
+
+            # Only this task adds to the queue, so the poll never overfills it
+            max_number = min(self.max_number, self.max_pending - pending.qsize())
+            messages = await self._loop.run_in_executor(
+                self._sqs_executor, self._receive, max_number
+            )
+            received_at = time.monotonic()
+            for message in messages:
+                receipt_handle = message.get("ReceiptHandle")
+                if receipt_handle:
+                    self._received[receipt_handle] = (
+                        received_at + self.visibility_timeout
+                    )
+                pending.put_nowait(message)
+            if not messages and self.sleep > 0:
+                async with self._changed:
+                    try:
+                        await asyncio.wait_for(
+                            self._changed.wait_for(lambda: self._stop_requested),
+                            self.sleep,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+
+    def _receive(self, max_number: int) -> list[dict]:
+        try:
+            return receive_email_messages(
+                max_number=max_number,
+                wait_time=self.wait_time,
+                visibility_timeout=self.visibility_timeout,
+            )
+        except Exception:
+            logger.exception("Failed to poll SQS queue")
+            return []
+
+    async def _dispatch_loop(
+        self,
+        pending: asyncio.Queue,
+        sends: asyncio.Semaphore,
+        tasks: set[asyncio.Task],
+    ) -> None:
+        while True:
+            await sends.acquire()
+            try:
+                message = await pending.get()
+            except asyncio.CancelledError:
+                sends.release()
+                raise
+            if message.get("ReceiptHandle"):
+                self._started.add(message["ReceiptHandle"])
+            await self._notify()
+            task = asyncio.create_task(self._process(message, sends))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def _process(self, message: dict, sends: asyncio.Semaphore) -> None:
+        receipt_handle = message.get("ReceiptHandle")
+        raw_body = message.get("Body", "{}")
+        try:
+            delete = await self._send(raw_body)
+        finally:
+            sends.release()
+            if receipt_handle:
+                self._received.pop(receipt_handle, None)
+                self._started.discard(receipt_handle)
+        if delete and receipt_handle:
+            self._processed.append(receipt_handle)
+
+    async def _send(self, raw_body: str) -> bool:
+        """Returns whether the message should be deleted."""
+        try:
+            payload = parse_email_payload(raw_body)
+        except (ValueError, ValidationError):
+            logger.exception("Invalid email payload: %s", raw_body)
+            return True
+
+        try:
+            prepared = await self._run_db(
+                partial(
+                    prepare_notification_email,
+                    organization_id=payload.organization_id,
+                    program_id=payload.program_id,
+                    musician_id=payload.musician_id,
+                    notification_type=payload.notification_type,
+                )
+            )
+            if prepared is not None:
+                success = await self._loop.run_in_executor(
+                    self._smtp_executor, _send_with_pooled_connection, prepared
+                )
+                await self._run_db(
+                    partial(record_notification_email_status, prepared, success)
+                )
+            return True
+        except ValueError:
+            logger.exception("Invalid email payload: %s", raw_body)
+            return True
+        except Exception:
+            logger.exception("Failed to process email message")
+            return False
+
+    async def _run_db(self, func):
+        return await self._loop.run_in_executor(
+            self._db_executor, partial(_run_with_connection_cleanup, func)
+        )
+
+    async def _housekeeping_loop(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.heartbeat_interval, 1))
+            await self._delete_processed()
+            await self._extend_visibility()
+            self._stats_logged_at = _log_email_connection_stats(self._stats_logged_at)
+
+    async def _delete_processed(self) -> None:
+        if not self._processed:
+            return
+        receipt_handles, self._processed = self._processed, []
+        try:
+            await self._loop.run_in_executor(
+                self._sqs_executor, delete_email_messages, receipt_handles
+            )
+        except Exception:
+            logger.exception("Failed to delete processed email messages")
+
+    async def _extend_visibility(self) -> None:
+        now = time.monotonic()
+        expiring = [
+            receipt_handle
+            for receipt_handle, visible_at in self._received.items()
+            if visible_at - now <= self.heartbeat_interval
+        ]
+        if not expiring:
+            return
+        try:
+            failed = set(
+                await self._loop.run_in_executor(
+                    self._sqs_executor,
+                    change_email_messages_visibility,
+                    expiring,
+                    self.visibility_timeout,
+                )
+            )
+        except Exception:
+            logger.exception("Failed to extend email message visibility")
+            return
+        for receipt_handle in expiring:
+            if receipt_handle in self._received and receipt_handle not in failed:
+                self._received[receipt_handle] = now + self.visibility_timeout
+
+    async def _release(self, receipt_handles: list[str]) -> None:
+        for receipt_handle in receipt_handles:
+            self._received.pop(receipt_handle, None)
+        if not receipt_handles:
+            return
+        try:
+            await self._loop.run_in_executor(
+                self._sqs_executor, change_email_messages_visibility, receipt_handles, 0
+            )
+        except Exception:
+            logger.exception("Failed to release unprocessed email messages")
+
+
+def _run_with_connection_cleanup(func):
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+def _send_with_pooled_connection(prepared) -> bool:
+    return send_prepared_email(prepared, connection=get_pooled_email_connection())
+
+
+def _log_email_connection_stats(logged_at: float | None = None) -> float:
+    """Log send latency and SMTP connection counts, at most once per interval.
+
+    Returns:
+        When the stats were last logged.
+    """
+    now = time.monotonic()
+    if logged_at is not None and now - logged_at < EMAIL_STATS_LOG_INTERVAL_SECONDS:
+        return logged_at
+    stats = get_email_connection_stats()
+    logger.info(
+        "Email sends: %s sent, %s failed, %.3fs average, %.3fs max; "
+        "%s SMTP connections opened, %s reconnects",
+        stats.messages_sent,
+        stats.send_failures,
+        stats.average_send_seconds,
+        stats.max_send_seconds,
+        stats.connections_opened,
+        stats.reconnects,
+    )
+    return now
@@ -1,7 +1,28 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.dispatch import receiver
-from core.models.organizations import Organization
-from core.models.music import PartAsset
+from core.enum.notifications import MagicLinkType
+from core.models.notifications import MagicLink
+from core.models.organizations import Musician, Organization
+from core.models.music import (
+    Instrument,
+    MusicianInstrument,
+    Part,
+    PartAsset,
+    PartInstrument,
+)
+from core.models.programs import (
+    ProgramChecklist,
+    ProgramMusician,
+    ProgramMusicianInstrument,
+    ProgramPiece,
+)
+from core.services.assignment_versions import (
+    bump_musician_assignments_version,
+    bump_piece_assignments_version,
+    bump_program_assignment_links_version,
+    bump_program_assignments_version,
+)
+from core.services.instruments import clear_instrument_registry
 from core.services.s3 import upsert_bucket_for_organization, delete_file
 
 
@@ -19,3 +40,88 @@ def delete_part_asset(sender, instance: PartAsset, **kwargs):
         return
 
     delete_file(str(instance.piece.organization.id), instance.file_key)
+
+
+@receiver(post_save, sender=Instrument)
+@receiver(post_delete, sender=Instrument)
+@receiver(post_migrate)
+def reset_instrument_registry(sender, **kwargs):
+    # Instruments are cached per process; reload them after the table changes
+    clear_instrument_registry()
+
+
+# Assignment status is cached per program version; bump the version whenever a
+# row it is built from changes. Bulk writes that skip signals bump it directly,
+# and ProgramPartMusician rows are only written by set_program_part_assignments,
+# which bumps once per batch.
+@receiver(post_save, sender=ProgramMusician)
+@receiver(post_delete, sender=ProgramMusician)
+@receiver(post_save, sender=ProgramPiece)
+@receiver(post_delete, sender=ProgramPiece)
+@receiver(post_save, sender=ProgramChecklist)
+def program_assignments_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    if instance.program_id:
+        bump_program_assignments_version([instance.program_id])
+
+
+@receiver(post_save, sender=ProgramMusicianInstrument)
+@receiver(post_delete, sender=ProgramMusicianInstrument)
+def program_musician_instrument_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_program_assignments_version(
+        ProgramMusician.objects.filter(id=instance.program_musician_id).values(
+            "program_id"
+        )
+    )
+
+
+@receiver(post_save, sender=Part)
+@receiver(post_delete, sender=Part)
+def part_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_piece_assignments_version([instance.piece_id])
+
+
+@receiver(post_save, sender=PartInstrument)
+@receiver(post_delete, sender=PartInstrument)
+def part_instrument_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_piece_assignments_version(
+        Part.objects.filter(id=instance.part_id).values("piece_id")
+    )
+
+
+@receiver(post_save, sender=Musician)
+def musician_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_musician_assignments_version([instance.id])
+
+
+@receiver(post_save, sender=MusicianInstrument)
+@receiver(post_delete, sender=MusicianInstrument)
+def musician_instrument_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    bump_musician_assignments_version([instance.musician_id])
+
+
+@receiver(post_save, sender=MagicLink)
+@receiver(post_delete, sender=MagicLink)
+def assignment_magic_link_changed(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+
+    if instance.type == MagicLinkType.ASSIGNMENT.value and instance.program_id:
+        bump_program_assignment_links_version([instance.program_id])
@@ -1,7 +1,15 @@
 import os
+import re
+import unicodedata
 from rest_framework import serializers
 from email_validator import validate_email, EmailNotValidError
 
+# Letters that do not decompose into a base letter plus combining marks
+SEARCH_TRANSLITERATIONS = str.maketrans(
+    {"ø": "o", "ł": "l", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe", "þ": "th"}
+)
+SEARCH_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
+
 
 def get_file_extension(filename: str) -> str:
     """Get the file extension from a filename."""
@@ -33,3 +41,15 @@ def is_integer(s):
         return True
     except ValueError:
         return False
+
+
+def normalize_search_text(text: str) -> str:
+    """
+    Fold text into the accent-insensitive form used for search.
+
+    Example: "Dvořák: Symphony No. 9" -> "dvorak symphony no 9"
+    """
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.translate(SEARCH_TRANSLITERATIONS)
+    return SEARCH_SEPARATOR_PATTERN.sub(" ", text).strip()
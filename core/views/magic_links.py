@@ -39,6 +39,7 @@ def assignment_magic_link_view(request, token: str):
     payload = get_assignment_payload(
         program_id=str(magic_link.program_id),
         principal_musician_id=str(magic_link.musician_id),
+        include_suggestions=True,
     )
     context = {
         "magic_token": token,
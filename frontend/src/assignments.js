@@ -32,6 +32,7 @@ export function programAssignments(
     principalStatusSectionOpen: true,
     tagifyInstances: new Map(),
     rootEl: null,
+    watchingEvents: false,
     init() {
       this.rootEl = this.$el;
       if (!this._checklistRefreshListener) {
@@ -56,6 +57,7 @@ export function programAssignments(
       }
       this.fetchChecklist();
       this.fetchAssignments();
+      this.watchAssignmentEvents();
     },
     musicianLabel(musician) {
       const fullName = `${musician.first_name} ${musician.last_name}`.trim();
@@ -282,6 +284,95 @@ export function programAssignments(
         this.loadingStatus = false;
       }
     },
+    applyPartChange(pieceId, changedPart, pieceAllAssigned) {
+      const piece = (this.statusPayload.pieces || []).find((p) => p.id === pieceId);
+      if (piece) {
+        piece.parts = piece.parts.map((part) => (part.id === changedPart.id ? changedPart : part));
+        piece.all_assigned = pieceAllAssigned;
+      }
+    },
+    applyPrincipalStatuses(principals) {
+      for (const principal of principals || []) {
+        const index = this.statusPayload.principals.findIndex((p) => p.id === principal.id);
+        if (index >= 0) {
+          this.statusPayload.principals[index] = principal;
+        }
+      }
+    },
+    applyAssignmentDelta(delta) {
+      this.applyPartChange(delta.piece_id, delta.part, delta.piece_all_assigned);
+      this.applyPrincipalStatuses(delta.principals);
+      this.statusPayload.summary = delta.summary;
+      this.statusPayload.version = delta.version;
+    },
+    applyAssignmentEvent(event) {
+      if (event.type === "Assignments") {
+        // Our own saves come back as events too; they are already applied.
+        if (event.version <= this.statusPayload.version) return true;
+        if (event.previous_version !== this.statusPayload.version || !event.summary) {
+          return false;
+        }
+        for (const change of event.parts || []) {
+          this.applyPartChange(change.piece_id, change.part, change.piece_all_assigned);
+        }
+        this.applyPrincipalStatuses(event.principals);
+        this.statusPayload.summary = event.summary;
+        this.statusPayload.version = event.version;
+        if ((event.parts || []).length) this.resetTagify();
+        return true;
+      }
+
+      const principal = this.statusPayload.principals.find((p) => p.id === event.musician_id);
+      if (principal) {
+        principal.link_accessed = true;
+        if (event.type === "Link Completed") {
+          principal.completed_on = event.occurred_on;
+          if (principal.status !== "Not Sent") principal.status = "Completed";
+        } else {
+          principal.last_accessed_on = event.occurred_on;
+          if (principal.status === "Sent") principal.status = "Accessed";
+        }
+      }
+      this.statusPayload.links_version = Math.max(
+        this.statusPayload.links_version || 0,
+        event.links_version
+      );
+      return true;
+    },
+    async watchAssignmentEvents() {
+      if (this.watchingEvents) return;
+      this.watchingEvents = true;
+      while (this.rootEl?.isConnected) {
+        if (this.loadingStatus || this.statusPayload.version == null) {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          continue;
+        }
+        try {
+          const params = new URLSearchParams({
+            version: this.statusPayload.version,
+            links_version: this.statusPayload.links_version || 0,
+          });
+          const response = await fetch(
+            `/api/programs/${this.programId}/assignments/events?${params}`,
+            { headers: { Accept: "application/json" } }
+          );
+          if (!response.ok) {
+            throw new Error("Failed to fetch assignment events");
+          }
+          const data = await response.json();
+          const applied = !data.reload && data.events.every((event) => this.applyAssignmentEvent(event));
+          if (!applied) {
+            await this.fetchAssignments();
+          } else if (!data.events.length) {
+            // Free the server worker between empty polls.
+            await new Promise((resolve) => setTimeout(resolve, 2000));
+          }
+        } catch (error) {
+          await new Promise((resolve) => setTimeout(resolve, 5000));
+        }
+      }
+      this.watchingEvents = false;
+    },
     async savePartAssignment(partId, musicianId) {
       this.savingAssignmentPartId = partId;
       this.saveError = null;
@@ -303,7 +394,13 @@ export function programAssignments(
           const data = await response.json().catch(() => ({}));
           throw new Error(data?.detail || "Failed to save assignment");
         }
-        this.statusPayload = await response.json();
+        const delta = await response.json();
+        if (delta.previous_version !== this.statusPayload.version) {
+          // Another change landed since our last load; reload everything.
+          await this.fetchAssignments();
+          return;
+        }
+        this.applyAssignmentDelta(delta);
       } catch (error) {
         this.saveError = error?.message || "Unable to save assignment right now.";
       } finally {
@@ -404,12 +501,26 @@ export function magicAssignments(token, initialPayload = null) {
       }
       return null;
     },
-    whitelist() {
-      return (this.payload?.eligible_musicians || []).map((musician) => ({
+    whitelist(part = null) {
+      // Musicians who held this chair in past programs are listed first.
+      const suggested = part?.suggested_musician_ids || [];
+      const musicians = [...(this.payload?.eligible_musicians || [])].sort(
+        (a, b) =>
+          (suggested.includes(a.id) ? suggested.indexOf(a.id) : suggested.length) -
+          (suggested.includes(b.id) ? suggested.indexOf(b.id) : suggested.length)
+      );
+      return musicians.map((musician) => ({
         value: this.musicianLabel(musician),
         id: musician.id,
       }));
     },
+    suggestedNames(part) {
+      return (part?.suggested_musician_ids || [])
+        .map((musicianId) => this.getMusicianById(musicianId))
+        .filter(Boolean)
+        .map((musician) => `${musician.first_name} ${musician.last_name}`.trim())
+        .join(", ");
+    },
     resetTagify() {
       this.tagifyInstances.forEach((instance, input) => {
         instance.destroy();
@@ -424,13 +535,13 @@ export function magicAssignments(token, initialPayload = null) {
       const scope = this.rootEl || this.$root || this.$el;
       if (!scope) return;
       const inputs = scope.querySelectorAll(".assignment-musician-input");
-      const whitelist = this.whitelist();
       inputs.forEach((input) => {
         if (input._tagify || input.dataset.tagifyInitialized === "true") return;
         const partId = input.dataset.partId;
-        const initial = this.assignmentValue(this.getPartById(partId));
+        const part = this.getPartById(partId);
+        const initial = this.assignmentValue(part);
         const tagify = new Tagify(input, {
-          whitelist,
+          whitelist: this.whitelist(part),
           enforceWhitelist: true,
           maxTags: 1,
           dropdown: { enabled: 0, closeOnSelect: true },
@@ -479,7 +590,18 @@ export function magicAssignments(token, initialPayload = null) {
           const data = await response.json().catch(() => ({}));
           throw new Error(data?.detail || "Failed to save assignment");
         }
-        this.payload = await response.json();
+        const delta = await response.json();
+        if (delta.previous_version !== this.payload.version) {
+          // Another change landed since our last load; reload everything.
+          await this.refresh();
+          return;
+        }
+        const piece = (this.payload.pieces || []).find((p) => p.id === delta.piece_id);
+        if (piece) {
+          piece.parts = piece.parts.map((part) => (part.id === delta.part.id ? delta.part : part));
+        }
+        this.payload.all_assigned = delta.all_assigned;
+        this.payload.version = delta.version;
       } catch (error) {
         this.saveError = error?.message || "Unable to save assignment.";
       } finally {
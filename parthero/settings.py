@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "core.apps.CoreConfig",
     "rest_framework",
 ]
@@ -172,3 +173,42 @@ MAGIC_LINK_DEFAULT_EXPIRATION_DAYS = int(
 DOWNLOAD_URL_EXPIRATION_SECONDS = int(
     os.environ.get("DOWNLOAD_URL_EXPIRATION_SECONDS", "600")
 )
+
+# Cache settings. Local memory by default; point CACHE_BACKEND at a shared
+# backend (e.g. Redis) to share cached payloads between processes.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+PROGRAM_ASSIGNMENT_STATUS_CACHE_TIMEOUT = int(
+    os.environ.get("PROGRAM_ASSIGNMENT_STATUS_CACHE_TIMEOUT", "3600")
+)
+
+# Live assignment progress. "memory" only reaches long-poll requests served by
+# the process that made the change; use "postgres" (LISTEN/NOTIFY) when running
+# several workers. Each open program page keeps one long-poll in flight, which
+# holds a sync gunicorn worker for up to the max wait, so keep it short unless
+# gunicorn runs an async worker class (see docker-compose.yml).
+ASSIGNMENT_EVENTS_BACKEND = os.environ.get("ASSIGNMENT_EVENTS_BACKEND", "memory")
+ASSIGNMENT_EVENTS_MAX_WAIT_SECONDS = int(
+    os.environ.get("ASSIGNMENT_EVENTS_MAX_WAIT_SECONDS", "5")
+)
+
+# Pooled SMTP connections used by the email queue consumer. Each worker reuses
+# its connection and opens a new one after this many messages or seconds.
+EMAIL_CONNECTION_MAX_MESSAGES = int(
+    os.environ.get("EMAIL_CONNECTION_MAX_MESSAGES", "100")
+)
+EMAIL_CONNECTION_MAX_AGE_SECONDS = int(
+    os.environ.get("EMAIL_CONNECTION_MAX_AGE_SECONDS", "300")
+)
+
+# Seconds a queue consumer reuses a program's email context (program,
+# organization and pieces) across the messages of one fan-out.
+NOTIFICATION_CONTEXT_CACHE_SECONDS = int(
+    os.environ.get("NOTIFICATION_CONTEXT_CACHE_SECONDS", "60")
+)
@@ -27,3 +27,6 @@ DATABASES = {
         },
     }
 }
+
+# Fail tests when a batch DTO conversion lazy-loads a relation
+DTO_STRICT_QUERIES = True
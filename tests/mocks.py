@@ -1,3 +1,6 @@
+import smtplib
+
+from django.core.mail.backends.base import BaseEmailBackend
 from faker import Faker
 from core.services.organizations import (
     create_organization as service_create_organization,
@@ -10,3 +13,31 @@ faker = Faker()
 def create_organization():
     organization = service_create_organization(name=faker.company())
     return OrganizationDTO.from_model(organization)
+
+
+class FakeSMTP:
+    def __init__(self):
+        self.noop_code = 250
+
+    def noop(self):
+        return (self.noop_code, b"OK")
+
+
+class FakeEmailBackend(BaseEmailBackend):
+    opened = []
+
+    def open(self):
+        self.connection = FakeSMTP()
+        self.disconnected = False
+        self.sent = []
+        FakeEmailBackend.opened.append(self)
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, email_messages):
+        if self.disconnected:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.extend(email_messages)
+        return len(email_messages)
@@ -1,11 +1,37 @@
+import threading
+import time
+import uuid
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
 
 from core.enum.instruments import InstrumentEnum
 from core.models.music import Instrument, Part, PartInstrument, Piece
-from core.models.programs import ProgramPiece
-from core.services.assignments import get_assignment_payload
+from core.models.programs import (
+    PartAssignmentHistory,
+    ProgramPartMusician,
+    ProgramPiece,
+)
+from core.services.assignment_history import get_part_assignment_history
+from core.services import assignments
+from core.services.assignments import (
+    ProgramAssignmentSnapshot,
+    assign_program_part,
+    assign_program_parts_by_librarian,
+    auto_assign_program_parts,
+    get_assignment_payload,
+    propose_program_part_assignments,
+    set_program_part_assignments,
+)
+from core.services.matching import solve_assignment
 from core.services.organizations import create_musician
-from core.services.programs import add_musician_to_program, create_program
+from core.services.programs import (
+    add_musician_to_program,
+    add_program_musician_instrument,
+    create_program,
+)
 from tests.mocks import create_organization
 
 pytestmark = pytest.mark.django_db
@@ -183,3 +209,328 @@ def test_assignment_payload_includes_timpani_for_percussion_principal():
 
     part_names = {part.display_name for p in payload.pieces for part in p.parts}
     assert any("Timpani" in part_name for part_name in part_names)
+
+
+def test_solve_assignment_prefers_full_matching_over_weight():
+    weights = [
+        [10, 9],
+        [None, 1],
+    ]
+    assert solve_assignment(weights) == [(0, 0), (1, 1)]
+    assert solve_assignment([[None, 3, 5]]) == [(0, 2)]
+    assert solve_assignment([[None], [None]]) == []
+
+
+def test_auto_assign_fills_winds_by_chair_and_doubling_without_overwriting():
+    organization = create_organization()
+    organization_id = str(organization.id)
+    program = create_program(
+        organization_id=organization_id,
+        name="Matching Program",
+        performance_dates=[],
+    )
+
+    def add(first_name, principal, instrument, program_instruments=()):
+        musician = create_musician(
+            organization_id=organization_id,
+            first_name=first_name,
+            last_name="Player",
+            email=f"{first_name.lower()}-matching@example.com",
+            principal=principal,
+            core_member=True,
+            primary_instrument=instrument,
+            secondary_instruments=[],
+        )
+        program_musicians = add_musician_to_program(
+            organization_id, str(program.id), str(musician.id)
+        )
+        program_musician = next(
+            pm for pm in program_musicians if pm.musician_id == str(musician.id)
+        )
+        for program_instrument in program_instruments:
+            add_program_musician_instrument(
+                organization_id,
+                str(program.id),
+                program_musician.id,
+                program_instrument,
+            )
+        return str(musician.id)
+
+    # Alphabetical seating order alone would put Abe on the first chair.
+    abe = add("Abe", False, InstrumentEnum.FLUTE, [InstrumentEnum.PICCOLO])
+    zoe = add("Zoe", True, InstrumentEnum.FLUTE)
+    oboist = add("Olive", True, InstrumentEnum.OBOE)
+    hornist = add("Hal", True, InstrumentEnum.FRENCH_HORN)
+
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Matching Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+    flute_1 = _create_part(str(piece.id), InstrumentEnum.FLUTE)
+    flute_2 = _create_part(str(piece.id), InstrumentEnum.FLUTE)
+    Part.objects.filter(id=flute_1).update(number=1)
+    Part.objects.filter(id=flute_2).update(number=2)
+    PartInstrument.objects.create(
+        part_id=flute_2,
+        instrument=Instrument.objects.get(name=InstrumentEnum.PICCOLO.value),
+        primary=False,
+    )
+    oboe = _create_part(str(piece.id), InstrumentEnum.OBOE)
+    horn = _create_part(str(piece.id), InstrumentEnum.FRENCH_HORN)
+    tuba = _create_part(str(piece.id), InstrumentEnum.TUBA)
+    ProgramPartMusician.objects.create(
+        program_id=program.id, part_id=horn, musician_id=oboist
+    )
+
+    proposal = propose_program_part_assignments(str(program.id))
+    assert proposal == {flute_1: zoe, flute_2: abe}
+
+    assert auto_assign_program_parts(str(program.id)) == 2
+    assignments = {
+        str(part_id): str(musician_id)
+        for part_id, musician_id in ProgramPartMusician.objects.filter(
+            program_id=program.id
+        ).values_list("part_id", "musician_id")
+    }
+    assert assignments == {flute_1: zoe, flute_2: abe, horn: oboist}
+    assert oboe not in assignments
+    assert tuba not in assignments
+    assert hornist not in assignments.values()
+
+
+def test_auto_assign_reports_only_parts_it_wrote(monkeypatch):
+    organization = create_organization()
+    organization_id = str(organization.id)
+    program = create_program(
+        organization_id=organization_id,
+        name="Race Program",
+        performance_dates=[],
+    )
+    flutists = []
+    for first_name in ("Ann", "Ben"):
+        musician = create_musician(
+            organization_id=organization_id,
+            first_name=first_name,
+            last_name="Player",
+            email=f"{first_name.lower()}-race@example.com",
+            principal=False,
+            core_member=True,
+            primary_instrument=InstrumentEnum.FLUTE,
+            secondary_instruments=[],
+        )
+        add_musician_to_program(organization_id, str(program.id), str(musician.id))
+        flutists.append(str(musician.id))
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Race Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+    flute_1 = _create_part(str(piece.id), InstrumentEnum.FLUTE)
+    flute_2 = _create_part(str(piece.id), InstrumentEnum.FLUTE)
+    events = []
+    monkeypatch.setattr(assignments, "publish_assignment_event", events.append)
+
+    snapshot = ProgramAssignmentSnapshot(str(program.id))
+    # Another writer fills the first chair after the snapshot was taken
+    ProgramPartMusician.objects.create(
+        program_id=program.id, part_id=flute_1, musician_id=flutists[1]
+    )
+    proposal = propose_program_part_assignments(str(program.id), snapshot=snapshot)
+    assert set(proposal) == {flute_1, flute_2}
+
+    assert auto_assign_program_parts(str(program.id), snapshot=snapshot) == 1
+    assert set(snapshot.assignments) == {flute_2}
+    assert [part.part.id for part in events[0].parts] == [flute_2]
+    assert (
+        str(
+            ProgramPartMusician.objects.get(
+                program_id=program.id, part_id=flute_1
+            ).musician_id
+        )
+        == flutists[1]
+    )
+
+
+def test_assignment_history_suggests_past_chair_holders():
+    organization = create_organization()
+    organization_id = str(organization.id)
+    musicians = {
+        first_name: str(
+            create_musician(
+                organization_id=organization_id,
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{first_name.lower()}-history@example.com",
+                principal=principal,
+                core_member=True,
+                primary_instrument=InstrumentEnum.FLUTE,
+                secondary_instruments=[],
+            ).id
+        )
+        for first_name, last_name, principal in (
+            ("Abe", "Able", False),
+            ("Pat", "Principal", True),
+            ("Zoe", "Zed", False),
+        )
+    }
+
+    def create_piece_with_flutes(title):
+        piece = Piece.objects.create(
+            organization_id=organization.id,
+            title=title,
+            composer="Composer",
+            instrumentation="",
+            duration=None,
+        )
+        flutes = [_create_part(str(piece.id), InstrumentEnum.FLUTE) for _ in "12"]
+        for number, part_id in enumerate(flutes, start=1):
+            Part.objects.filter(id=part_id).update(number=number)
+        return piece, flutes
+
+    def create_program_with(name, piece):
+        program = create_program(
+            organization_id=organization_id, name=name, performance_dates=[]
+        )
+        ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+        for musician_id in musicians.values():
+            add_musician_to_program(organization_id, str(program.id), musician_id)
+        return str(program.id)
+
+    piece, (flute_1, flute_2) = create_piece_with_flutes("History Piece")
+    other_piece, (_, other_flute_2) = create_piece_with_flutes("Other Piece")
+    past = create_program_with("Past Program", piece)
+
+    assign_program_parts_by_librarian(
+        organization_id,
+        past,
+        [(flute_1, musicians["Pat"]), (flute_2, musicians["Abe"])],
+    )
+    assign_program_parts_by_librarian(
+        organization_id, past, [(flute_2, musicians["Zoe"])]
+    )
+
+    def history_rows():
+        return {
+            (str(piece_id), descriptor, number, str(musician_id), count)
+            for piece_id, descriptor, number, musician_id, count in (
+                PartAssignmentHistory.objects.values_list(
+                    "piece_id",
+                    "descriptor",
+                    "number",
+                    "musician_id",
+                    "assignment_count",
+                )
+            )
+        }
+
+    expected = {
+        (str(piece.id), "Flute", 1, musicians["Pat"], 1),
+        (str(piece.id), "Flute", 2, musicians["Zoe"], 1),
+    }
+    assert history_rows() == expected
+
+    call_command("rebuild_assignment_history", stdout=StringIO())
+    assert history_rows() == expected
+
+    current = create_program_with("Current Program", piece)
+    payload = get_assignment_payload(
+        current, musicians["Pat"], include_suggestions=True
+    )
+    suggestions = {
+        part.id: part.suggested_musician_ids
+        for piece_payload in payload.pieces
+        for part in piece_payload.parts
+    }
+    assert suggestions == {flute_1: [musicians["Pat"]], flute_2: [musicians["Zoe"]]}
+    assert propose_program_part_assignments(current) == {
+        flute_1: musicians["Pat"],
+        flute_2: musicians["Zoe"],
+    }
+
+    other_part = Part.objects.select_related("piece").get(id=other_flute_2)
+    assert get_part_assignment_history([other_part]) == {
+        other_flute_2: {musicians["Zoe"]: (0, 1)}
+    }
+
+    delta = assign_program_part(current, musicians["Pat"], flute_2, musicians["Abe"])
+    assert delta.part.assigned_musician_id == musicians["Abe"]
+    assert delta.part.suggested_musician_ids == [musicians["Zoe"]]
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_concurrent_assignments_on_a_shared_piece_keep_history_exact():
+    organization = create_organization()
+    organization_id = str(organization.id)
+    musician_id = str(
+        create_musician(
+            organization_id=organization_id,
+            first_name="Con",
+            last_name="Current",
+            email="concurrent-history@example.com",
+            principal=False,
+            core_member=True,
+            primary_instrument=InstrumentEnum.FLUTE,
+            secondary_instruments=[],
+        ).id
+    )
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Shared Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    part_id = _create_part(str(piece.id), InstrumentEnum.FLUTE)
+    program_ids = []
+    for name in ("First Program", "Second Program"):
+        program = create_program(
+            organization_id=organization_id, name=name, performance_dates=[]
+        )
+        ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+        add_musician_to_program(organization_id, str(program.id), musician_id)
+        program_ids.append(str(program.id))
+
+    first_written = threading.Event()
+    errors = []
+
+    def assign(program_id, before_commit=None):
+        try:
+            with transaction.atomic():
+                set_program_part_assignments(
+                    program_id=program_id, changes={part_id: musician_id}
+                )
+                if before_commit:
+                    before_commit()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def hold_first_transaction():
+        first_written.set()
+        # Give the second writer time to reach the history refresh
+        time.sleep(0.5)
+
+    first = threading.Thread(
+        target=assign, args=(program_ids[0], hold_first_transaction)
+    )
+    second = threading.Thread(target=assign, args=(program_ids[1],))
+    first.start()
+    assert first_written.wait(10)
+    second.start()
+    first.join(10)
+    second.join(10)
+
+    assert errors == []
+    assert list(
+        PartAssignmentHistory.objects.filter(piece_id=piece.id).values_list(
+            "musician_id", "assignment_count"
+        )
+    ) == [(uuid.UUID(musician_id), 2)]
@@ -1,24 +1,51 @@
+import threading
+import time
 from datetime import timedelta
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from core.enum.instruments import InstrumentEnum
 from core.enum.notifications import MagicLinkType
+from core.enum.programs import ProgramAssignmentEventType
 from core.enum.music import PartAssetType
 from core.enum.status import UploadStatus
+from core.dtos.programs import ProgramAssignmentEventDTO
+from core.models.notifications import MagicLink
 from core.models.music import Instrument, Part, PartAsset, PartInstrument, Piece
-from core.models.programs import ProgramChecklist, ProgramPartMusician, ProgramPiece
+from core.models.programs import (
+    Program,
+    ProgramChecklist,
+    ProgramMusician,
+    ProgramPartMusician,
+    ProgramPiece,
+)
 from core.models.users import User
+from core.services import assignment_events
+from core.services.assignment_events import (
+    ASSIGNMENT_EVENT_CHANNEL,
+    InProcessAssignmentEventBroker,
+    PostgresAssignmentEventBroker,
+    wait_for_program_assignment_events,
+)
 from core.services.assignments import (
+    assign_program_part,
     assign_program_part_by_librarian,
+    assign_program_parts_by_librarian,
+    get_assignment_payload,
+    get_cached_program_assignments_status,
     get_program_assignments_status,
 )
 from core.services.delivery import (
     get_program_delivery_downloads,
     get_program_delivery_payload,
 )
-from core.services.magic_links import create_magic_link
+from core.services.magic_links import create_magic_link, mark_magic_link_accessed
+from core.services.music import create_piece
 from core.services.organizations import create_musician
 from core.services.programs import add_musician_to_program, create_program
 from core.services.programs import update_program_checklist
@@ -246,6 +273,7 @@ def test_librarian_can_assign_any_roster_musician_to_part():
     part = Part.objects.create(piece_id=piece.id)
     trumpet = Instrument.objects.get(name=InstrumentEnum.TRUMPET.value)
     PartInstrument.objects.create(part=part, instrument=trumpet, primary=True)
+    version = Program.objects.get(id=program.id).assignments_version
 
     payload = assign_program_part_by_librarian(
         organization_id=str(organization.id),
@@ -260,7 +288,16 @@ def test_librarian_can_assign_any_roster_musician_to_part():
     ).first()
     assert assignment is not None
     assert str(assignment.musician_id) == str(section.id)
-    assert any(m.id == str(section.id) for m in payload.roster_musicians)
+    assert payload.part.id == str(part.id)
+    assert payload.part.assigned_musician.id == str(section.id)
+    assert payload.piece_all_assigned is True
+    assert payload.summary.assigned_parts == 1
+    assert [principal_status.id for principal_status in payload.principals] == [
+        str(principal.id)
+    ]
+    assert payload.principals[0].assigned_parts.assigned == 1
+    assert payload.previous_version == version
+    assert payload.version == version + 1
 
 
 def test_program_delivery_payload_and_downloads_for_assigned_musician(monkeypatch):
@@ -575,3 +612,450 @@ def test_roster_complete_auto_assigns_multiple_string_players_by_section():
     assert assignments.count() == 2
     assigned_musicians = {str(assignment.musician_id) for assignment in assignments}
     assert assigned_musicians == {str(violinist_a.id), str(violinist_b.id)}
+
+
+def test_assignment_status_benchmark_matches_validated_payload():
+    organization = create_organization()
+    program = create_program(
+        organization_id=str(organization.id),
+        name="Benchmark Program",
+        performance_dates=[],
+    )
+    principal = create_musician(
+        organization_id=str(organization.id),
+        first_name="Bench",
+        last_name="Mark",
+        email="benchmark-principal@example.com",
+        principal=True,
+        core_member=True,
+        primary_instrument=InstrumentEnum.FLUTE,
+        secondary_instruments=[],
+    )
+    add_musician_to_program(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        musician_id=str(principal.id),
+    )
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Benchmark Piece",
+        composer="Composer",
+        instrumentation="2[1.2/pic] 2 2 2 — 4 2 3 1 — tmp+2 — hp — str",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+
+    output = StringIO()
+    call_command(
+        "benchmark_assignment_status",
+        str(organization.id),
+        str(program.id),
+        "--iterations",
+        "1",
+        stdout=output,
+    )
+
+    assert "trusted:" in output.getvalue()
+    assert "speedup:" in output.getvalue()
+
+
+def _create_program_with_principals(organization_id: str, instruments):
+    program = create_program(
+        organization_id=organization_id,
+        name="Snapshot Program",
+        performance_dates=[],
+    )
+    piece = Piece.objects.create(
+        organization_id=organization_id,
+        title="Snapshot Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+    for instrument in instruments:
+        principal = create_musician(
+            organization_id=organization_id,
+            first_name="Pri",
+            last_name=instrument.value,
+            email=f"{instrument.name.lower()}-{program.id}@example.com",
+            principal=True,
+            core_member=True,
+            primary_instrument=instrument,
+            secondary_instruments=[],
+        )
+        add_musician_to_program(
+            organization_id=organization_id,
+            program_id=str(program.id),
+            musician_id=str(principal.id),
+        )
+        part = Part.objects.create(piece_id=piece.id)
+        PartInstrument.objects.create(
+            part=part,
+            instrument=Instrument.objects.get(name=instrument.value),
+            primary=True,
+        )
+        create_magic_link(
+            program_id=str(program.id),
+            musician_id=str(principal.id),
+            link_type=MagicLinkType.ASSIGNMENT,
+        )
+    return program
+
+
+def test_program_assignments_status_query_count_is_independent_of_principals(
+    django_assert_num_queries,
+):
+    organization = create_organization()
+    instruments = [
+        InstrumentEnum.FLUTE,
+        InstrumentEnum.OBOE,
+        InstrumentEnum.CLARINET,
+        InstrumentEnum.BASSOON,
+        InstrumentEnum.FRENCH_HORN,
+        InstrumentEnum.TRUMPET,
+    ]
+    small = _create_program_with_principals(str(organization.id), instruments[:2])
+    large = _create_program_with_principals(str(organization.id), instruments)
+
+    with CaptureQueriesContext(connection) as context:
+        payload = get_program_assignments_status(
+            organization_id=str(organization.id),
+            program_id=str(small.id),
+        )
+    assert len(payload.principals) == 2
+
+    with django_assert_num_queries(len(context.captured_queries)):
+        payload = get_program_assignments_status(
+            organization_id=str(organization.id),
+            program_id=str(large.id),
+        )
+    assert len(payload.principals) == 6
+    assert all(principal.status == "Not Sent" for principal in payload.principals)
+
+
+def test_librarian_batch_assignment_applies_changes_together():
+    organization = create_organization()
+    instruments = [InstrumentEnum.FLUTE, InstrumentEnum.OBOE, InstrumentEnum.TRUMPET]
+    program = _create_program_with_principals(str(organization.id), instruments)
+    piece_ids = ProgramPiece.objects.filter(program_id=program.id).values_list(
+        "piece_id", flat=True
+    )
+    parts = list(Part.objects.filter(piece_id__in=piece_ids).order_by("id"))
+    musician_ids = [
+        str(musician_id)
+        for musician_id in ProgramMusician.objects.filter(
+            program_id=program.id
+        ).values_list("musician_id", flat=True)
+    ]
+    ProgramPartMusician.objects.create(
+        program_id=program.id, part_id=parts[0].id, musician_id=musician_ids[0]
+    )
+
+    with pytest.raises(ValueError):
+        assign_program_parts_by_librarian(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            changes=[(str(parts[1].id), musician_ids[1]), (str(parts[2].id), "nope")],
+        )
+    assert ProgramPartMusician.objects.filter(program_id=program.id).count() == 1
+
+    payload = assign_program_parts_by_librarian(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        changes=[
+            (str(parts[0].id), None),
+            (str(parts[1].id), musician_ids[1]),
+            (str(parts[2].id), musician_ids[2]),
+        ],
+    )
+
+    assignments = dict(
+        ProgramPartMusician.objects.filter(program_id=program.id).values_list(
+            "part_id", "musician_id"
+        )
+    )
+    assert {str(k): str(v) for k, v in assignments.items()} == {
+        str(parts[1].id): musician_ids[1],
+        str(parts[2].id): musician_ids[2],
+    }
+    assert payload.summary.total_parts == 3
+    assert payload.summary.assigned_parts == 2
+
+    # Clearing several parts is one write, so the version moves on once
+    version = payload.version
+    payload = assign_program_parts_by_librarian(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        changes=[(str(part.id), None) for part in parts],
+    )
+    assert payload.summary.assigned_parts == 0
+    assert payload.version == version + 1
+
+
+def test_principal_assignment_returns_delta_with_version():
+    organization = create_organization()
+    instruments = [InstrumentEnum.FLUTE, InstrumentEnum.OBOE]
+    program = _create_program_with_principals(str(organization.id), instruments)
+    flutist = ProgramMusician.objects.get(
+        program_id=program.id,
+        musician__instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+    flute_part = Part.objects.get(
+        piece__programpiece__program_id=program.id,
+        instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+
+    payload = get_assignment_payload(str(program.id), str(flutist.musician_id))
+    delta = assign_program_part(
+        program_id=str(program.id),
+        principal_musician_id=str(flutist.musician_id),
+        part_id=str(flute_part.id),
+        musician_id=str(flutist.musician_id),
+    )
+    assert delta.previous_version == payload.version
+    assert delta.part.assigned_musician_id == str(flutist.musician_id)
+    assert delta.piece_all_assigned is True
+    assert delta.all_assigned is True
+
+    # A write the client did not see makes its version stale.
+    assign_program_parts_by_librarian(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        changes=[(str(flute_part.id), None)],
+    )
+    delta = assign_program_part(
+        program_id=str(program.id),
+        principal_musician_id=str(flutist.musician_id),
+        part_id=str(flute_part.id),
+        musician_id=str(flutist.musician_id),
+    )
+    assert delta.previous_version == payload.version + 2
+    assert delta.version == payload.version + 3
+
+
+def test_cached_assignment_status_is_invalidated_by_writes(
+    django_assert_num_queries,
+):
+    organization = create_organization()
+    instruments = [InstrumentEnum.FLUTE, InstrumentEnum.OBOE]
+    program = _create_program_with_principals(str(organization.id), instruments)
+    flute_part = Part.objects.get(
+        piece__programpiece__program_id=program.id,
+        instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+    flutist = ProgramMusician.objects.get(
+        program_id=program.id,
+        musician__instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+
+    payload = get_cached_program_assignments_status(
+        organization_id=str(organization.id), program_id=str(program.id)
+    )
+    with django_assert_num_queries(1):
+        cached = get_cached_program_assignments_status(
+            organization_id=str(organization.id), program_id=str(program.id)
+        )
+    assert cached == payload
+    assert payload.summary.assigned_parts == 0
+
+    assign_program_part_by_librarian(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        part_id=str(flute_part.id),
+        musician_id=str(flutist.musician_id),
+    )
+    payload = get_cached_program_assignments_status(
+        organization_id=str(organization.id), program_id=str(program.id)
+    )
+    assert payload.summary.assigned_parts == 1
+
+    mark_magic_link_accessed(
+        create_magic_link(str(program.id), str(flutist.musician_id))
+    )
+    payload = get_cached_program_assignments_status(
+        organization_id=str(organization.id), program_id=str(program.id)
+    )
+    flute_status = next(
+        principal
+        for principal in payload.principals
+        if principal.id == str(flutist.musician_id)
+    )
+    assert flute_status.last_accessed_on is not None
+
+    Part.objects.create(piece_id=flute_part.piece_id)
+    payload = get_cached_program_assignments_status(
+        organization_id=str(organization.id), program_id=str(program.id)
+    )
+    assert payload.summary.total_parts == 3
+
+    with pytest.raises(Program.DoesNotExist):
+        get_cached_program_assignments_status(
+            organization_id=str(create_organization().id),
+            program_id=str(program.id),
+        )
+
+
+def test_assignment_events_carry_changes_since_the_client_version(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(assignment_events, "_broker", InProcessAssignmentEventBroker())
+    organization = create_organization()
+    instruments = [InstrumentEnum.FLUTE, InstrumentEnum.OBOE]
+    program = _create_program_with_principals(str(organization.id), instruments)
+    flute_part = Part.objects.get(
+        piece__programpiece__program_id=program.id,
+        instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+    flutist = ProgramMusician.objects.get(
+        program_id=program.id,
+        musician__instruments__instrument__name=InstrumentEnum.FLUTE.value,
+    )
+    status = get_program_assignments_status(
+        organization_id=str(organization.id), program_id=str(program.id)
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assign_program_part_by_librarian(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            part_id=str(flute_part.id),
+            musician_id=str(flutist.musician_id),
+        )
+    result = wait_for_program_assignment_events(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        version=status.version,
+        links_version=status.links_version,
+        timeout=0,
+    )
+    assert result.reload is False
+    [event] = result.events
+    assert event.type == ProgramAssignmentEventType.ASSIGNMENTS
+    assert event.previous_version == status.version
+    assert result.version == event.version
+    assert [change.part.id for change in event.parts] == [str(flute_part.id)]
+    assert event.parts[0].part.assigned_musician.id == str(flutist.musician_id)
+    assert event.summary.assigned_parts == 1
+    assert [principal.id for principal in event.principals] == [
+        str(flutist.musician_id)
+    ]
+
+    magic_link = MagicLink.objects.get(
+        program_id=program.id, musician_id=flutist.musician_id
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        mark_magic_link_accessed(magic_link)
+    result = wait_for_program_assignment_events(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        version=result.version,
+        links_version=result.links_version,
+        timeout=0,
+    )
+    assert result.reload is False
+    [event] = result.events
+    assert event.type == ProgramAssignmentEventType.LINK_ACCESSED
+    assert event.musician_id == str(flutist.musician_id)
+    assert event.occurred_on == magic_link.last_accessed_on
+
+    # Writes that publish no event make the client reload.
+    Part.objects.create(piece_id=flute_part.piece_id)
+    result = wait_for_program_assignment_events(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        version=result.version,
+        links_version=result.links_version,
+        timeout=0,
+    )
+    assert result.events == []
+    assert result.reload is True
+
+
+def test_in_process_assignment_event_broker_wakes_waiting_requests():
+    broker = InProcessAssignmentEventBroker(buffer_size=2)
+    events = [
+        ProgramAssignmentEventDTO(
+            type=ProgramAssignmentEventType.ASSIGNMENTS,
+            program_id="program",
+            version=version,
+            previous_version=version - 1,
+            links_version=0,
+        )
+        for version in (1, 2, 3)
+    ]
+
+    timer = threading.Timer(0.05, broker.publish, [events[0]])
+    timer.start()
+    assert broker.wait("program", 0, 0, timeout=5) == [events[0]]
+    timer.join()
+
+    broker.publish(events[1])
+    broker.publish(events[2])
+    assert broker.wait("program", 1, 0, timeout=0) == events[1:]
+    assert broker.wait("program", 3, 0, timeout=0.01) == []
+    assert broker.wait("other-program", 0, 0, timeout=0) == []
+
+
+def test_postgres_assignment_event_broker_gives_up_when_listener_is_down(
+    monkeypatch,
+):
+    def _refuse_connection(self, conn_params):
+        raise OSError("database unavailable")
+
+    organization = create_organization()
+    program = create_program(organization_id=str(organization.id), name="Listener Down")
+    Program.objects.filter(id=program.id).update(assignments_version=1)
+    broker = PostgresAssignmentEventBroker()
+    monkeypatch.setattr(assignment_events, "_broker", broker)
+    monkeypatch.setattr(
+        type(connections["default"]), "get_new_connection", _refuse_connection
+    )
+    try:
+        started = time.monotonic()
+        assert broker.wait("program", 0, 0, timeout=0.2) == []
+        assert time.monotonic() - started < 2
+
+        result = wait_for_program_assignment_events(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            version=0,
+            links_version=0,
+            timeout=0,
+        )
+        assert result.events == []
+        assert result.reload is True
+    finally:
+        broker.stop_listener()
+
+
+def test_postgres_assignment_event_broker_receives_notifications():
+    broker = PostgresAssignmentEventBroker()
+    event = ProgramAssignmentEventDTO(
+        type=ProgramAssignmentEventType.LINK_COMPLETED,
+        program_id="program",
+        version=4,
+        links_version=7,
+        musician_id="musician",
+        occurred_on=timezone.now(),
+    )
+    try:
+        assert broker.start_listener(timeout=5)
+        # Notify from a separate autocommit connection, as another worker would;
+        # notifications sent inside the test transaction are never delivered.
+        sender = connection.get_new_connection(connection.get_connection_params())
+        sender.autocommit = True
+        try:
+            with sender.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [ASSIGNMENT_EVENT_CHANNEL, event.model_dump_json()],
+                )
+        finally:
+            sender.close()
+
+        assert broker.wait("program", 4, 6, timeout=5) == [event]
+    finally:
+        broker.stop_listener()
@@ -0,0 +1,141 @@
+import pytest
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from faker import Faker
+from moto import mock_aws
+from core.dtos.base import LazyQueryError
+from core.dtos.music import PartAssetDTO, PartDTO
+from core.dtos.programs import ProgramDTO, ProgramMusicianDTO
+from core.enum.instruments import InstrumentEnum
+from core.enum.music import PartAssetType
+from core.models.music import Part, PartAsset
+from core.models.programs import Program, ProgramMusician
+from core.services.music import create_part_asset, create_piece
+from core.services.organizations import create_musician
+from core.services.programs import (
+    add_musician_to_program,
+    add_program_musician_instrument,
+    create_program,
+)
+from tests.mocks import create_organization
+
+faker = Faker()
+pytestmark = pytest.mark.django_db
+
+
+def _count_queries(function) -> int:
+    with CaptureQueriesContext(connection) as context:
+        function()
+    return len(context.captured_queries)
+
+
+def _create_program_with_roster(organization_id: str, size: int):
+    program = create_program(organization_id=organization_id, name=faker.word())
+    for _ in range(size):
+        musician = create_musician(
+            organization_id=organization_id,
+            first_name=faker.first_name(),
+            last_name=faker.last_name(),
+            email=faker.unique.email(),
+            principal=False,
+            core_member=True,
+            primary_instrument=InstrumentEnum.CELLO,
+        )
+        program_musicians = add_musician_to_program(
+            organization_id, program.id, musician.id
+        )
+        add_program_musician_instrument(
+            organization_id,
+            program.id,
+            program_musicians[-1].id,
+            InstrumentEnum.CELLO,
+        )
+    return program
+
+
+def test_program_musician_batch_uses_fixed_queries():
+    organization = create_organization()
+    small = _create_program_with_roster(organization.id, 2)
+    large = _create_program_with_roster(organization.id, 6)
+
+    def convert(program):
+        return lambda: ProgramMusicianDTO.from_models(
+            ProgramMusician.objects.filter(program_id=program.id)
+        )
+
+    assert _count_queries(convert(small)) == _count_queries(convert(large))
+    assert len(ProgramMusicianDTO.from_models(ProgramMusician.objects.all())) == 8
+
+
+def test_program_batch_uses_fixed_queries():
+    organization = create_organization()
+    create_program(organization_id=organization.id, name="First")
+    first = _count_queries(
+        lambda: ProgramDTO.from_models(
+            Program.objects.filter(organization_id=organization.id)
+        )
+    )
+    for index in range(4):
+        create_program(organization_id=organization.id, name=f"Program {index}")
+    assert first == _count_queries(
+        lambda: ProgramDTO.from_models(
+            Program.objects.filter(organization_id=organization.id)
+        )
+    )
+
+
+def test_program_batch_skips_pieces_when_piece_count_is_annotated():
+    organization = create_organization()
+    create_program(organization_id=organization.id, name="Annotated")
+    programs = Program.objects.filter(organization_id=organization.id)
+
+    plain = _count_queries(lambda: ProgramDTO.from_models(programs.all()))
+    annotated = _count_queries(
+        lambda: ProgramDTO.from_models(
+            programs.annotate(piece_count=Count("pieces", distinct=True))
+        )
+    )
+
+    assert annotated == plain - 1
+
+
+@mock_aws
+def test_part_asset_batch_uses_fixed_queries():
+    organization = create_organization()
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Batch DTO Test",
+        composer="Test",
+        instrumentation="2 2 2 2 — 4 2 3 1 — tmp+1 — hp — str",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+    create_part_asset(piece.id, "Flute 1.pdf", PartAssetType.CLEAN)
+    first = _count_queries(
+        lambda: PartAssetDTO.from_models(PartAsset.objects.filter(piece_id=piece.id))
+    )
+    for filename in ["Oboe 1.pdf", "Horn 1 2.pdf", "Violin 1.pdf"]:
+        create_part_asset(piece.id, filename, PartAssetType.CLEAN)
+    assert first == _count_queries(
+        lambda: PartAssetDTO.from_models(PartAsset.objects.filter(piece_id=piece.id))
+    )
+
+
+@mock_aws
+def test_strict_mode_rejects_lazy_loads(monkeypatch):
+    organization = create_organization()
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Strict DTO Test",
+        composer="Test",
+        instrumentation="1 0 0 0 — 0 0 0 0",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+    monkeypatch.setattr(PartDTO, "prefetch_plan", ())
+
+    with pytest.raises(LazyQueryError):
+        PartDTO.from_models(Part.objects.filter(piece_id=piece.id))
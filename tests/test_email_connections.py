@@ -0,0 +1,68 @@
+import pytest
+from django.core.mail import EmailMultiAlternatives
+
+from core.services.email_connections import (
+    PooledEmailConnection,
+    get_email_connection_stats,
+    reset_email_connection_stats,
+)
+from core.services.notifications import PreparedNotificationEmail, send_prepared_email
+from tests.mocks import FakeEmailBackend
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fake_email_backend(settings):
+    settings.EMAIL_BACKEND = "tests.mocks.FakeEmailBackend"
+    FakeEmailBackend.opened = []
+    reset_email_connection_stats()
+
+
+def _prepared_email(index: int) -> PreparedNotificationEmail:
+    return PreparedNotificationEmail(
+        notification=None,
+        message=EmailMultiAlternatives(
+            subject=f"Parts Ready {index}", body="", to=["player@example.com"]
+        ),
+    )
+
+
+def test_pooled_connection_is_reused_and_recycled():
+    connection = PooledEmailConnection(max_messages=3, max_age=300)
+
+    for index in range(7):
+        assert send_prepared_email(_prepared_email(index), connection=connection)
+
+    assert [len(backend.sent) for backend in FakeEmailBackend.opened] == [3, 3, 1]
+    stats = get_email_connection_stats()
+    assert stats.connections_opened == 3
+    assert stats.messages_sent == 7
+    assert stats.send_failures == 0
+
+
+def test_pooled_connection_reconnects_after_server_disconnect():
+    connection = PooledEmailConnection(max_messages=100, max_age=300)
+    assert send_prepared_email(_prepared_email(0), connection=connection)
+    FakeEmailBackend.opened[0].disconnected = True
+
+    assert send_prepared_email(_prepared_email(1), connection=connection)
+
+    assert len(FakeEmailBackend.opened) == 2
+    assert len(FakeEmailBackend.opened[1].sent) == 1
+    stats = get_email_connection_stats()
+    assert stats.reconnects == 1
+    assert stats.messages_sent == 2
+    assert stats.send_failures == 1
+
+
+def test_pooled_connection_replaces_idle_connection_failing_health_check():
+    connection = PooledEmailConnection(max_messages=100, max_age=300)
+    assert send_prepared_email(_prepared_email(0), connection=connection)
+    FakeEmailBackend.opened[0].connection.noop_code = 421
+    connection._last_used_at -= 60
+
+    assert send_prepared_email(_prepared_email(1), connection=connection)
+
+    assert len(FakeEmailBackend.opened) == 2
+    assert get_email_connection_stats().reconnects == 0
@@ -1,6 +1,13 @@
 from core.enum.instruments import (
+    INSTRUMENT_CHAIR_PARENT_MASKS,
+    INSTRUMENT_SECTION_MASKS,
+    INSTRUMENT_SECTIONS,
     InstrumentEnum,
     get_assignment_scope_for_instruments,
+    get_assignment_scope_mask,
+    get_instrument_mask,
+    get_mask_instruments,
+    is_single_instrument_mask,
     get_assignment_subsection_instruments,
     get_chair_parent_instrument,
 )
@@ -48,3 +55,30 @@ def test_get_assignment_scope_for_instruments_unions_subsections():
         InstrumentEnum.BASS_OBOE,
         InstrumentEnum.HECKELPHONE,
     }
+
+
+def test_instrument_mask_round_trips_instrument_sets():
+    instruments = {InstrumentEnum.FLUTE, InstrumentEnum.TUBA, InstrumentEnum.ZITHER}
+    assert get_mask_instruments(get_instrument_mask(instruments)) == instruments
+    assert is_single_instrument_mask(get_instrument_mask({InstrumentEnum.HARP}))
+    assert not is_single_instrument_mask(get_instrument_mask(instruments))
+    assert not is_single_instrument_mask(0)
+
+
+def test_assignment_scope_mask_matches_set_scope():
+    for instrument in InstrumentEnum:
+        for other in (InstrumentEnum.FLUTE, InstrumentEnum.TIMPANI):
+            instruments = {instrument, other}
+            assert get_mask_instruments(
+                get_assignment_scope_mask(get_instrument_mask(instruments))
+            ) == get_assignment_scope_for_instruments(instruments)
+
+
+def test_section_masks_match_sections():
+    for section, instruments in INSTRUMENT_SECTIONS.items():
+        assert get_mask_instruments(INSTRUMENT_SECTION_MASKS[section]) == set(
+            instruments
+        )
+    assert INSTRUMENT_CHAIR_PARENT_MASKS[InstrumentEnum.PICCOLO] == (
+        get_instrument_mask({InstrumentEnum.FLUTE})
+    )
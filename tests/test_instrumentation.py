@@ -2,12 +2,23 @@ import pytest
 from moto import mock_aws
 from core.enum.music import PartAssetType
 from core.enum.instruments import InstrumentEnum
-from core.services.music import (
+from core.services.instrumentation import (
+    PartPlan,
     _normalize_instrumentation_token,
+    compile_instrumentation,
+)
+from core.services.music import (
+    get_instrument,
+    get_instruments_in_string,
     create_part_asset,
+    create_part_assets,
+    create_parts_from_instrumentation,
     create_piece,
+    get_part_assets,
     get_parts,
 )
+from core.models.music import Instrument, Piece
+from core.services.instruments import clear_instrument_registry, get_instrument_id
 from tests.mocks import create_organization
 
 pytestmark = pytest.mark.django_db
@@ -23,6 +34,46 @@ def test_normalize_instrumentation_token_removes_opt_in_brass_section():
     assert normalized.split() == ["4", "2", "3[1.2.cbn]", "1"]
 
 
+def test_compile_instrumentation_builds_immutable_part_plan():
+    plan = compile_instrumentation("2[1.2/pic] 1 0 0 — 1 0 0 0 — tmp+1 — pf/cel")
+    assert plan == (
+        PartPlan(InstrumentEnum.FLUTE, (InstrumentEnum.FLUTE,), 1),
+        PartPlan(
+            InstrumentEnum.FLUTE, (InstrumentEnum.FLUTE, InstrumentEnum.PICCOLO), 2
+        ),
+        PartPlan(InstrumentEnum.OBOE, (InstrumentEnum.OBOE,), 1),
+        PartPlan(InstrumentEnum.FRENCH_HORN, (InstrumentEnum.FRENCH_HORN,), 1),
+        PartPlan(InstrumentEnum.TIMPANI, (InstrumentEnum.TIMPANI,), 1),
+        PartPlan(InstrumentEnum.PERCUSSION, (InstrumentEnum.PERCUSSION,), 1),
+        PartPlan(InstrumentEnum.PIANO, (InstrumentEnum.PIANO, InstrumentEnum.CELESTA)),
+    )
+    assert isinstance(plan, tuple)
+
+
+def test_compile_instrumentation_reuses_plan_for_equivalent_notation():
+    plan = compile_instrumentation("3 3 3 3 — 4 3 3 1 — tmp+2 — hp — str")
+    assert compile_instrumentation("  3 3 3 3 —  4 3 3 1 — TMP+2 — Hp — str ") is plan
+
+
+def test_get_instruments_in_string_respects_token_boundaries():
+    assert get_instruments_in_string("Rimsky-Op35.EnglishHorn12.pdf") == [
+        InstrumentEnum.ENGLISH_HORN
+    ]
+    assert get_instruments_in_string("Firebird-HORN12.pdf") == [
+        InstrumentEnum.FRENCH_HORN
+    ]
+    assert get_instruments_in_string("Double Bass.pdf") == [
+        InstrumentEnum.BASS,
+        InstrumentEnum.DOUBLE_BASS,
+    ]
+    assert get_instruments_in_string("Flute 1 - Piccolo.pdf") == [
+        InstrumentEnum.FLUTE,
+        InstrumentEnum.PICCOLO,
+    ]
+    assert get_instruments_in_string("Violin-2.pdf") == [InstrumentEnum.VIOLIN_2]
+    assert get_instruments_in_string("Score.pdf") == []
+
+
 def _part_has_instrument(part, instrument_enum: InstrumentEnum) -> bool:
     return any(
         part_instrument.instrument.name == instrument_enum
@@ -424,3 +475,144 @@ def test_violin_parts():
     assert len(violin_2.parts) == 1
     violin_2_parts = _parts_for_primary_instrument(parts, InstrumentEnum.VIOLIN_2)
     assert len(violin_2_parts) == 1
+
+
+@mock_aws
+def test_create_parts_from_instrumentation_uses_constant_queries(
+    django_assert_max_num_queries,
+):
+    organization = create_organization()
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Bulk Test",
+        composer="Test",
+        instrumentation="",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+
+    instrumentation = (
+        "4[1.2.3/pic.pic] 4[1.2.3.eh] 4[1.2.3.bcl] 4[1.2.3.cbn] — 8 4 4 1 "
+        "— tmp+5 — hp — pf/cel — str"
+    )
+    # Savepoint + instrument lookup + piece lock + part insert + part
+    # instrument insert + assignment version bump + release
+    with django_assert_max_num_queries(7):
+        parts = create_parts_from_instrumentation(str(piece.id), instrumentation)
+
+    assert len(parts) == 46
+    assert _numbers_for_primary_instrument(parts, InstrumentEnum.FRENCH_HORN) == {
+        1,
+        2,
+        3,
+        4,
+        5,
+        6,
+        7,
+        8,
+    }
+    assert _has_primary_with_doubling(
+        parts, InstrumentEnum.FLUTE, InstrumentEnum.PICCOLO, 3
+    )
+    assert {part.id for part in parts} == {
+        part.id for part in get_parts(organization.id, piece.id)
+    }
+
+
+@mock_aws
+def test_create_part_assets_matches_batch_like_sequential_uploads():
+    organization = create_organization()
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Batch Upload Test",
+        composer="Test",
+        instrumentation="3[1.2/pic.pic] 2[1.2/Eh] 2 2 — 4 2 3 1 — tmp+5 — hp — str",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+
+    part_assets = create_part_assets(
+        organization_id=str(organization.id),
+        piece_id=str(piece.id),
+        uploads=[
+            ("Rimsky-Op35.Horn12.pdf", PartAssetType.CLEAN),
+            ("Rimsky-Op35.Horn12.pdf", PartAssetType.CLEAN),
+            ("Rimsky-Op35.Piccolo.pdf", PartAssetType.CLEAN),
+            ("Violin-1.pdf", PartAssetType.BOWING),
+        ],
+    )
+
+    assert len(part_assets) == 4
+    assert _numbers_for_instrument(
+        part_assets[0].parts, InstrumentEnum.FRENCH_HORN
+    ) == {1, 2}
+    # Numbered chairs already covered earlier in the batch are skipped
+    assert part_assets[1].parts == []
+    assert _numbers_for_instrument(part_assets[2].parts, InstrumentEnum.PICCOLO) == {
+        2,
+        3,
+    }
+    assert part_assets[3].asset_type == PartAssetType.BOWING
+    assert (
+        _parts_for_primary_instrument(part_assets[3].parts, InstrumentEnum.VIOLIN_1)
+        == part_assets[3].parts
+    )
+    assert all(part_asset.upload_url for part_asset in part_assets)
+
+    stored = get_part_assets(
+        str(organization.id), str(piece.id), asset_type=PartAssetType.CLEAN
+    )
+    assert {part_asset.id for part_asset in stored} == {
+        part_asset.id for part_asset in part_assets[:3]
+    }
+    horn_asset = next(asset for asset in stored if asset.id == part_assets[0].id)
+    assert {part.id for part in horn_asset.parts} == {
+        part.id for part in part_assets[0].parts
+    }
+
+
+@mock_aws
+def test_create_part_assets_blocks_cross_tenant_piece():
+    organization = create_organization()
+    other_organization = create_organization()
+    piece = create_piece(
+        organization_id=str(organization.id),
+        title="Batch Tenant Test",
+        composer="Test",
+        instrumentation="2 2 2 2 — 2 2 0 0 — str",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+
+    with pytest.raises(Piece.DoesNotExist):
+        create_part_assets(
+            organization_id=str(other_organization.id),
+            piece_id=str(piece.id),
+            uploads=[("Flute 1.pdf", PartAssetType.CLEAN)],
+        )
+
+
+def test_get_instrument_uses_process_registry(django_assert_num_queries):
+    flute = Instrument.objects.get(name=InstrumentEnum.FLUTE.value)
+    get_instrument(InstrumentEnum.FLUTE)
+
+    with django_assert_num_queries(0):
+        instrument = get_instrument(InstrumentEnum.FLUTE)
+    assert instrument.id == str(flute.id)
+    assert instrument.name == InstrumentEnum.FLUTE
+
+
+def test_instrument_registry_reloads_after_instrument_changes():
+    flute = Instrument.objects.get(name=InstrumentEnum.FLUTE.value)
+    assert get_instrument_id(InstrumentEnum.FLUTE) == flute.id
+
+    try:
+        flute.delete()
+        replacement = Instrument.objects.create(name=InstrumentEnum.FLUTE.value)
+        assert get_instrument_id(InstrumentEnum.FLUTE) == replacement.id
+    finally:
+        # The test transaction is rolled back, so forget the replacement row
+        clear_instrument_registry()
@@ -1,13 +1,30 @@
+import threading
+import time
+import zlib
+
 import pytest
+from django.db import IntegrityError, connection, transaction
 
 from core.enum.instruments import InstrumentEnum
-from core.enum.notifications import NotificationType
+from core.enum.notifications import NotificationStatus, NotificationType
 from core.models.music import Instrument, Part, PartInstrument, Piece
-from core.models.notifications import Notification
-from core.models.programs import ProgramPiece, ProgramPartMusician
-from core.services.notifications import send_assignment_email, send_part_delivery_email
+from core.models.notifications import Notification, NotificationBody
+from core.models.organizations import Musician
+from core.models.programs import Program, ProgramPiece, ProgramPartMusician
+from core.services.notifications import (
+    _claim_notification,
+    _store_notification_bodies,
+    clear_program_email_context_cache,
+    get_program_email_context,
+    send_assignment_email,
+    send_part_delivery_email,
+)
 from core.services.organizations import create_musician
-from core.services.programs import add_musician_to_program, create_program
+from core.services.programs import (
+    add_musician_to_program,
+    create_program,
+    get_pieces_for_program,
+)
 from tests.mocks import create_organization
 
 pytestmark = pytest.mark.django_db
@@ -214,3 +231,235 @@ def test_send_part_delivery_email_deduplicates_by_notification_type(monkeypatch)
     assert notifications.count() == 1
     assert notifications.first().type == NotificationType.PART_DELIVERY.value
     assert sends["count"] == 1
+
+
+def test_part_delivery_emails_share_program_context(monkeypatch):
+    organization = create_organization()
+    program = create_program(
+        organization_id=str(organization.id),
+        name="Roster Program",
+        performance_dates=[],
+    )
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Roster Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+    musicians = []
+    for index in range(3):
+        musician = create_musician(
+            organization_id=str(organization.id),
+            first_name=f"Player{index}",
+            last_name="Roster",
+            email=f"roster-{index}@example.com",
+            principal=False,
+            core_member=True,
+            primary_instrument=InstrumentEnum.TRUMPET,
+            secondary_instruments=[],
+        )
+        add_musician_to_program(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            musician_id=str(musician.id),
+        )
+        ProgramPartMusician.objects.create(
+            program_id=program.id,
+            part_id=_create_part(str(piece.id), InstrumentEnum.TRUMPET),
+            musician_id=musician.id,
+        )
+        musicians.append(musician)
+
+    piece_lookups = []
+
+    def _get_pieces_for_program(organization_id: str, program_id: str):
+        piece_lookups.append(program_id)
+        return get_pieces_for_program(organization_id, program_id)
+
+    monkeypatch.setattr(
+        "core.services.notifications.get_pieces_for_program",
+        _get_pieces_for_program,
+    )
+    monkeypatch.setattr(
+        "core.services.notifications.EmailMultiAlternatives.send",
+        lambda _self: 1,
+    )
+    clear_program_email_context_cache()
+
+    for musician in musicians:
+        send_part_delivery_email(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            musician_id=str(musician.id),
+        )
+
+    assert len(piece_lookups) == 1
+    notifications = Notification.objects.filter(
+        program_id=program.id, type=NotificationType.PART_DELIVERY.value
+    )
+    assert notifications.count() == 3
+    for notification in notifications:
+        assert "Roster Piece" in notification.body
+        assert notification.recipient_first_name in notification.body
+        assert notification.magic_link.token in notification.body_html
+    # Every recipient shares the stored bodies; only the cut-out values differ
+    assert len({(n.text_body_id, n.html_body_id) for n in notifications}) == 1
+    assert (
+        NotificationBody.objects.filter(
+            id__in=[notifications[0].text_body_id, notifications[0].html_body_id]
+        ).count()
+        == 2
+    )
+
+    clear_program_email_context_cache()
+    assert get_program_email_context(str(organization.id), str(program.id))
+    assert len(piece_lookups) == 2
+
+
+def test_failed_notification_releases_dedupe_claim(monkeypatch):
+    organization = create_organization()
+    program = create_program(
+        organization_id=str(organization.id),
+        name="Retry Program",
+        performance_dates=[],
+    )
+    musician = create_musician(
+        organization_id=str(organization.id),
+        first_name="Re",
+        last_name="Try",
+        email="retry@example.com",
+        principal=False,
+        core_member=True,
+        primary_instrument=InstrumentEnum.TRUMPET,
+        secondary_instruments=[],
+    )
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Retry Piece",
+        composer="Composer",
+        instrumentation="",
+        duration=None,
+    )
+    add_musician_to_program(
+        organization_id=str(organization.id),
+        program_id=str(program.id),
+        musician_id=str(musician.id),
+    )
+    ProgramPiece.objects.create(program_id=program.id, piece_id=piece.id)
+    ProgramPartMusician.objects.create(
+        program_id=program.id,
+        part_id=_create_part(str(piece.id), InstrumentEnum.TRUMPET),
+        musician_id=musician.id,
+    )
+    results = [0, 1]
+    monkeypatch.setattr(
+        "core.services.notifications.EmailMultiAlternatives.send",
+        lambda _self: results.pop(0),
+    )
+
+    for _ in range(3):
+        send_part_delivery_email(
+            organization_id=str(organization.id),
+            program_id=str(program.id),
+            musician_id=str(musician.id),
+        )
+
+    statuses = Notification.objects.filter(
+        program_id=program.id, recipient_id=musician.id
+    ).values_list("status", flat=True)
+    assert sorted(statuses) == [
+        NotificationStatus.FAILED.value,
+        NotificationStatus.SENT.value,
+    ]
+    assert results == []
+
+    # The database enforces one live notification, not just the service
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Notification.objects.create(
+            type=NotificationType.PART_DELIVERY.value,
+            program_id=program.id,
+            recipient_id=musician.id,
+            recipient_email=musician.email,
+            recipient_first_name=musician.first_name,
+            recipient_last_name=musician.last_name,
+            subject="",
+        )
+
+
+def test_stored_notification_bodies_round_trip_cut_out_values():
+    values = ["https://example.com/m/abc0", "O'Brien", "0", "O&#x27;Brien"]
+    texts = [
+        "Hi O'Brien,\nhttps://example.com/m/abc0\nSection 10",
+        '<p>Hi O&#x27;Brien</p><a href="https://example.com/m/abc0">Open</a>',
+    ]
+
+    bodies = _store_notification_bodies(texts, values)
+
+    assert [body.render(values) for body in bodies] == texts
+    assert "O'Brien" not in zlib.decompress(bytes(bodies[0].content)).decode()
+    assert _store_notification_bodies(texts, values) == bodies
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_concurrent_claims_for_one_notification_yield_one_row():
+    organization = create_organization()
+    program = create_program(
+        organization_id=str(organization.id),
+        name="Claim Program",
+        performance_dates=[],
+    )
+    musician = create_musician(
+        organization_id=str(organization.id),
+        first_name="Con",
+        last_name="Tender",
+        email="claim@example.com",
+        principal=False,
+        core_member=True,
+        primary_instrument=InstrumentEnum.TRUMPET,
+        secondary_instruments=[],
+    )
+    program = Program.objects.get(id=program.id)
+    musician = Musician.objects.get(id=musician.id)
+    first_claimed = threading.Event()
+    claims = []
+    errors = []
+
+    def claim(before_commit=None):
+        try:
+            with transaction.atomic():
+                claims.append(
+                    _claim_notification(
+                        program, musician, NotificationType.PART_DELIVERY
+                    )
+                )
+                if before_commit:
+                    before_commit()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def hold_first_transaction():
+        first_claimed.set()
+        # Give the second sender time to reach the same claim
+        time.sleep(0.5)
+
+    first = threading.Thread(target=claim, args=(hold_first_transaction,))
+    second = threading.Thread(target=claim)
+    first.start()
+    assert first_claimed.wait(10)
+    second.start()
+    first.join(10)
+    second.join(10)
+
+    assert errors == []
+    assert len(claims) == 2
+    assert sum(claim is not None for claim in claims) == 1
+    assert (
+        Notification.objects.filter(
+            program_id=program.id, recipient_id=musician.id
+        ).count()
+        == 1
+    )
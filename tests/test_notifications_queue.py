@@ -1,5 +1,13 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import boto3
 import pytest
+from moto import mock_aws
 
+from core.dtos.queue import EmailQueuePayloadDTO
 from core.enum.notifications import NotificationType
 from core.enum.instruments import InstrumentEnum
 from core.models.music import Instrument, Part, PartInstrument, Piece
@@ -9,7 +17,9 @@ from core.services.notifications import (
     send_part_delivery_emails,
     send_part_assignment_emails,
 )
+from core.services import queue
 from core.services.organizations import create_musician
+from core.services.queue_consumer import AsyncEmailQueueConsumer, EmailQueueConsumer
 from core.services.programs import add_musician_to_program, create_program
 from tests.mocks import create_organization
 
@@ -92,13 +102,13 @@ def test_send_part_assignment_emails_enqueues_principals_only(monkeypatch):
 
     payloads = []
 
-    def _enqueue_email_payload(payload):
-        payloads.append(payload)
-        return "msg-1"
+    def _enqueue_email_payloads(batch):
+        payloads.extend(batch)
+        return [f"msg-{index}" for index, _ in enumerate(batch)]
 
     monkeypatch.setattr(
-        "core.services.notifications.enqueue_email_payload",
-        _enqueue_email_payload,
+        "core.services.notifications.enqueue_email_payloads",
+        _enqueue_email_payloads,
     )
 
     send_part_assignment_emails(
@@ -153,13 +163,13 @@ def test_send_part_assignment_emails_skips_principals_without_assignable_parts(
 
     payloads = []
 
-    def _enqueue_email_payload(payload):
-        payloads.append(payload)
-        return "msg-1"
+    def _enqueue_email_payloads(batch):
+        payloads.extend(batch)
+        return [f"msg-{index}" for index, _ in enumerate(batch)]
 
     monkeypatch.setattr(
-        "core.services.notifications.enqueue_email_payload",
-        _enqueue_email_payload,
+        "core.services.notifications.enqueue_email_payloads",
+        _enqueue_email_payloads,
     )
 
     send_part_assignment_emails(
@@ -205,13 +215,13 @@ def test_auto_assigns_unambiguous_harp_without_enqueue(monkeypatch):
 
     payloads = []
 
-    def _enqueue_email_payload(payload):
-        payloads.append(payload)
-        return "msg-1"
+    def _enqueue_email_payloads(batch):
+        payloads.extend(batch)
+        return [f"msg-{index}" for index, _ in enumerate(batch)]
 
     monkeypatch.setattr(
-        "core.services.notifications.enqueue_email_payload",
-        _enqueue_email_payload,
+        "core.services.notifications.enqueue_email_payloads",
+        _enqueue_email_payloads,
     )
 
     send_part_assignment_emails(
@@ -264,13 +274,13 @@ def test_enqueues_harp_principal_when_assignment_is_ambiguous(monkeypatch):
 
     payloads = []
 
-    def _enqueue_email_payload(payload):
-        payloads.append(payload)
-        return "msg-1"
+    def _enqueue_email_payloads(batch):
+        payloads.extend(batch)
+        return [f"msg-{index}" for index, _ in enumerate(batch)]
 
     monkeypatch.setattr(
-        "core.services.notifications.enqueue_email_payload",
-        _enqueue_email_payload,
+        "core.services.notifications.enqueue_email_payloads",
+        _enqueue_email_payloads,
     )
 
     send_part_assignment_emails(
@@ -296,7 +306,9 @@ def test_enqueues_harp_principal_when_assignment_is_ambiguous(monkeypatch):
 def test_send_notification_email_dispatches_assignment(monkeypatch):
     calls = []
 
-    def _send_assignment_email(organization_id: str, program_id: str, musician_id: str):
+    def _send_assignment_email(
+        organization_id: str, program_id: str, musician_id: str, connection=None
+    ):
         calls.append((organization_id, program_id, musician_id))
 
     monkeypatch.setattr(
@@ -318,7 +330,7 @@ def test_send_notification_email_dispatches_part_delivery(monkeypatch):
     calls = []
 
     def _send_part_delivery_email(
-        organization_id: str, program_id: str, musician_id: str
+        organization_id: str, program_id: str, musician_id: str, connection=None
     ):
         calls.append((organization_id, program_id, musician_id))
 
@@ -377,13 +389,13 @@ def test_send_part_delivery_emails_enqueues_roster_musicians(monkeypatch):
 
     payloads = []
 
-    def _enqueue_email_payload(payload):
-        payloads.append(payload)
-        return "msg-1"
+    def _enqueue_email_payloads(batch):
+        payloads.extend(batch)
+        return [f"msg-{index}" for index, _ in enumerate(batch)]
 
     monkeypatch.setattr(
-        "core.services.notifications.enqueue_email_payload",
-        _enqueue_email_payload,
+        "core.services.notifications.enqueue_email_payloads",
+        _enqueue_email_payloads,
     )
 
     send_part_delivery_emails(
@@ -400,3 +412,355 @@ def test_send_part_delivery_emails_enqueues_roster_musicians(monkeypatch):
         payload.notification_type == NotificationType.PART_DELIVERY
         for payload in payloads
     )
+
+
+def _use_moto_queue(monkeypatch):
+    client = boto3.client("sqs", region_name="us-east-1")
+    queue_url = client.create_queue(QueueName="email-queue-test")["QueueUrl"]
+    monkeypatch.setattr(queue, "_sqs_client", client)
+    monkeypatch.setattr(queue, "_queue_url", queue_url)
+    return client, queue_url
+
+
+def _email_payloads(count: int) -> list[EmailQueuePayloadDTO]:
+    return [
+        EmailQueuePayloadDTO(
+            organization_id=str(uuid.uuid4()),
+            program_id=str(uuid.uuid4()),
+            musician_id=str(uuid.uuid4()),
+            notification_type=NotificationType.PART_DELIVERY,
+        )
+        for _ in range(count)
+    ]
+
+
+def _receive_all(client, queue_url: str) -> list[EmailQueuePayloadDTO]:
+    received = []
+    while True:
+        messages = client.receive_message(
+            QueueUrl=queue_url, MaxNumberOfMessages=10
+        ).get("Messages", [])
+        if not messages:
+            return received
+        for message in messages:
+            received.append(queue.parse_email_payload(message["Body"]))
+            client.delete_message(
+                QueueUrl=queue_url, ReceiptHandle=message["ReceiptHandle"]
+            )
+
+
+@mock_aws
+def test_enqueue_email_payloads_sends_batches_of_ten(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    batch_sizes = []
+    client.meta.events.register(
+        "provide-client-params.sqs.SendMessageBatch",
+        lambda params, **kwargs: batch_sizes.append(len(params["Entries"])),
+    )
+    payloads = _email_payloads(23)
+
+    message_ids = queue.enqueue_email_payloads(payloads)
+
+    assert sorted(batch_sizes) == [3, 10, 10]
+    assert len(set(message_ids)) == 23
+    received = _receive_all(client, queue_url)
+    assert sorted(payload.musician_id for payload in received) == sorted(
+        payload.musician_id for payload in payloads
+    )
+    assert queue.enqueue_email_payloads([]) == []
+
+
+@mock_aws
+def test_enqueue_email_payloads_retries_only_failed_entries(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    monkeypatch.setattr(queue, "EMAIL_QUEUE_RETRY_DELAY_SECONDS", 0)
+    send_message_batch = client.send_message_batch
+    sent_ids = []
+
+    def _flaky_send_message_batch(QueueUrl, Entries):
+        sent_ids.append([entry["Id"] for entry in Entries])
+        if len(sent_ids) > 1:
+            return send_message_batch(QueueUrl=QueueUrl, Entries=Entries)
+        response = send_message_batch(QueueUrl=QueueUrl, Entries=Entries[2:])
+        response["Failed"] = [
+            {"Id": entry["Id"], "Code": "InternalError", "SenderFault": False}
+            for entry in Entries[:2]
+        ]
+        return response
+
+    monkeypatch.setattr(client, "send_message_batch", _flaky_send_message_batch)
+    payloads = _email_payloads(5)
+
+    message_ids = queue.enqueue_email_payloads(payloads)
+
+    assert sent_ids == [["0", "1", "2", "3", "4"], ["0", "1"]]
+    assert len(set(message_ids)) == 5
+    assert len(_receive_all(client, queue_url)) == 5
+
+
+@mock_aws
+def test_enqueue_email_payloads_does_not_retry_sender_faults(monkeypatch):
+    client, _ = _use_moto_queue(monkeypatch)
+    calls = []
+
+    def _rejecting_send_message_batch(QueueUrl, Entries):
+        calls.append(Entries)
+        return {
+            "Successful": [],
+            "Failed": [
+                {
+                    "Id": entry["Id"],
+                    "Code": "InvalidMessageContents",
+                    "SenderFault": True,
+                }
+                for entry in Entries
+            ],
+        }
+
+    monkeypatch.setattr(client, "send_message_batch", _rejecting_send_message_batch)
+
+    with pytest.raises(queue.EmailQueueError, match="InvalidMessageContents"):
+        queue.enqueue_email_payloads(_email_payloads(2))
+    assert len(calls) == 1
+
+
+@mock_aws
+def test_enqueue_email_payloads_keeps_sender_faults_across_retries(monkeypatch):
+    client, _ = _use_moto_queue(monkeypatch)
+    monkeypatch.setattr(queue, "EMAIL_QUEUE_RETRY_DELAY_SECONDS", 0)
+    send_message_batch = client.send_message_batch
+    sent_ids = []
+
+    def _mixed_send_message_batch(QueueUrl, Entries):
+        sent_ids.append([entry["Id"] for entry in Entries])
+        if len(sent_ids) > 1:
+            return send_message_batch(QueueUrl=QueueUrl, Entries=Entries)
+        response = send_message_batch(QueueUrl=QueueUrl, Entries=Entries[2:])
+        response["Failed"] = [
+            {"Id": "0", "Code": "InvalidMessageContents", "SenderFault": True},
+            {"Id": "1", "Code": "InternalError", "SenderFault": False},
+        ]
+        return response
+
+    monkeypatch.setattr(client, "send_message_batch", _mixed_send_message_batch)
+
+    with pytest.raises(queue.EmailQueueError, match="1 of 3.*InvalidMessageContents"):
+        queue.enqueue_email_payloads(_email_payloads(3))
+    assert sent_ids == [["0", "1", "2"], ["1"]]
+
+
+def _run_consumer(consumer):
+    thread = threading.Thread(target=consumer.run)
+    thread.start()
+    return thread
+
+
+def _wait_for(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@mock_aws
+def test_queue_consumer_sends_concurrently_and_deletes_in_batches(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    payloads = _email_payloads(12)
+    queue.enqueue_email_payloads(payloads)
+    client.send_message(QueueUrl=queue_url, MessageBody="not json")
+    failing_musician_id = payloads[0].musician_id
+
+    lock = threading.Lock()
+    sent = []
+    running = [0, 0]
+
+    def _send_notification_email(**kwargs):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+            sent.append(kwargs["musician_id"])
+        if kwargs["musician_id"] == failing_musician_id:
+            raise RuntimeError("SMTP unavailable")
+
+    monkeypatch.setattr(
+        "core.services.queue_consumer.send_notification_email",
+        _send_notification_email,
+    )
+    deleted = []
+    client.meta.events.register(
+        "provide-client-params.sqs.DeleteMessageBatch",
+        lambda params, **kwargs: deleted.append(len(params["Entries"])),
+    )
+
+    consumer = EmailQueueConsumer(workers=4, wait_time=0, sleep=0.05)
+    thread = _run_consumer(consumer)
+    _wait_for(lambda: len(sent) == 12 and not consumer._in_flight)
+    consumer.stop()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert running[1] > 1
+    # Eleven sent messages and the invalid one, in fewer calls than messages
+    assert sum(deleted) == 12
+    assert len(deleted) < 12
+    attributes = client.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=[
+            "ApproximateNumberOfMessages",
+            "ApproximateNumberOfMessagesNotVisible",
+        ],
+    )["Attributes"]
+    assert attributes == {
+        "ApproximateNumberOfMessages": "0",
+        "ApproximateNumberOfMessagesNotVisible": "1",
+    }
+
+
+@mock_aws
+def test_queue_consumer_extends_visibility_and_drains_on_stop(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    queue.enqueue_email_payloads(_email_payloads(3))
+
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def _send_notification_email(**kwargs):
+        started.set()
+        release.wait(10)
+        sent.append(kwargs["musician_id"])
+
+    monkeypatch.setattr(
+        "core.services.queue_consumer.send_notification_email",
+        _send_notification_email,
+    )
+    visibility_changes = []
+    client.meta.events.register(
+        "provide-client-params.sqs.ChangeMessageVisibilityBatch",
+        lambda params, **kwargs: visibility_changes.append(
+            {entry["VisibilityTimeout"] for entry in params["Entries"]}
+        ),
+    )
+
+    consumer = EmailQueueConsumer(
+        workers=1, max_number=3, wait_time=0, sleep=0.05, visibility_timeout=1
+    )
+    thread = _run_consumer(consumer)
+    assert started.wait(10)
+    _wait_for(lambda: {1} in visibility_changes)
+    consumer.stop()
+    _wait_for(lambda: {0} in visibility_changes)
+    release.set()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert len(sent) == 1
+    # The two queued messages went back to the queue instead of being sent
+    released = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)
+    assert len(released["Messages"]) == 2
+
+
+def _run_async_consumer(consumer):
+    thread = threading.Thread(target=asyncio.run, args=(consumer.run(),))
+    thread.start()
+    return thread
+
+
+@mock_aws
+def test_async_queue_consumer_sends_beyond_database_threads(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    payloads = _email_payloads(12)
+    queue.enqueue_email_payloads(payloads)
+    client.send_message(QueueUrl=queue_url, MessageBody="not json")
+
+    lock = threading.Lock()
+    recorded = []
+    sending = [0, 0]
+
+    def _send_prepared_email(prepared, connection=None):
+        with lock:
+            sending[0] += 1
+            sending[1] = max(sending[1], sending[0])
+        time.sleep(0.1)
+        with lock:
+            sending[0] -= 1
+        return True
+
+    monkeypatch.setattr(
+        "core.services.queue_consumer.prepare_notification_email",
+        lambda **kwargs: kwargs["musician_id"],
+    )
+    monkeypatch.setattr(
+        "core.services.queue_consumer.send_prepared_email", _send_prepared_email
+    )
+    monkeypatch.setattr(
+        "core.services.queue_consumer.record_notification_email_status",
+        lambda prepared, success: recorded.append((prepared, success)),
+    )
+
+    consumer = AsyncEmailQueueConsumer(
+        max_in_flight=6, max_pending=10, db_workers=2, wait_time=0, sleep=0.05
+    )
+    thread = _run_async_consumer(consumer)
+    _wait_for(lambda: len(recorded) == 12 and not consumer._received)
+    consumer.stop()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert sorted(recorded) == sorted(
+        (payload.musician_id, True) for payload in payloads
+    )
+    # SMTP sends are not limited by the two database threads
+    assert 2 < sending[1] <= 6
+    assert _receive_all(client, queue_url) == []
+
+
+@mock_aws
+def test_async_queue_consumer_applies_backpressure_and_drains(monkeypatch):
+    client, queue_url = _use_moto_queue(monkeypatch)
+    queue.enqueue_email_payloads(_email_payloads(20))
+
+    release = threading.Event()
+    sent = []
+
+    def _send_prepared_email(prepared, connection=None):
+        release.wait(10)
+        sent.append(prepared)
+        return True
+
+    monkeypatch.setattr(
+        "core.services.queue_consumer.prepare_notification_email",
+        lambda **kwargs: kwargs["musician_id"],
+    )
+    monkeypatch.setattr(
+        "core.services.queue_consumer.send_prepared_email", _send_prepared_email
+    )
+    monkeypatch.setattr(
+        "core.services.queue_consumer.record_notification_email_status",
+        lambda prepared, success: None,
+    )
+    received = []
+    client.meta.events.register(
+        "provide-client-params.sqs.ReceiveMessage",
+        lambda params, **kwargs: received.append(params["MaxNumberOfMessages"]),
+    )
+
+    consumer = AsyncEmailQueueConsumer(
+        max_in_flight=2, max_pending=3, db_workers=1, wait_time=0, sleep=0.05
+    )
+    thread = _run_async_consumer(consumer)
+    _wait_for(lambda: len(consumer._started) == 2 and len(consumer._received) == 5)
+    time.sleep(0.2)
+    # Two messages sending and three waiting; polling stopped there
+    assert len(consumer._received) == 5
+    assert sum(received) == 5
+    consumer.stop()
+    release.set()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert len(sent) == 2
+    assert len(_receive_all(client, queue_url)) == 18
@@ -0,0 +1,178 @@
+import pytest
+from datetime import datetime
+from faker import Faker
+from core.enum.instruments import InstrumentEnum
+from core.models.music import Piece
+from core.services.music import search_for_piece
+from core.services.organizations import create_musician, search_for_musician
+from core.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from core.services.programs import (
+    add_musician_to_program,
+    create_program,
+    search_for_program_musicians,
+    search_for_programs,
+)
+from tests.mocks import create_organization
+
+faker = Faker()
+pytestmark = pytest.mark.django_db
+
+
+def _assert_cursor_matches_offset(search_function, key, **kwargs):
+    """
+    Walk every cursor page and compare with a single offset page.
+
+    Offset mode has no final tie-breaker, so rows with equal sort keys may come
+    back in either order; compare the sort keys in order and the IDs as a set.
+    """
+    rows = []
+    cursor = ""
+    while cursor is not None:
+        results = search_function(cursor=cursor, limit=3, **kwargs)
+        rows.extend(results.data)
+        cursor = results.next_cursor
+    expected = search_function(limit=100, offset=0, **kwargs).data
+
+    assert [key(row) for row in rows] == [key(row) for row in expected]
+    assert len({row.id for row in rows}) == len(rows)
+    assert {row.id for row in rows} == {row.id for row in expected}
+
+
+@pytest.mark.parametrize("sort", [None, "title:asc", "composer:dsc", "parts_count:asc"])
+def test_piece_cursor_pages_match_offset_order(sort):
+    organization = create_organization()
+    for index in range(10):
+        Piece.objects.create(
+            organization_id=organization.id,
+            # Repeated titles and composers exercise the tie-breakers
+            title=f"Symphony No. {index % 4}",
+            composer=f"Composer {index % 3}",
+            instrumentation="",
+        )
+
+    _assert_cursor_matches_offset(
+        search_for_piece,
+        lambda piece: (piece.title, piece.composer, piece.parts_count),
+        organization_id=organization.id,
+        sort=sort,
+    )
+
+
+def _first_performance(program):
+    return min((performance.date for performance in program.performances), default=None)
+
+
+@pytest.mark.parametrize(
+    "sort,key",
+    [
+        (None, lambda program: (_first_performance(program), program.name)),
+        (
+            "first_performance:dsc",
+            lambda program: (_first_performance(program), program.name),
+        ),
+        ("piece_count:asc", lambda program: (program.piece_count, program.name)),
+    ],
+)
+def test_program_cursor_pages_match_offset_order(sort, key):
+    organization = create_organization()
+    for index in range(8):
+        create_program(
+            organization_id=organization.id,
+            name=f"Program {index % 3}",
+            # Programs without performances sort last in both directions
+            performance_dates=[datetime(2026, 1, 1 + index)] if index % 2 else [],
+        )
+
+    _assert_cursor_matches_offset(
+        search_for_programs,
+        key,
+        organization_id=organization.id,
+        sort=sort,
+    )
+
+
+def test_musician_cursor_pagination_covers_roster():
+    organization = create_organization()
+    program = create_program(organization_id=organization.id, name="Roster")
+    for index in range(7):
+        musician = create_musician(
+            organization_id=organization.id,
+            first_name=faker.first_name(),
+            last_name=f"Last {index % 2}",
+            email=faker.unique.email(),
+            principal=False,
+            core_member=True,
+            primary_instrument=InstrumentEnum.VIOLA,
+        )
+        add_musician_to_program(organization.id, program.id, musician.id)
+
+    _assert_cursor_matches_offset(
+        search_for_musician,
+        lambda musician: (musician.last_name, musician.first_name, musician.email),
+        organization_id=organization.id,
+        sort="last_name:dsc",
+    )
+    _assert_cursor_matches_offset(
+        search_for_program_musicians,
+        lambda program_musician: program_musician.first_name,
+        organization_id=organization.id,
+        program_id=program.id,
+        search="Last",
+        sort="first_name:asc",
+    )
+
+
+def test_cursor_totals_are_optional():
+    organization = create_organization()
+    for index in range(4):
+        create_program(organization_id=organization.id, name=f"Program {index}")
+
+    results = search_for_programs(organization_id=organization.id, cursor="", limit=3)
+    assert results.total is None
+    assert len(results.data) == 3
+    assert results.next_cursor
+
+    results = search_for_programs(
+        organization_id=organization.id,
+        cursor=results.next_cursor,
+        limit=3,
+        include_total=True,
+    )
+    assert results.total == 4
+    assert len(results.data) == 1
+    assert results.next_cursor is None
+
+
+def test_cursor_is_rejected_for_a_different_sort():
+    organization = create_organization()
+    for index in range(4):
+        create_program(organization_id=organization.id, name=f"Program {index}")
+
+    results = search_for_programs(organization_id=organization.id, cursor="", limit=2)
+    with pytest.raises(InvalidCursorError):
+        search_for_programs(
+            organization_id=organization.id,
+            cursor=results.next_cursor,
+            sort="name:asc",
+        )
+    with pytest.raises(InvalidCursorError):
+        search_for_programs(organization_id=organization.id, cursor="not-a-cursor")
+
+
+def test_cursor_with_tampered_values_is_rejected():
+    organization = create_organization()
+    for index in range(4):
+        create_program(organization_id=organization.id, name=f"Program {index}")
+
+    results = search_for_programs(
+        organization_id=organization.id, cursor="", limit=2, sort="name:asc"
+    )
+    keys = [("name", False), ("id", False)]
+    [name, _] = decode_cursor(results.next_cursor, keys)
+    for values in ([name, "not-a-uuid"], [name, ["nested"]]):
+        with pytest.raises(InvalidCursorError):
+            search_for_programs(
+                organization_id=organization.id,
+                cursor=encode_cursor(keys, values),
+                sort="name:asc",
+            )
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from moto import mock_aws
+from core.enum.music import PartAssetType
+from core.enum.status import UploadStatus
+from core.models.music import Piece
+from core.services.music import (
+    create_part_asset,
+    create_piece,
+    delete_part_asset,
+    get_piece,
+    update_part_asset,
+)
+from core.services.programs import (
+    add_piece_to_program,
+    create_program,
+    get_pieces_for_program,
+)
+from tests.mocks import create_organization
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_piece(organization_id: str):
+    return create_piece(
+        organization_id=organization_id,
+        title="Counter Test",
+        composer="Test",
+        instrumentation="2 2 2 2 — 2 2 0 0 — str",
+        duration=None,
+        domo_id=None,
+        composer_domo_id=None,
+    )
+
+
+@mock_aws
+def test_piece_counters_follow_part_asset_changes():
+    organization = create_organization()
+    piece = _create_piece(str(organization.id))
+    assert piece.parts_count == 17
+    assert piece.completed_parts == 0
+
+    part_asset = create_part_asset(piece.id, "Flute 1.pdf", PartAssetType.CLEAN)
+    assert get_piece(organization.id, piece.id).completed_parts == 0
+
+    part_ids = [part.id for part in part_asset.parts]
+    update_part_asset(organization.id, part_asset.id, part_ids, UploadStatus.UPLOADED)
+    assert get_piece(organization.id, piece.id).completed_parts == 1
+
+    update_part_asset(organization.id, part_asset.id, [], None)
+    assert get_piece(organization.id, piece.id).completed_parts == 0
+
+    update_part_asset(organization.id, part_asset.id, part_ids, None)
+    delete_part_asset(organization.id, part_asset.id)
+    piece = get_piece(organization.id, piece.id)
+    assert piece.parts_count == 17
+    assert piece.completed_parts == 0
+
+
+@mock_aws
+def test_program_pieces_use_stored_counters(django_assert_max_num_queries):
+    organization = create_organization()
+    program = create_program(organization_id=organization.id, name="Counters")
+    for _ in range(3):
+        piece = _create_piece(str(organization.id))
+        add_piece_to_program(organization.id, program.id, piece.id)
+
+    with django_assert_max_num_queries(2):
+        pieces = get_pieces_for_program(organization.id, program.id)
+    assert [piece.parts_count for piece in pieces] == [17, 17, 17]
+
+
+@mock_aws
+def test_repair_piece_counters_command_recomputes_counters():
+    organization = create_organization()
+    piece = _create_piece(str(organization.id))
+    part_asset = create_part_asset(piece.id, "Oboe 2.pdf", PartAssetType.CLEAN)
+    update_part_asset(
+        organization.id,
+        part_asset.id,
+        [part.id for part in part_asset.parts],
+        UploadStatus.UPLOADED,
+    )
+    Piece.objects.filter(id=piece.id).update(parts_count=0, completed_parts=5)
+
+    call_command("repair_piece_counters")
+
+    piece = get_piece(organization.id, piece.id)
+    assert piece.parts_count == 17
+    assert piece.completed_parts == 1
+
+
+@mock_aws
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_concurrent_part_asset_updates_keep_counters_exact():
+    organization = create_organization()
+    piece = _create_piece(str(organization.id))
+    part_assets = [
+        create_part_asset(piece.id, filename, PartAssetType.CLEAN)
+        for filename in ("Flute 1.pdf", "Oboe 1.pdf")
+    ]
+    first_written = threading.Event()
+    errors = []
+
+    def upload(part_asset, before_commit=None):
+        try:
+            with transaction.atomic():
+                update_part_asset(
+                    organization.id,
+                    part_asset.id,
+                    [part.id for part in part_asset.parts],
+                    UploadStatus.UPLOADED,
+                )
+                if before_commit:
+                    before_commit()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def hold_first_transaction():
+        first_written.set()
+        # Give the second writer time to reach its recount
+        time.sleep(0.5)
+
+    first = threading.Thread(
+        target=upload, args=(part_assets[0], hold_first_transaction)
+    )
+    second = threading.Thread(target=upload, args=(part_assets[1],))
+    first.start()
+    assert first_written.wait(10)
+    second.start()
+    first.join(10)
+    second.join(10)
+
+    assert errors == []
+    assert get_piece(organization.id, piece.id).completed_parts == 2
@@ -0,0 +1,128 @@
+import pytest
+from core.models.music import Piece
+from core.services.music import search_for_piece
+from core.utils import normalize_search_text
+from tests.mocks import create_organization
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_library(organization_id: str):
+    for title, composer in [
+        ("Symphony No. 9 'From the New World'", "Antonín Dvořák"),
+        ("Cello Concerto", "Antonín Dvořák"),
+        ("Concerto for Orchestra", "Witold Lutosławski"),
+        ("Symphony No. 3", "Henryk Górecki"),
+        ("The Rite of Spring", "Igor Stravinsky"),
+    ]:
+        Piece.objects.create(
+            organization_id=organization_id,
+            title=title,
+            composer=composer,
+            instrumentation="",
+        )
+
+
+def test_normalize_search_text_folds_accents():
+    assert normalize_search_text("Dvořák: Symphony No. 9") == "dvorak symphony no 9"
+    assert normalize_search_text("Lutosławski") == "lutoslawski"
+
+
+def test_piece_search_document_follows_title_changes():
+    organization = create_organization()
+    piece = Piece.objects.create(
+        organization_id=organization.id,
+        title="Má vlast",
+        composer="Bedřich Smetana",
+        instrumentation="",
+    )
+    assert piece.search_document == "ma vlast bedrich smetana"
+
+    piece.title = "Vltava"
+    piece.save(update_fields=["title"])
+    piece.refresh_from_db()
+    assert piece.search_document == "vltava bedrich smetana"
+
+
+def test_search_for_piece_is_accent_insensitive():
+    organization = create_organization()
+    _create_library(organization.id)
+
+    results = search_for_piece(title="Dvorak", organization_id=organization.id)
+    assert results.total == 2
+    assert {piece.composer for piece in results.data} == {"Antonín Dvořák"}
+
+    results = search_for_piece(title="lutoslaw", organization_id=organization.id)
+    assert [piece.title for piece in results.data] == ["Concerto for Orchestra"]
+
+
+def test_search_for_piece_matches_word_prefixes_in_any_order():
+    organization = create_organization()
+    _create_library(organization.id)
+
+    results = search_for_piece(title="gorecki sym", organization_id=organization.id)
+    assert [piece.title for piece in results.data] == ["Symphony No. 3"]
+
+
+def test_search_for_piece_ranks_by_relevance_without_sort():
+    organization = create_organization()
+    _create_library(organization.id)
+
+    results = search_for_piece(title="symphony", organization_id=organization.id)
+    assert results.total == 2
+    assert all("Symphony" in piece.title for piece in results.data)
+
+    results = search_for_piece(
+        title="concerto", organization_id=organization.id, sort="title:asc"
+    )
+    assert [piece.title for piece in results.data] == [
+        "Cello Concerto",
+        "Concerto for Orchestra",
+    ]
+
+
+def test_search_for_piece_is_scoped_to_organization():
+    organization = create_organization()
+    other_organization = create_organization()
+    _create_library(organization.id)
+
+    results = search_for_piece(title="Dvorak", organization_id=other_organization.id)
+    assert results.total == 0
+    assert results.data == []
+
+
+def test_search_for_piece_without_searchable_text_matches_nothing():
+    organization = create_organization()
+    _create_library(organization.id)
+
+    for text in ("!!!", "-"):
+        results = search_for_piece(title=text, organization_id=organization.id)
+        assert results.total == 0
+        assert results.data == []
+    assert search_for_piece(organization_id=organization.id).total == 5
+
+
+def test_search_for_piece_cursor_pages_through_tied_ranks():
+    organization = create_organization()
+    for index in range(10):
+        Piece.objects.create(
+            organization_id=organization.id,
+            title=f"Serenade {'Nocturne ' * (index % 3)}{index}",
+            composer="Composer",
+            instrumentation="",
+        )
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = search_for_piece(
+            title="serenade",
+            organization_id=str(organization.id),
+            limit=3,
+            cursor=cursor,
+        )
+        seen.extend(piece.id for piece in page.data)
+        cursor = page.next_cursor
+
+    assert len(seen) == 10
+    assert len(set(seen)) == 10